@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""End-to-end latency benchmark for ``OmniLinkMQTTBridge``, fully offline.
+
+Starts, inside one process:
+
+* :class:`mqtt_broker.MQTTBroker` on a free local port,
+* a small HTTP stand-in for ``server.js`` (``POST /`` and ``GET /context``),
+  unless ``--backend`` points at a running chess server,
+* an ``OmniLinkMQTTBridge`` wired like ``link_mqtt.py`` (move handler plus a move
+  listener that publishes the board context),
+
+then publishes move commands through the broker with the ``replay.py`` MQTT
+driver and reports command-to-feedback latency and throughput.
+
+Usage::
+
+    python chess_link/bench_mqtt.py --commands 2000 --inflight 8 --workers 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+import chess_api
+from mqtt_broker import MQTTBroker
+from omnilink import OmniLinkEngine, OmniLinkMQTTBridge, TypeRegistry, give_context, give_state, load_patterns_from_file
+from replay import PATTERNS_FILE, MQTTTarget, Stats, move_command
+
+_MOVE_RE = re.compile(r"^move_(white|black)_(\w+)_from_([a-h][1-8])_to_([a-h][1-8])$")
+
+
+# ---------------------------------------------------------------------------
+# Chess server stand-in
+# ---------------------------------------------------------------------------
+
+
+class ChessServerStub(ThreadingHTTPServer):
+    """Answers the two endpoints ``chess_api`` uses, tracking piece squares."""
+
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _ChessStubHandler)
+        self.lock = threading.Lock()
+        self.turn = "white"
+        self.pieces: Dict[str, Dict[str, Any]] = {}
+        back = ("rook", "knight", "bishop", "queen", "king", "bishop", "knight", "rook")
+        for idx, file in enumerate("abcdefgh"):
+            for color, rank, piece in (
+                ("white", 1, back[idx]), ("white", 2, "pawn"), ("black", 7, "pawn"), ("black", 8, back[idx]),
+            ):
+                square = f"{file}{rank}"
+                self.pieces[square] = {"square": square, "color": color, "piece": piece, "id": f"{color}_{piece}_{square}"}
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def apply(self, command: str) -> bool:
+        match = _MOVE_RE.match(command)
+        if not match:
+            return False
+        color, _piece, src, dst = match.groups()
+        with self.lock:
+            moving = self.pieces.get(src)
+            if not moving or moving["color"] != color:
+                return False
+            self.pieces.pop(dst, None)
+            del self.pieces[src]
+            moving["square"] = dst
+            self.pieces[dst] = moving
+            self.turn = "black" if color == "white" else "white"
+        return True
+
+    def context(self) -> Dict[str, Any]:
+        with self.lock:
+            pieces = [dict(p) for p in self.pieces.values()]
+            turn = self.turn
+        counts = {c: sum(p["color"] == c for p in pieces) for c in ("white", "black")}
+        summary = f"Turn: {turn}. White pieces: {counts['white']}. Black pieces: {counts['black']}."
+        return {"context": summary, "state": {"turn": turn, "pieces": pieces, "counts": counts}}
+
+
+class _ChessStubHandler(BaseHTTPRequestHandler):
+    server: ChessServerStub
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; with Nagle on, a client
+    # reusing the keep-alive connection waits out its delayed ACK (~40 ms).
+    disable_nagle_algorithm = True
+
+    def _json(self, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self) -> None:  # noqa: N802 - http.server API
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            command = str(json.loads(self.rfile.read(length) or b"{}").get("cmd", ""))
+        except (ValueError, AttributeError):
+            command = ""
+        self._json({"ok": True, "handled": self.server.apply(command.strip())})
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server API
+        self._json(self.server.context())
+
+    def log_message(self, *_args: Any) -> None:
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+
+def _commands(count: int) -> List[str]:
+    """Knights hopping out and back, so every command is a legal board move."""
+
+    cycle = [
+        move_command("white", "knight", "g1", "f3"),
+        move_command("black", "knight", "g8", "f6"),
+        move_command("white", "knight", "f3", "g1"),
+        move_command("black", "knight", "f6", "g8"),
+    ]
+    return [cycle[i % len(cycle)] for i in range(count)]
+
+
+def _build_bridge(port: int, args: argparse.Namespace) -> OmniLinkMQTTBridge:
+    types = TypeRegistry()
+    engine = OmniLinkEngine(load_patterns_from_file(PATTERNS_FILE, types), types=types)
+
+    def _handle_any(event: Dict[str, Any]) -> Dict[str, Any]:
+        v = event.get("vars", {})
+        try:
+            chess_api.move_piece(v["color"], v["piece"], v["location1"], v["location2"])
+        except KeyError:
+            return {"ack": False}
+        return {"ack": True}
+
+    engine.on(lambda _event: True, _handle_any)
+
+    bridge = OmniLinkMQTTBridge(
+        engine,
+        host="127.0.0.1",
+        port=port,
+        transport="tcp",
+        client_id="omnilink-bench-bridge",
+        workers=args.workers,
+        context_mode=args.context_mode,
+        log=False,
+    )
+
+    if not args.no_context:
+        def _send_context(*_args: Any) -> None:
+            if bridge.context_mode == "delta":
+                give_state(chess_api.get_state())
+            else:
+                give_context(chess_api.get_context(full=True))
+
+        chess_api.register_move_listener(_send_context)
+    return bridge
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark OmniLinkMQTTBridge through a local broker.")
+    parser.add_argument("--commands", type=int, default=1000)
+    parser.add_argument("--inflight", type=int, default=1, help="Unanswered commands allowed at once.")
+    parser.add_argument("--workers", type=int, default=1, help="Bridge worker threads (MQTT_WORKERS).")
+    parser.add_argument("--context-mode", choices=("full", "delta"), default="full")
+    parser.add_argument("--no-context", action="store_true", help="Do not publish context after moves.")
+    parser.add_argument("--backend", default=None, help="Use a running chess server instead of the stub.")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    args = parser.parse_args(argv)
+
+    broker = MQTTBroker(("127.0.0.1", 0)).start()
+    stub: Optional[ChessServerStub] = None
+    if args.backend:
+        chess_api.SERVER_URL = args.backend.rstrip("/")
+    else:
+        stub = ChessServerStub()
+        threading.Thread(target=stub.serve_forever, daemon=True).start()
+        chess_api.SERVER_URL = stub.url
+
+    bridge = _build_bridge(broker.port, args).start()
+    stats = Stats()
+    driver = MQTTTarget(stats, inflight=args.inflight, host="127.0.0.1", port=broker.port, transport="tcp")
+    time.sleep(0.2)  # let the bridge finish subscribing
+
+    stats.started = time.perf_counter()
+    for command in _commands(args.commands):
+        driver.send(command)
+    driver.drain(30)
+    stats.finished = time.perf_counter()
+
+    driver.close()
+    bridge.stop()
+    broker.stop()
+    if stub is not None:
+        stub.shutdown()
+
+    report = stats.summary()
+    report["bridge_metrics"] = dict(bridge.metrics)
+    report["broker_messages"] = {"in": broker.messages_in, "out": broker.messages_out}
+    if args.json:
+        print(json.dumps(report))
+    else:
+        lat = report["latency_ms"]
+        print(f"[bench_mqtt] {report['commands']} commands in {report['seconds']}s ({report['throughput_per_s']}/s)")
+        print(f"[bench_mqtt] latency ms p50={lat['p50']} p90={lat['p90']} p99={lat['p99']} max={lat['max']}")
+        print(f"[bench_mqtt] errors {report['errors']} ({report['error_rate']:.2%})")
+        print(f"[bench_mqtt] bridge {report['bridge_metrics']}")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - manual utility
+    sys.exit(main())
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""Polling cost and command latency of the remote bridges, fully offline.
+
+Starts :class:`supabase_stub.SupabaseStub` in this process and serves many
+simulated users either with one ``OmniLinkRemoteCommandBridge`` per user
+(``--mode single``, what running ``link_remote.py`` per user amounts to) or with
+one ``OmniLinkMultiUserRemoteBridge`` (``--mode multi``).  The engine
+acknowledges moves without a chess server.
+
+Two phases are measured:
+
+* idle: REST requests per second while no commands arrive,
+* load: ``--rounds`` rounds in which every user posts a move and the round ends
+  once all responses are written; latency is command insert to response write
+  as seen by the stub.
+
+Usage::
+
+    python chess_link/bench_remote.py --users 50 --mode multi --latency-ms 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from omnilink import (
+    MultiUserRemoteClient,
+    OmniLinkEngine,
+    OmniLinkMultiUserRemoteBridge,
+    OmniLinkRemoteCommandBridge,
+    RemoteCommandClient,
+    TypeRegistry,
+    load_patterns_from_file,
+)
+from replay import PATTERNS_FILE, Stats, move_command
+from supabase_stub import SupabaseStub
+
+ANON_KEY = "bench-anon-key"
+_CYCLE = [
+    move_command("white", "knight", "g1", "f3"),
+    move_command("black", "knight", "g8", "f6"),
+    move_command("white", "knight", "f3", "g1"),
+    move_command("black", "knight", "f6", "g8"),
+]
+
+
+def _engine(_user_key: str = "") -> OmniLinkEngine:
+    types = TypeRegistry()
+    engine = OmniLinkEngine(load_patterns_from_file(PATTERNS_FILE, types), types=types)
+    engine.on(lambda _event: True, lambda _event: {"ack": True})
+    return engine
+
+
+def _start_bridges(stub: SupabaseStub, users: List[str], args: argparse.Namespace) -> List[Any]:
+    common: Dict[str, Any] = dict(
+        poll_interval=args.poll,
+        min_interval=args.poll_min,
+        log=False,
+        async_write=not args.sync_write,
+    )
+    if args.mode == "multi":
+        client = MultiUserRemoteClient(base_url=stub.url, anon_key=ANON_KEY, user_keys=users)
+        return [OmniLinkMultiUserRemoteBridge(_engine, client, **common).start()]
+    return [
+        OmniLinkRemoteCommandBridge(
+            _engine(),
+            RemoteCommandClient(base_url=stub.url, anon_key=ANON_KEY, user_key=user),
+            **common,
+        ).start()
+        for user in users
+    ]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the remote bridges against a local Supabase stand-in.")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=20, help="Moves posted per user.")
+    parser.add_argument("--mode", choices=("single", "multi"), default="multi")
+    parser.add_argument("--poll", type=float, default=2.0, help="Idle poll interval (poll_interval).")
+    parser.add_argument("--poll-min", type=float, default=0.05, help="Interval right after activity.")
+    parser.add_argument("--idle", type=float, default=5.0, help="Seconds of idle polling to measure.")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Simulated REST round-trip.")
+    parser.add_argument("--sync-write", action="store_true", help="Write responses inline (OMNILINK_REMOTE_ASYNC_WRITE=0).")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    args = parser.parse_args(argv)
+
+    stub = SupabaseStub(anon_key=ANON_KEY, latency=args.latency_ms / 1000.0).start()
+    users = [f"bench-user-{i:04d}" for i in range(args.users)]
+
+    posted: Dict[Tuple[str, str], float] = {}
+    answered = threading.Condition()
+    stats = Stats()
+
+    def _on_response(row: Dict[str, Any]) -> None:
+        key = (row["user_key"], row.get("last_command") or "")
+        with answered:
+            sent = posted.pop(key, None)
+            if sent is not None:
+                stats.record(time.perf_counter() - sent, '"ok": true' in (row.get("last_response") or ""))
+                answered.notify_all()
+
+    stub.on_response(_on_response)
+    for user in users:
+        stub.put_command(user, "")
+    bridges = _start_bridges(stub, users, args)
+
+    time.sleep(args.poll_min * 4)
+    before = sum(stub.metrics.values())
+    time.sleep(args.idle)
+    idle_rate = (sum(stub.metrics.values()) - before) / max(args.idle, 1e-9)
+
+    before = sum(stub.metrics.values())
+    stats.started = time.perf_counter()
+    timeouts = 0
+    for round_no in range(args.rounds):
+        command = _CYCLE[round_no % len(_CYCLE)]
+        with answered:
+            for user in users:
+                posted[(user, command)] = time.perf_counter()
+                stub.put_command(user, command)
+            if not answered.wait_for(lambda: not posted, timeout=args.poll * 2 + 30):
+                timeouts += len(posted)
+                posted.clear()
+    stats.finished = time.perf_counter()
+    load_requests = sum(stub.metrics.values()) - before
+
+    for bridge in bridges:
+        bridge.stop()
+    stub.stop()
+
+    report = stats.summary()
+    report.update(
+        mode=args.mode,
+        users=args.users,
+        timeouts=timeouts,
+        idle_requests_per_s=round(idle_rate, 2),
+        requests_per_command=round(load_requests / max(report["commands"], 1), 2),
+        stub_requests=dict(stub.metrics),
+    )
+    if args.json:
+        print(json.dumps(report))
+    else:
+        lat = report["latency_ms"]
+        print(f"[bench_remote] {args.mode}: {args.users} users, {report['commands']} commands in {report['seconds']}s ({report['throughput_per_s']}/s)")
+        print(f"[bench_remote] latency ms p50={lat['p50']} p90={lat['p90']} p99={lat['p99']} max={lat['max']}")
+        print(f"[bench_remote] idle {report['idle_requests_per_s']} req/s, load {report['requests_per_command']} req/command, timeouts {timeouts}")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - manual utility
+    sys.exit(main())
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""Compare the threaded and asyncio ``tcp_client.py`` servers, fully offline.
+
+For each server mode this starts the server in-process as a dry run (payloads
+are parsed and counted, the chess server is never called; their stdout echo is
+discarded) and measures:
+
+* connections/s: ``--connections`` one-shot connections, one command each,
+  sent with ``OmniLinkTCPAdapter`` from ``--clients`` threads;
+* messages/s: ``--messages`` commands over ``--streams`` persistent, batching
+  adapters, while ``--idle`` extra connections are held open (one thread each
+  in threaded mode, nothing but a coroutine in asyncio mode).
+
+Usage::
+
+    python chess_link/bench_tcp.py --mode both --idle 1000 --framing binary
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import redirect_stdout
+from typing import Any, Deque, Dict, List, Optional, Union
+
+from omnilink import OmniLinkTCPAdapter
+from replay import move_command
+from tcp_client import AsyncCommandServer, CommandTCPHandler, CommandTCPServer
+
+_VARS = {"color": "white", "piece": "knight", "location1": "g1", "location2": "f3"}
+_COMMAND = move_command("white", "knight", "g1", "f3")
+_TEMPLATE = "move_[color]_[piece]_from_[location1]_to_[location2]"
+
+
+def _start_server(mode: str) -> Union[CommandTCPServer, AsyncCommandServer]:
+    server: Union[CommandTCPServer, AsyncCommandServer]
+    if mode == "asyncio":
+        server = AsyncCommandServer(("127.0.0.1", 0), encoding="utf-8", delimiter="\n", dry_run=True)
+    else:
+        server = CommandTCPServer(
+            ("127.0.0.1", 0), CommandTCPHandler, encoding="utf-8", delimiter="\n", dry_run=True
+        )
+        server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name=f"bench-{mode}", daemon=True).start()
+    return server
+
+
+def _wait_for(server: Any, key: str, count: int, timeout: float) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with server.metrics_lock:
+            if server.metrics[key] >= count:
+                return True
+        time.sleep(0.002)
+    return False
+
+
+def _adapter(port: int, args: argparse.Namespace, *, persistent: bool) -> OmniLinkTCPAdapter:
+    return OmniLinkTCPAdapter("127.0.0.1", port, persistent=persistent, framing=args.framing, log=False)
+
+
+def _bench_connections(server: Any, port: int, args: argparse.Namespace) -> Dict[str, Any]:
+    adapter = _adapter(port, args, persistent=False)
+    base = server.metrics["messages"]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.clients) as pool:
+        list(pool.map(
+            lambda _i: adapter.send_command(_COMMAND, vars=_VARS, template=_TEMPLATE),
+            range(args.connections),
+        ))
+    done = _wait_for(server, "messages", base + args.connections, 30)
+    elapsed = time.perf_counter() - started
+    return {"connections": args.connections, "seconds": round(elapsed, 3),
+            "per_s": round(args.connections / elapsed, 1), "complete": done}
+
+
+def _bench_messages(server: Any, port: int, args: argparse.Namespace) -> Dict[str, Any]:
+    held: List[socket.socket] = []
+    for _ in range(args.idle):
+        held.append(socket.create_connection(("127.0.0.1", port)))
+    adapters = [_adapter(port, args, persistent=True) for _ in range(args.streams)]
+    per_stream = args.messages // args.streams
+    total = per_stream * args.streams
+    time.sleep(0.2)
+    threads_alive = threading.active_count()
+    base = server.metrics["messages"]
+
+    def _stream(adapter: OmniLinkTCPAdapter) -> None:
+        # Stay within the adapter's bounded queue (TCP_ADAPTER_QUEUE_SIZE).
+        window: Deque["Future[None]"] = deque()
+        for _ in range(per_stream):
+            if len(window) >= args.window:
+                window.popleft().result(30)
+            window.append(adapter.send_command_async(_COMMAND, vars=_VARS, template=_TEMPLATE))
+        for future in window:
+            future.result(30)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=_stream, args=(a,)) for a in adapters]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    done = _wait_for(server, "messages", base + total, 60)
+    elapsed = time.perf_counter() - started
+
+    for adapter in adapters:
+        adapter.close()
+    for sock in held:
+        sock.close()
+    return {"messages": total, "streams": args.streams, "idle_connections": args.idle,
+            "seconds": round(elapsed, 3), "per_s": round(total / elapsed, 1), "complete": done,
+            "threads_alive": threads_alive}
+
+
+def _run_mode(mode: str, args: argparse.Namespace) -> Dict[str, Any]:
+    server = _start_server(mode)
+    port = server.server_address[1]
+    time.sleep(0.1)
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        report = {
+            "mode": mode,
+            "connect": _bench_connections(server, port, args),
+            "stream": _bench_messages(server, port, args),
+        }
+    server.shutdown()
+    server.server_close()
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark tcp_client.py server modes.")
+    parser.add_argument("--mode", choices=("threaded", "asyncio", "both"), default="both")
+    parser.add_argument("--connections", type=int, default=2000, help="One-shot connections to open.")
+    parser.add_argument("--clients", type=int, default=8, help="Threads opening one-shot connections.")
+    parser.add_argument("--messages", type=int, default=50000, help="Commands sent over persistent connections.")
+    parser.add_argument("--streams", type=int, default=4, help="Persistent adapters sending in parallel.")
+    parser.add_argument("--window", type=int, default=500, help="Unwritten commands per stream at most.")
+    parser.add_argument("--idle", type=int, default=500, help="Extra connections held open during the stream test.")
+    parser.add_argument("--framing", choices=("text", "binary"), default="text")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    args = parser.parse_args(argv)
+
+    modes = ("threaded", "asyncio") if args.mode == "both" else (args.mode,)
+    reports = [_run_mode(mode, args) for mode in modes]
+    if args.json:
+        print(json.dumps(reports))
+        return 0
+    for report in reports:
+        conn, stream = report["connect"], report["stream"]
+        print(f"[bench_tcp] {report['mode']:8s} connect: {conn['per_s']} conn/s ({conn['connections']} in {conn['seconds']}s)")
+        print(
+            f"[bench_tcp] {report['mode']:8s} stream:  {stream['per_s']} msg/s over {stream['streams']} connections"
+            f" with {stream['idle_connections']} idle (threads alive: {stream['threads_alive']})"
+        )
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - manual utility
+    sys.exit(main())
@@ -2,15 +2,32 @@
 from __future__ import annotations
 
 import json
-from typing import Any, Callable, Dict, List
+from typing import Any, Callable, Dict, List, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
 
 SERVER_URL = "http://localhost:8765"
 
-def _send(message: str) -> None:
-    """Send ``message`` to the server via HTTP POST."""
-    requests.post(SERVER_URL, json={"cmd": message}, timeout=5)
+# One pooled session so repeated moves reuse keep-alive connections instead of
+# opening a new TCP connection per request.
+_session = requests.Session()
+_session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=8))
+_session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=8))
+
+def _send(message: str, server_url: Optional[str] = None) -> bool:
+    """Send ``message`` to the server (``SERVER_URL`` by default) via HTTP POST.
+
+    Returns the server's ``handled`` flag, i.e. whether the command changed the
+    board; an error status raises :class:`requests.HTTPError`.
+    """
+    response = _session.post(server_url or SERVER_URL, json={"cmd": message}, timeout=5)
+    response.raise_for_status()
+    try:
+        data: Any = response.json()
+    except ValueError:
+        return False
+    return isinstance(data, dict) and bool(data.get("ok", True)) and bool(data.get("handled"))
 
 PIECES = {"pawn", "rook", "knight", "bishop", "queen", "king"}
 COLORS = {"white", "black"}
@@ -45,7 +62,9 @@ def move_piece(
     piece: str,
     from_square: str,
     to_square: str,
-) -> None:
+    *,
+    server_url: Optional[str] = None,
+) -> bool:
     """Move an arbitrary piece from one square to another.
 
     Parameters
@@ -58,6 +77,17 @@ def move_piece(
         Source square in algebraic notation such as ``e2``.
     to_square: str
         Target square in algebraic notation such as ``e4``.
+    server_url: str, optional
+        Chess server to drive instead of ``SERVER_URL``, for processes that
+        serve several boards.
+
+    Returns
+    -------
+    bool
+        ``True`` if the server applied the move, ``False`` if it rejected it
+        (for example because no such piece stands on ``from_square``). HTTP
+        errors raise :class:`requests.HTTPError`. Move listeners only run for
+        applied moves.
     """
 
     if color not in COLORS:
@@ -66,10 +96,18 @@ def move_piece(
         raise ValueError(f"piece must be one of {sorted(PIECES)}")
 
     cmd = f"move_{color}_{piece}_from_{from_square}_to_{to_square}"
-    _send(cmd)
+    if not _send(cmd, server_url):
+        return False
 
     for listener in list(_move_listeners):
         listener(color, piece, from_square, to_square)
+    return True
+
+
+def reset_board() -> None:
+    """Ask the server to put every piece back on its starting square."""
+
+    _send("reset")
 
 
 def _stringify(payload: Any) -> str:
@@ -143,7 +181,22 @@ def _describe_pieces(pieces: List[Dict[str, Any]]) -> str:
     return "\n".join(descriptions)
 
 
-def get_context(*, full: bool = False) -> str:
+def get_state() -> Dict[str, Any]:
+    """Return the server's structured board state.
+
+    The dictionary holds ``turn``, ``fen``, ``pieces`` (a list of
+    ``{"square", "color", "piece", "id"}`` entries) and the other fields the
+    server reports under ``state`` on ``GET /context``.
+    """
+
+    response = _session.get(f"{SERVER_URL}/context", timeout=5)
+    response.raise_for_status()
+    data = response.json()
+    state = data.get("state") if isinstance(data, dict) else None
+    return state if isinstance(state, dict) else {}
+
+
+def get_context(*, full: bool = False, server_url: Optional[str] = None) -> str:
     """Fetch the current board status from the server.
 
     Parameters
@@ -151,6 +204,8 @@ def get_context(*, full: bool = False) -> str:
     full: bool, optional
         When ``True`` include a piece-by-piece location breakdown in the
         returned string. Defaults to ``False``.
+    server_url: str, optional
+        Chess server to query instead of ``SERVER_URL``.
 
     Returns
     -------
@@ -160,7 +215,7 @@ def get_context(*, full: bool = False) -> str:
         multi-line human readable summary of where each piece is located.
     """
 
-    response = requests.get(f"{SERVER_URL}/context", timeout=5)
+    response = _session.get(f"{server_url or SERVER_URL}/context", timeout=5)
     response.raise_for_status()
 
     try:
@@ -197,4 +252,4 @@ def get_context(*, full: bool = False) -> str:
         return _stringify(data)
     return _stringify(data)
 
-__all__ = ["move_piece", "get_context", "register_move_listener"]
+__all__ = ["move_piece", "reset_board", "get_context", "get_state", "register_move_listener"]
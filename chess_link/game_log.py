@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""Append-only binary game log for moves issued through :mod:`chess_api`.
+
+``server.js`` only keeps the last 50 moves and ``get_context`` is not meant to
+carry a whole game.  :class:`GameRecorder` listens to moves via
+:func:`chess_api.register_move_listener` and appends each one to a per-game
+log file made of fixed-width records, accessed through :mod:`mmap`.  A game of
+any length can then be read back by ply or exported as PGN without keeping it
+in memory.
+
+File layout (little endian)::
+
+    header  16 bytes  magic b"OLGL", version u16, record size u16, count u64
+    record  16 bytes  timestamp f64, color u8, piece u8, from u8, to u8, 4 pad
+
+Usage::
+
+    from chess_api import register_move_listener
+    from game_log import GameRecorder
+
+    register_move_listener(GameRecorder("games"))
+
+Export a recorded game with ``python chess_link/game_log.py games/<id>.olog``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, IO, Iterator, Optional, Union
+
+_MAGIC = b"OLGL"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHHQ")
+_RECORD = struct.Struct("<dBBBB4x")
+_COUNT_OFFSET = 8
+_DEFAULT_CAPACITY = 256
+
+COLORS = ("white", "black")
+PIECES = ("pawn", "rook", "knight", "bishop", "queen", "king")
+FILES = ("a", "b", "c", "d", "e", "f", "g", "h")
+_PIECE_LETTERS = {
+    "pawn": "",
+    "rook": "R",
+    "knight": "N",
+    "bishop": "B",
+    "queen": "Q",
+    "king": "K",
+}
+
+
+def _square_code(square: str) -> int:
+    """Return ``0..63`` for ``square`` (``a1`` is 0, ``h8`` is 63)."""
+
+    s = square.strip().lower()
+    if len(s) != 2 or s[0] not in FILES or s[1] not in "12345678":
+        raise ValueError(f"invalid square: {square!r}")
+    return (int(s[1]) - 1) * 8 + FILES.index(s[0])
+
+
+def _square_name(code: int) -> str:
+    return f"{FILES[code % 8]}{code // 8 + 1}"
+
+
+@dataclass(frozen=True)
+class MoveRecord:
+    ply: int
+    color: str
+    piece: str
+    from_square: str
+    to_square: str
+    timestamp: float
+
+    def lan(self) -> str:
+        """Return the move in long algebraic notation, e.g. ``Ng1-f3``."""
+
+        return f"{_PIECE_LETTERS[self.piece]}{self.from_square}-{self.to_square}"
+
+
+class GameLog:
+    """Fixed-width move records in a memory-mapped, append-only file."""
+
+    def __init__(self, path: Union[str, Path], *, initial_capacity: int = _DEFAULT_CAPACITY) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        exists = self.path.exists() and self.path.stat().st_size >= _HEADER.size
+
+        self._file = open(self.path, "r+b" if exists else "w+b")
+        if exists:
+            magic, version, record_size, count = _HEADER.unpack(self._file.read(_HEADER.size))
+            if magic != _MAGIC or version != _VERSION or record_size != _RECORD.size:
+                self._file.close()
+                raise ValueError(f"{self.path} is not a version {_VERSION} game log")
+            self._count = count
+        else:
+            self._file.write(_HEADER.pack(_MAGIC, _VERSION, _RECORD.size, 0))
+            self._file.truncate(_HEADER.size + max(1, initial_capacity) * _RECORD.size)
+            self._count = 0
+        self._file.flush()
+        self._map = mmap.mmap(self._file.fileno(), 0)
+
+    # ----- capacity
+    @property
+    def _capacity(self) -> int:
+        return (len(self._map) - _HEADER.size) // _RECORD.size
+
+    def _grow(self) -> None:
+        new_capacity = max(self._capacity * 2, _DEFAULT_CAPACITY)
+        self._map.close()
+        self._file.truncate(_HEADER.size + new_capacity * _RECORD.size)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+
+    # ----- writing
+    def append(
+        self,
+        color: str,
+        piece: str,
+        from_square: str,
+        to_square: str,
+        *,
+        timestamp: Optional[float] = None,
+    ) -> int:
+        """Append a move and return its ply index (0-based)."""
+
+        record = _RECORD.pack(
+            time.time() if timestamp is None else float(timestamp),
+            COLORS.index(color.lower()),
+            PIECES.index(piece.lower()),
+            _square_code(from_square),
+            _square_code(to_square),
+        )
+        with self._lock:
+            if self._count >= self._capacity:
+                self._grow()
+            offset = _HEADER.size + self._count * _RECORD.size
+            self._map[offset:offset + _RECORD.size] = record
+            # The count is only bumped once the record is in place, so a
+            # crash mid-append never exposes a half-written move.
+            self._count += 1
+            struct.pack_into("<Q", self._map, _COUNT_OFFSET, self._count)
+            return self._count - 1
+
+    def flush(self) -> None:
+        with self._lock:
+            self._map.flush()
+
+    # ----- reading
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, ply: int) -> MoveRecord:
+        with self._lock:
+            count = self._count
+            if ply < 0:
+                ply += count
+            if not 0 <= ply < count:
+                raise IndexError("ply out of range")
+            ts, color, piece, src, dst = _RECORD.unpack_from(
+                self._map, _HEADER.size + ply * _RECORD.size
+            )
+        return MoveRecord(ply, COLORS[color], PIECES[piece], _square_name(src), _square_name(dst), ts)
+
+    def __iter__(self) -> Iterator[MoveRecord]:
+        for ply in range(len(self)):
+            yield self[ply]
+
+    def _half_moves(self) -> Iterator[tuple[str, str]]:
+        """Yield ``(color, token)`` per half-move.
+
+        ``chess_api`` records castling as a king move followed by the rook
+        move; the pair is folded into one ``O-O``/``O-O-O`` half-move.
+        """
+
+        records = iter(self)
+        record = next(records, None)
+        while record is not None:
+            following = next(records, None)
+            if (
+                record.piece == "king"
+                and record.from_square[0] == "e"
+                and record.from_square[1] == record.to_square[1]
+                and record.to_square[0] in "cg"
+                and following is not None
+                and following.color == record.color
+                and following.piece == "rook"
+                and following.from_square == ("h" if record.to_square[0] == "g" else "a") + record.to_square[1]
+                and following.to_square == ("f" if record.to_square[0] == "g" else "d") + record.to_square[1]
+            ):
+                yield record.color, "O-O" if record.to_square[0] == "g" else "O-O-O"
+                record = next(records, None)
+                continue
+            yield record.color, record.lan()
+            record = following
+
+    def iter_pgn(self, headers: Optional[Dict[str, str]] = None) -> Iterator[str]:
+        """Yield the game as PGN text, one line at a time.
+
+        Moves are written in long algebraic notation (``e2-e4``, ``Ng1-f3``)
+        because the log stores squares only, not captures or check state.
+        Castling is written as ``O-O``/``O-O-O``.
+        """
+
+        tags: Dict[str, str] = {
+            "Event": "Omni Link game",
+            "Site": "?",
+            "Date": "????.??.??",
+            "White": "?",
+            "Black": "?",
+            "Result": "*",
+        }
+        if len(self):
+            tags["Date"] = time.strftime("%Y.%m.%d", time.localtime(self[0].timestamp))
+        if headers:
+            tags.update(headers)
+        for key, value in tags.items():
+            escaped = str(value).replace("\\", "\\\\").replace('"', '\\"')
+            yield f'[{key} "{escaped}"]\n'
+        yield "\n"
+
+        line = ""
+        number = 1
+        previous: Optional[str] = None
+        for color, move in self._half_moves():
+            if color == "white":
+                if previous == "white":
+                    number += 1
+                token = f"{number}. {move}"
+            else:
+                token = move if previous == "white" else f"{number}... {move}"
+                number += 1
+            previous = color
+
+            if line and len(line) + len(token) + 1 > 79:
+                yield line + "\n"
+                line = token
+            else:
+                line = f"{line} {token}" if line else token
+
+        result = tags["Result"]
+        yield (f"{line} {result}" if line else result) + "\n"
+
+    def export_pgn(self, fp: IO[str], headers: Optional[Dict[str, str]] = None) -> None:
+        for chunk in self.iter_pgn(headers):
+            fp.write(chunk)
+
+    # ----- lifecycle
+    def close(self) -> None:
+        with self._lock:
+            if self._map.closed:
+                return
+            self._map.flush()
+            self._map.close()
+            self._file.close()
+
+    def __enter__(self) -> "GameLog":
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        self.close()
+
+
+class GameRecorder:
+    """Move listener that writes each game to its own :class:`GameLog`.
+
+    Instances are callable with the ``(color, piece, from_square, to_square)``
+    signature expected by :func:`chess_api.register_move_listener`.
+    """
+
+    SUFFIX = ".olog"
+
+    def __init__(self, directory: Union[str, Path], game_id: Optional[str] = None) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.game_id = ""
+        self.log: Optional[GameLog] = None
+        self.new_game(game_id)
+
+    def new_game(self, game_id: Optional[str] = None) -> GameLog:
+        """Close the current log and start (or reopen) the log for ``game_id``."""
+
+        with self._lock:
+            if self.log is not None:
+                self.log.close()
+            self.game_id = game_id or time.strftime("%Y%m%d-%H%M%S") + f"-{os.getpid()}"
+            self.log = GameLog(self.directory / f"{self.game_id}{self.SUFFIX}")
+            return self.log
+
+    def __call__(self, color: str, piece: str, from_square: str, to_square: str) -> None:
+        # Under the lock so new_game() cannot close the log mid-append.
+        with self._lock:
+            if self.log is None:
+                return
+            try:
+                self.log.append(color, piece, from_square, to_square)
+            except ValueError as exc:
+                print(f"[GameRecorder] skipped move {color} {piece} {from_square}->{to_square}: {exc}")
+
+
+# ---------------------------------------------------------------------------
+# Entrypoint
+# ---------------------------------------------------------------------------
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Export an Omni Link game log.")
+    parser.add_argument("path", help="Path to a .olog file written by GameRecorder.")
+    parser.add_argument("--ply", type=int, default=None, help="Print a single move by ply index.")
+    args = parser.parse_args(argv)
+
+    with GameLog(args.path) as log:
+        if args.ply is not None:
+            try:
+                record = log[args.ply]
+            except IndexError:
+                print(f"No move at ply {args.ply} (game has {len(log)})", file=sys.stderr)
+                return 1
+            print(f"{record.ply}: {record.color} {record.piece} {record.lan()}")
+        else:
+            log.export_pgn(sys.stdout)
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - manual utility
+    sys.exit(main())
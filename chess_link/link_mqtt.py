@@ -7,9 +7,11 @@ from omnilink import (
     OmniLinkMQTTBridge,
     load_patterns_from_file,
     give_context,
+    give_state,
     start_periodic_context,
 )
-from chess_api import move_piece, get_context, register_move_listener
+from chess_api import move_piece, get_context, get_state, register_move_listener
+from game_log import GameRecorder
 
 # --- Load templates from chess_commands_omnilink.txt ---
 HERE = Path(__file__).resolve().parent
@@ -21,11 +23,18 @@ engine = OmniLinkEngine(TEMPLATES, types=types)
 
 
 def _send_full_context(*_args):
-    give_context(get_context(full=True))
+    if bridge.context_mode == "delta":
+        give_state(get_state())
+    else:
+        give_context(get_context(full=True))
 
 
 register_move_listener(_send_full_context)
 
+# --- Optional full-length game log (see game_log.py) ---
+if os.environ.get("OMNILINK_GAME_LOG_DIR"):
+    register_move_listener(GameRecorder(os.environ["OMNILINK_GAME_LOG_DIR"]))
+
 
 # --- Catch-all handler (prints captured vars) ---
 def handle_any(evt):
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""Run several MQTT bridge processes so one deployment can serve many boards.
+
+Each worker process gets its own :class:`~omnilink.OmniLinkEngine`, its own
+``OmniLinkMQTTBridge`` client and its own chess server endpoint
+(``chess_api.SERVER_URL``).  Two modes are available:
+
+``shard`` (default)
+    Every worker subscribes to ``<command topic>`` and ``<command topic>/+`` and
+    handles only the games whose ``crc32(game id) % workers`` equals its index,
+    so all commands for a game reach the same worker.  A worker drives a single
+    board, though: games hashed to the same worker share it, and workers that
+    are given the same backend share it too.
+``shared``
+    Workers join the broker shared subscription ``$share/<group>/...`` and the
+    broker balances messages between them.  There is no game affinity, so this
+    only suits deployments where every worker talks to the same backend.
+
+For isolated games pass ``--games`` (``MQTT_POOL_GAMES``): one worker is started
+per listed game id, handles only that game and publishes its board context on
+``<context topic>/<game id>``.  Without it worker ``i`` publishes on
+``<context topic>/<i>``.  Feedback for a game goes to
+``<feedback topic>/<game id>``.
+
+Usage::
+
+    python chess_link/link_mqtt_pool.py --games alice,bob \\
+        --backends http://localhost:8765,http://localhost:8865
+
+Backends are assigned round-robin to workers.  The options fall back to
+``MQTT_POOL_WORKERS``, ``MQTT_POOL_MODE``, ``MQTT_POOL_BACKENDS``,
+``MQTT_POOL_GAMES`` and ``MQTT_SHARE_GROUP``; the usual ``MQTT_*`` broker
+settings apply to every worker.
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+HERE = Path(__file__).resolve().parent
+PATTERNS_FILE = HERE / "chess_commands_omnilink.txt"
+
+
+def _run_worker(
+    index: int, workers: int, mode: str, backend: str, share_group: str, game_id: Optional[str] = None
+) -> None:
+    """Entry point of one worker process; ``game_id`` pins it to a single game."""
+
+    import chess_api
+    from omnilink import (
+        OmniLinkEngine,
+        OmniLinkMQTTBridge,
+        TypeRegistry,
+        give_context,
+        give_state,
+        load_patterns_from_file,
+    )
+
+    chess_api.SERVER_URL = backend.rstrip("/")
+
+    types = TypeRegistry()
+    engine = OmniLinkEngine(load_patterns_from_file(PATTERNS_FILE, types), types=types)
+
+    def _handle_any(event: Dict[str, Any]) -> Dict[str, Any]:
+        vars_ = event.get("vars", {})
+        try:
+            color = vars_["color"]
+            piece = vars_["piece"]
+            location1 = vars_["location1"]
+            location2 = vars_["location2"]
+        except KeyError:
+            return {"ack": False}
+
+        chess_api.move_piece(color, piece, location1, location2)
+        return {"ack": True}
+
+    engine.on(lambda _event: True, _handle_any)
+
+    base_context = os.environ.get("MQTT_CONTEXT_TOPIC", "olink/context")
+    client_id = os.environ.get("MQTT_CLIENT_ID") or "omnilink"
+    bridge = OmniLinkMQTTBridge(
+        engine,
+        client_id=f"{client_id}-w{index}-{os.getpid()}",
+        context_topic=f"{base_context}/{game_id if game_id is not None else index}",
+        share_group=share_group if mode == "shared" and game_id is None else None,
+        shard_index=index if mode == "shard" and game_id is None else 0,
+        shard_count=workers if mode == "shard" and game_id is None else 1,
+        game_ids=[game_id] if game_id is not None else None,
+    )
+
+    def _send_full_context(*_args: Any) -> None:
+        if bridge.context_mode == "delta":
+            give_state(chess_api.get_state())
+        else:
+            give_context(chess_api.get_context(full=True))
+
+    chess_api.register_move_listener(_send_full_context)
+
+    served = f"game {game_id}" if game_id is not None else mode
+    print(f"[link_mqtt_pool] worker {index}/{workers} ({served}) -> {chess_api.SERVER_URL}")
+    bridge.loop_forever()
+
+
+def _parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run N OmniLink MQTT bridge workers.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.environ.get("MQTT_POOL_WORKERS", str(os.cpu_count() or 1))),
+        help="Number of bridge processes (default: $MQTT_POOL_WORKERS or the CPU count).",
+    )
+    parser.add_argument(
+        "--mode",
+        choices=("shard", "shared"),
+        default=os.environ.get("MQTT_POOL_MODE", "shard"),
+        help="Route games by id (shard) or use a broker shared subscription (shared).",
+    )
+    parser.add_argument(
+        "--backends",
+        default=os.environ.get("MQTT_POOL_BACKENDS", ""),
+        help="Comma separated chess server URLs, assigned round-robin (default: chess_api.SERVER_URL).",
+    )
+    parser.add_argument(
+        "--games",
+        default=os.environ.get("MQTT_POOL_GAMES", ""),
+        help="Comma separated game ids; starts one worker per game, each with its own board.",
+    )
+    parser.add_argument(
+        "--share-group",
+        default=os.environ.get("MQTT_SHARE_GROUP", "omnilink"),
+        help="Shared subscription group name for --mode shared.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parse_args(argv if argv is not None else sys.argv[1:])
+    games: List[Optional[str]] = [g.strip() for g in args.games.split(",") if g.strip()]
+    workers = len(games) or max(1, args.workers)
+    backends = [b.strip() for b in args.backends.split(",") if b.strip()]
+    if not backends:
+        from chess_api import SERVER_URL
+
+        backends = [SERVER_URL]
+    if len(backends) < workers:
+        print(
+            f"[link_mqtt_pool] warning: {workers} workers share {len(backends)} backend(s); "
+            "their games are played on the same board"
+        )
+    elif not games and args.mode == "shard":
+        print(
+            "[link_mqtt_pool] warning: games hashed to the same worker share its board; "
+            "pass --games for one board per game"
+        )
+    if not games:
+        games = [None] * workers
+
+    processes: List[multiprocessing.Process] = []
+    for index in range(workers):
+        proc = multiprocessing.Process(
+            target=_run_worker,
+            args=(index, workers, args.mode, backends[index % len(backends)], args.share_group, games[index]),
+            name=f"omnilink-mqtt-{index}",
+            daemon=True,
+        )
+        proc.start()
+        processes.append(proc)
+
+    try:
+        for proc in processes:
+            proc.join()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for proc in processes:
+            if proc.is_alive():
+                proc.terminate()
+        for proc in processes:
+            proc.join(timeout=5)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
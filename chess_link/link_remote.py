@@ -1,14 +1,27 @@
 #!/usr/bin/env python3
-"""Remote polling bridge that drives chess moves via OmniLink."""
+"""Remote polling bridge that drives chess moves via OmniLink.
+
+With ``OMNILINK_REMOTE_USER_KEYS`` every user gets an engine of their own.
+``OMNILINK_REMOTE_BACKENDS=key1=http://host:8765,key2=http://host:8865`` gives
+each listed user their own chess server; users without an entry share the
+default ``chess_api.SERVER_URL`` board, which is reported at start-up. With
+``OMNILINK_GAME_LOG_DIR`` each user's moves go to ``<dir>/<user key>/``.
+"""
 
 from __future__ import annotations
 
+import os
+import re
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Optional
 
+import chess_api
 from chess_api import get_context, move_piece, register_move_listener
+from game_log import GameRecorder
 from omnilink import (
+    MultiUserRemoteClient,
     OmniLinkEngine,
+    OmniLinkMultiUserRemoteBridge,
     OmniLinkRemoteCommandBridge,
     TypeRegistry,
     give_context,
@@ -32,25 +45,66 @@ def _send_full_context(*_args: Any) -> None:
 
 register_move_listener(_send_full_context)
 
+GAME_LOG_DIR = os.environ.get("OMNILINK_GAME_LOG_DIR")
+
+
+def _move_handler(
+    server_url: Optional[str] = None, recorder: Optional[GameRecorder] = None
+) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """Return an event handler that plays moves on ``server_url`` and records them in ``recorder``."""
+
+    def _handle_any(event: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute any recognised command and report acknowledgement."""
+
+        vars_ = event.get("vars", {})
+
+        try:
+            color = vars_["color"]
+            piece = vars_["piece"]
+            location1 = vars_["location1"]
+            location2 = vars_["location2"]
+        except KeyError:
+            return {"ack": False}
+
+        if move_piece(color, piece, location1, location2, server_url=server_url) and recorder is not None:
+            recorder(color, piece, location1, location2)
+        return {"ack": True}
+
+    return _handle_any
+
+
+engine.on(lambda _event: True, _move_handler())
+
+
+def _user_backends() -> Dict[str, str]:
+    """Parse ``OMNILINK_REMOTE_BACKENDS`` (``key=url,...``)."""
 
-def _handle_any(event: Dict[str, Any]) -> Dict[str, Any]:
-    """Execute any recognised command and report acknowledgement."""
+    backends: Dict[str, str] = {}
+    for item in os.environ.get("OMNILINK_REMOTE_BACKENDS", "").split(","):
+        key, sep, url = item.partition("=")
+        if sep and key.strip() and url.strip():
+            backends[key.strip()] = url.strip().rstrip("/")
+    return backends
 
-    vars_ = event.get("vars", {})
 
-    try:
-        color = vars_["color"]
-        piece = vars_["piece"]
-        location1 = vars_["location1"]
-        location2 = vars_["location2"]
-    except KeyError:
-        return {"ack": False}
+def user_engine_factory(
+    backends: Dict[str, str], game_log_dir: Optional[str] = None
+) -> Callable[[str], OmniLinkEngine]:
+    """Build one engine per user key, driving that user's backend (if any).
 
-    move_piece(color, piece, location1, location2)
-    return {"ack": True}
+    With ``game_log_dir`` every user also gets a :class:`GameRecorder` in a
+    subdirectory named after their key.
+    """
 
+    def _engine_for(user_key: str) -> OmniLinkEngine:
+        recorder = None
+        if game_log_dir:
+            recorder = GameRecorder(Path(game_log_dir) / re.sub(r"[^A-Za-z0-9_.-]", "_", user_key))
+        user_engine = OmniLinkEngine(templates, types=types)
+        user_engine.on(lambda _event: True, _move_handler(backends.get(user_key), recorder))
+        return user_engine
 
-engine.on(lambda _event: True, _handle_any)
+    return _engine_for
 
 
 def main() -> None:
@@ -59,6 +113,20 @@ def main() -> None:
     give_context(get_context(full=True))
     start_periodic_context(30, lambda: get_context(full=True))
 
+    if os.environ.get(MultiUserRemoteClient.ENV_USER_KEYS):
+        client = MultiUserRemoteClient()
+        backends = _user_backends()
+        shared = [key for key in client.user_keys if key not in backends]
+        if len(shared) > 1:
+            print(
+                f"[link_remote] warning: {len(shared)} users without an OMNILINK_REMOTE_BACKENDS "
+                f"entry share the board at {chess_api.SERVER_URL}: {', '.join(shared)}"
+            )
+        OmniLinkMultiUserRemoteBridge(user_engine_factory(backends, GAME_LOG_DIR), client).loop_forever()
+        return
+
+    if GAME_LOG_DIR:
+        register_move_listener(GameRecorder(GAME_LOG_DIR))
     bridge = OmniLinkRemoteCommandBridge(engine)
     bridge.loop_forever()
 
@@ -3,6 +3,7 @@
 
 from __future__ import annotations
 
+from concurrent.futures import Future
 from pathlib import Path
 from typing import Any, Dict
 
@@ -11,6 +12,7 @@ from omnilink import (
     OmniLinkMQTTBridge,
     OmniLinkTCPAdapter,
     TypeRegistry,
+    _env_flag,
     load_patterns_from_file,
 )
 
@@ -24,6 +26,20 @@ engine = OmniLinkEngine(TEMPLATES, types=types)
 
 tcp_adapter = OmniLinkTCPAdapter()
 
+# With TCP_ADAPTER_ASYNC=1 commands are queued for the adapter's sender thread
+# instead of being written on the MQTT thread, and the ack only means queued.
+SEND_ASYNC = _env_flag("TCP_ADAPTER_ASYNC", False)
+
+# With TCP_ADAPTER_WAIT_ACK=1 each command is sent synchronously and the MQTT
+# ack reports whether tcp_client.py actually applied the move.
+WAIT_ACK = _env_flag("TCP_ADAPTER_WAIT_ACK", False)
+
+
+def _report_delivery(future: "Future[None]") -> None:
+    exc = future.exception()
+    if exc is not None:
+        print(f"[link_tcp] Failed to forward command: {exc}")
+
 
 def handle_any(evt: Dict[str, Any]) -> Dict[str, Any]:
     """Forward every recognised command to the configured TCP endpoint."""
@@ -40,13 +56,30 @@ def handle_any(evt: Dict[str, Any]) -> Dict[str, Any]:
         extra["timestamp"] = evt["timestamp"]
 
     try:
-        tcp_adapter.send_command(
+        if SEND_ASYNC and not WAIT_ACK:
+            future = tcp_adapter.send_command_async(
+                command,
+                vars=evt.get("vars") or None,
+                template=evt.get("template"),
+                meta=evt.get("meta") or None,
+                extra=extra or None,
+                callback=_report_delivery,
+            )
+            if future.done() and future.exception() is not None:
+                # Rejected because the send queue is full.
+                return {"ack": False, "error": str(future.exception())}
+            return {"ack": True}
+
+        reply = tcp_adapter.send_command(
             command,
             vars=evt.get("vars") or None,
             template=evt.get("template"),
             meta=evt.get("meta") or None,
             extra=extra or None,
+            wait_ack=WAIT_ACK,
         )
+        if reply is not None:
+            return {"ack": bool(reply.get("ack"))}
     except Exception as exc:  # pragma: no cover - log and propagate ack failure
         print(f"[link_tcp] Failed to forward command: {exc}")
         return {"ack": False, "error": str(exc)}
@@ -63,4 +96,7 @@ engine.on(_always, handle_any)
 
 if __name__ == "__main__":
     bridge = OmniLinkMQTTBridge(engine)
-    bridge.loop_forever()
+    try:
+        bridge.loop_forever()
+    finally:
+        tcp_adapter.close()
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""Minimal MQTT 3.1.1 broker for local testing and benchmarks.
+
+This is a stand-in for Mosquitto so ``OmniLinkMQTTBridge`` can be exercised on
+a single machine without extra software.  It speaks plain TCP (no WebSockets,
+no TLS) and implements the subset paho-mqtt needs:
+
+* CONNECT/CONNACK (clean sessions only, no authentication, wills ignored)
+* PUBLISH with QoS 0 and 1 (PUBACK), retained messages
+* SUBSCRIBE/SUBACK and UNSUBSCRIBE/UNSUBACK with ``+``/``#`` wildcards and
+  ``$share/<group>/<filter>`` shared subscriptions (round-robin per group)
+* PINGREQ/PINGRESP and DISCONNECT
+
+QoS 1 deliveries are sent once and never retried, and granted QoS is capped at 1.
+
+Usage::
+
+    python chess_link/mqtt_broker.py --port 1883
+    MQTT_TRANSPORT=tcp MQTT_PORT=1883 python chess_link/link_mqtt.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import logging
+import signal
+import socket
+import socketserver
+import struct
+import sys
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+_DEFAULT_HOST = "127.0.0.1"
+_DEFAULT_PORT = 1883
+
+CONNECT, CONNACK, PUBLISH, PUBACK = 1, 2, 3, 4
+SUBSCRIBE, SUBACK, UNSUBSCRIBE, UNSUBACK = 8, 9, 10, 11
+PINGREQ, PINGRESP, DISCONNECT = 12, 13, 14
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def topic_matches(topic_filter: str, topic: str) -> bool:
+    """Return ``True`` if ``topic`` matches the MQTT ``topic_filter``."""
+
+    if topic.startswith("$") and topic_filter[:1] in ("+", "#"):
+        return False
+    f_parts = topic_filter.split("/")
+    t_parts = topic.split("/")
+    for idx, part in enumerate(f_parts):
+        if part == "#":
+            return True
+        if idx >= len(t_parts):
+            return False
+        if part != "+" and part != t_parts[idx]:
+            return False
+    return len(f_parts) == len(t_parts)
+
+
+def _encode_length(length: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte, length = length % 128, length // 128
+        out.append(byte | (0x80 if length else 0))
+        if not length:
+            return bytes(out)
+
+
+def _packet(first_byte: int, body: bytes) -> bytes:
+    return bytes((first_byte,)) + _encode_length(len(body)) + body
+
+
+def _utf8(value: str) -> bytes:
+    raw = value.encode("utf-8")
+    return struct.pack("!H", len(raw)) + raw
+
+
+def _read_utf8(body: bytes, pos: int) -> Tuple[str, int]:
+    (length,) = struct.unpack_from("!H", body, pos)
+    pos += 2
+    return body[pos:pos + length].decode("utf-8"), pos + length
+
+
+@dataclass
+class _Subscription:
+    session: "_Session"
+    topic_filter: str
+    qos: int
+    group: Optional[str] = None
+
+
+@dataclass
+class _Session:
+    client_id: str
+    sock: socket.socket
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    packet_ids: "itertools.count[int]" = field(default_factory=lambda: itertools.count(1))
+
+    def send(self, data: bytes) -> None:
+        with self.lock:
+            self.sock.sendall(data)
+
+    def next_packet_id(self) -> int:
+        return next(self.packet_ids) % 65535 + 1
+
+
+# ---------------------------------------------------------------------------
+# Broker
+# ---------------------------------------------------------------------------
+
+
+class MQTTBroker(socketserver.ThreadingTCPServer):
+    """Threaded broker; one handler thread per client connection."""
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, server_address: Tuple[str, int]) -> None:
+        super().__init__(server_address, _MQTTHandler)
+        self._lock = threading.Lock()
+        self._subs: List[_Subscription] = []
+        self._retained: Dict[str, Tuple[bytes, int]] = {}
+        self._group_cursor: Dict[Tuple[str, str], int] = {}
+        self.messages_in = 0
+        self.messages_out = 0
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def start(self) -> "MQTTBroker":
+        """Serve in a background thread (handy for tests and benchmarks)."""
+
+        threading.Thread(target=self.serve_forever, name="mqtt-broker", daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    # ----- subscriptions
+    def subscribe(self, session: _Session, topic_filter: str, qos: int) -> int:
+        group = None
+        if topic_filter.startswith("$share/"):
+            _, group, topic_filter = topic_filter.split("/", 2)
+        granted = min(qos, 1)
+        with self._lock:
+            self._subs = [
+                s for s in self._subs
+                if not (s.session is session and s.topic_filter == topic_filter and s.group == group)
+            ]
+            self._subs.append(_Subscription(session, topic_filter, granted, group))
+            retained = [
+                (topic, payload, rqos) for topic, (payload, rqos) in self._retained.items()
+                if group is None and topic_matches(topic_filter, topic)
+            ]
+        for topic, payload, rqos in retained:
+            self._deliver(session, topic, payload, min(granted, rqos), retain=True)
+        return granted
+
+    def unsubscribe(self, session: _Session, topic_filter: str) -> None:
+        group = None
+        if topic_filter.startswith("$share/"):
+            _, group, topic_filter = topic_filter.split("/", 2)
+        with self._lock:
+            self._subs = [
+                s for s in self._subs
+                if not (s.session is session and s.topic_filter == topic_filter and s.group == group)
+            ]
+
+    def drop_session(self, session: _Session) -> None:
+        with self._lock:
+            self._subs = [s for s in self._subs if s.session is not session]
+
+    # ----- routing
+    def publish(self, topic: str, payload: bytes, qos: int, retain: bool) -> None:
+        targets: Dict[int, Tuple[_Session, int]] = {}
+        groups: Dict[Tuple[str, str], List[_Subscription]] = {}
+        with self._lock:
+            self.messages_in += 1
+            if retain:
+                if payload:
+                    self._retained[topic] = (payload, qos)
+                else:
+                    self._retained.pop(topic, None)
+            for sub in self._subs:
+                if not topic_matches(sub.topic_filter, topic):
+                    continue
+                if sub.group is None:
+                    current = targets.get(id(sub.session))
+                    if current is None or sub.qos > current[1]:
+                        targets[id(sub.session)] = (sub.session, sub.qos)
+                else:
+                    groups.setdefault((sub.group, sub.topic_filter), []).append(sub)
+            for key, members in groups.items():
+                cursor = self._group_cursor.get(key, 0) % len(members)
+                self._group_cursor[key] = cursor + 1
+                chosen = members[cursor]
+                targets.setdefault(id(chosen.session), (chosen.session, chosen.qos))
+
+        for session, sub_qos in targets.values():
+            self._deliver(session, topic, payload, min(qos, sub_qos))
+
+    def _deliver(self, session: _Session, topic: str, payload: bytes, qos: int, *, retain: bool = False) -> None:
+        body = _utf8(topic)
+        if qos:
+            body += struct.pack("!H", session.next_packet_id())
+        try:
+            session.send(_packet((PUBLISH << 4) | (qos << 1) | int(retain), body + payload))
+        except OSError:
+            self.drop_session(session)
+            return
+        with self._lock:
+            self.messages_out += 1
+
+
+class _MQTTHandler(socketserver.BaseRequestHandler):
+    """Read packets from one client until it disconnects."""
+
+    def _read_exact(self, count: int) -> Optional[bytes]:
+        chunks = bytearray()
+        while len(chunks) < count:
+            chunk = self.request.recv(count - len(chunks))
+            if not chunk:
+                return None
+            chunks += chunk
+        return bytes(chunks)
+
+    def _read_packet(self) -> Optional[Tuple[int, int, bytes]]:
+        header = self._read_exact(1)
+        if header is None:
+            return None
+        multiplier, length = 1, 0
+        while True:
+            byte = self._read_exact(1)
+            if byte is None:
+                return None
+            length += (byte[0] & 0x7F) * multiplier
+            if not byte[0] & 0x80:
+                break
+            multiplier *= 128
+        body = self._read_exact(length) if length else b""
+        if body is None:
+            return None
+        return header[0] >> 4, header[0] & 0x0F, body
+
+    def handle(self) -> None:
+        broker: MQTTBroker = self.server  # type: ignore[assignment]
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        first = self._read_packet()
+        if first is None or first[0] != CONNECT:
+            return
+        body = first[2]
+        _protocol, pos = _read_utf8(body, 0)
+        pos += 4  # protocol level, connect flags, keepalive
+        client_id, _ = _read_utf8(body, pos)
+        session = _Session(client_id or f"anon-{id(self)}", self.request)
+        session.send(_packet(CONNACK << 4, b"\x00\x00"))
+        logging.debug("Client connected: %s", session.client_id)
+
+        try:
+            while True:
+                packet = self._read_packet()
+                if packet is None:
+                    return
+                ptype, flags, body = packet
+                if ptype == PUBLISH:
+                    qos = (flags >> 1) & 0x03
+                    topic, pos = _read_utf8(body, 0)
+                    if qos:
+                        (packet_id,) = struct.unpack_from("!H", body, pos)
+                        pos += 2
+                    broker.publish(topic, body[pos:], min(qos, 1), bool(flags & 0x01))
+                    if qos:
+                        session.send(_packet(PUBACK << 4, struct.pack("!H", packet_id)))
+                elif ptype == SUBSCRIBE:
+                    (packet_id,) = struct.unpack_from("!H", body, 0)
+                    pos, granted = 2, bytearray()
+                    while pos < len(body):
+                        topic_filter, pos = _read_utf8(body, pos)
+                        granted.append(broker.subscribe(session, topic_filter, body[pos] & 0x03))
+                        pos += 1
+                    session.send(_packet((SUBACK << 4), struct.pack("!H", packet_id) + bytes(granted)))
+                elif ptype == UNSUBSCRIBE:
+                    (packet_id,) = struct.unpack_from("!H", body, 0)
+                    pos = 2
+                    while pos < len(body):
+                        topic_filter, pos = _read_utf8(body, pos)
+                        broker.unsubscribe(session, topic_filter)
+                    session.send(_packet((UNSUBACK << 4), struct.pack("!H", packet_id)))
+                elif ptype == PINGREQ:
+                    session.send(_packet(PINGRESP << 4, b""))
+                elif ptype == DISCONNECT:
+                    return
+                # PUBACK from subscribers needs no action: deliveries are not retried.
+        except (OSError, struct.error, UnicodeDecodeError) as exc:
+            logging.debug("Client %s dropped: %s", session.client_id, exc)
+        finally:
+            broker.drop_session(session)
+
+
+# ---------------------------------------------------------------------------
+# Entrypoint
+# ---------------------------------------------------------------------------
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Minimal local MQTT 3.1.1 broker.")
+    parser.add_argument("--host", default=_DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=_DEFAULT_PORT)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO, format="[mqtt_broker] %(message)s")
+    broker = MQTTBroker((args.host, args.port))
+    logging.info("Listening on %s:%s", args.host, broker.port)
+
+    try:
+        signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=broker.shutdown).start())
+    except ValueError:
+        pass
+
+    try:
+        broker.serve_forever()
+    except KeyboardInterrupt:
+        logging.info("Shutting down broker")
+    finally:
+        broker.server_close()
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - manual utility
+    sys.exit(main())
@@ -4,17 +4,23 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
 import os
+import queue
 import re
+import select
 import socket
+import struct
 import threading
 import time
-from collections import Counter, deque
+import zlib
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import Future
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Pattern, Tuple, Union
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Pattern, Set, Tuple, Union
 
 import requests
 
@@ -55,6 +61,8 @@ def _remote_rest_endpoint(base_url: str) -> str:
 
 
 DEFAULT_REMOTE_TIMEOUT = 10
+REMOTE_SELECT_ALL = "user_key,last_command,last_response,updated_at"
+REMOTE_SELECT_POLL = "user_key,last_command,updated_at"
 
 # =========================================================
 # Type registry
@@ -392,6 +400,111 @@ def load_patterns_from_file(path: Union[str, Path], types: Optional[TypeRegistry
     raise FileNotFoundError(f"Patterns file not found. Tried: {', '.join(str(x) for x in tried)}")
 
 
+# =========================================================
+# Duplicate suppression (idempotency cache)
+# =========================================================
+# Env:
+#   OMNILINK_DEDUP_MODE    default: "auto"
+#                            auto    - suppress repeats of an explicit message id, and
+#                                      content repeats only when flagged as redelivery
+#                            content - also suppress identical payloads within the TTL
+#                            off     - no suppression
+#   OMNILINK_DEDUP_TTL     default: 30 (seconds a result is remembered)
+#   OMNILINK_DEDUP_SIZE    default: 1024 (remembered results, least recently used evicted;
+#                          commands still running are never evicted)
+
+class IdempotencyCache:
+    """
+    Bounded LRU+TTL map from a message key to the result of handling it.
+    run() executes a callable once per key; a repeat within the TTL returns the
+    cached result instead (and waits if the first call is still running).
+    """
+    _PENDING = object()
+
+    def __init__(self, ttl: Optional[float] = None, max_size: Optional[int] = None, mode: Optional[str] = None) -> None:
+        self.ttl = float(ttl if ttl is not None else os.environ.get("OMNILINK_DEDUP_TTL", "30"))
+        self.max_size = int(max_size if max_size is not None else os.environ.get("OMNILINK_DEDUP_SIZE", "1024"))
+        self.mode = (mode or os.environ.get("OMNILINK_DEDUP_MODE") or "auto").lower()
+        if self.mode not in ("auto", "content", "off"):
+            raise ValueError(f"Unknown dedup mode: {self.mode}")
+        self.metrics = Counter()
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, Any, threading.Event]]" = OrderedDict()
+
+    @staticmethod
+    def content_key(*parts: Union[str, bytes]) -> str:
+        h = hashlib.sha1()
+        for part in parts:
+            h.update(part if isinstance(part, bytes) else part.encode("utf-8"))
+            h.update(b"\0")
+        return "sha1:" + h.hexdigest()
+
+    def should_check(self, *, explicit_id: bool, redelivery: bool = False) -> bool:
+        """Whether a key of this kind may suppress a repeat under the current mode."""
+        if self.mode == "off":
+            return False
+        return explicit_id or redelivery or self.mode == "content"
+
+    def _expire(self, now: float) -> None:
+        # Entries still running are never evicted: a redelivery waiting on one
+        # would otherwise run the handler a second time.
+        excess = len(self._entries) - self.max_size
+        stale: List[str] = []
+        for key, (ts, value, _done) in self._entries.items():
+            if value is self._PENDING:
+                continue
+            if excess <= 0 and now - ts <= self.ttl:
+                break
+            stale.append(key)
+            excess -= 1
+        for key in stale:
+            del self._entries[key]
+
+    def run(self, key: Optional[str], fn: Callable[[], Any], *, check: bool = True) -> Tuple[Any, bool]:
+        """Return (result, duplicate). ``check=False`` records the result without suppressing."""
+        if key is None or self.mode == "off":
+            return fn(), False
+
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            entry = self._entries.get(key)
+            if check and entry is not None and now - entry[0] <= self.ttl:
+                self._entries.move_to_end(key)
+                waiting: Optional[threading.Event] = entry[2]
+            else:
+                waiting = None
+                done = threading.Event()
+                self._entries[key] = (now, self._PENDING, done)
+                self._entries.move_to_end(key)
+
+        if waiting is not None:
+            waiting.wait(timeout=self.ttl)
+            with self._lock:
+                cached = self._entries.get(key)
+            if cached is not None and cached[1] is not self._PENDING:
+                self.metrics["dedup.suppressed"] += 1
+                return cached[1], True
+            return fn(), False
+
+        try:
+            result = fn()
+        except BaseException:
+            with self._lock:
+                if key in self._entries and self._entries[key][2] is done:
+                    del self._entries[key]
+            done.set()
+            raise
+        with self._lock:
+            if key in self._entries and self._entries[key][2] is done:
+                self._entries[key] = (now, result, done)
+        done.set()
+        return result, False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
 # =========================================================
 # Remote command helpers (Supabase REST API)
 # =========================================================
@@ -460,15 +573,26 @@ class RemoteCommandClient:
             headers.update(extra)
         return headers
 
-    def fetch_last_command(self) -> Optional[Dict[str, Any]]:
-        """Return the most recent command for the configured user, if available."""
+    def fetch_last_command(
+        self,
+        *,
+        since: Optional[str] = None,
+        select: str = REMOTE_SELECT_ALL,
+    ) -> Optional[Dict[str, Any]]:
+        """Return the most recent command for the configured user, if available.
+
+        With ``since`` only rows updated after that ``updated_at`` value are
+        considered, so an unchanged table answers with an empty list.
+        """
 
-        params = {
-            "select": "user_key,last_command,last_response,updated_at",
+        params: Dict[str, Any] = {
+            "select": select,
             "user_key": f"eq.{self.user_key}",
             "order": "updated_at.desc",
             "limit": 1,
         }
+        if since:
+            params["updated_at"] = f"gt.{since}"
         response = self._session.get(
             self._endpoint,
             params=params,
@@ -481,15 +605,58 @@ class RemoteCommandClient:
             return data[0]
         return None
 
-    def update_last_response(self, response_text: str, *, last_command: Optional[str] = None) -> None:
-        """Persist ``response_text`` for the current user."""
+    def fetch_commands_since(
+        self,
+        since: str,
+        *,
+        limit: int = 100,
+        select: str = REMOTE_SELECT_POLL,
+    ) -> List[Dict[str, Any]]:
+        """Return up to ``limit`` rows with ``updated_at >= since``, oldest first.
+
+        The bound is inclusive so rows sharing the boundary timestamp are not
+        lost between pages; callers skip the ones they already handled.
+        """
+
+        params: Dict[str, Any] = {
+            "select": select,
+            "user_key": f"eq.{self.user_key}",
+            "updated_at": f"gte.{since}",
+            "order": "updated_at.asc",
+            "limit": limit,
+        }
+        response = self._session.get(
+            self._endpoint,
+            params=params,
+            headers=self._headers(),
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        data = response.json()
+        return [row for row in data if isinstance(row, dict)] if isinstance(data, list) else []
+
+    def update_last_response(
+        self,
+        response_text: str,
+        *,
+        last_command: Optional[str] = None,
+        updated_at: Optional[str] = None,
+    ) -> None:
+        """Persist ``response_text`` for the current user.
+
+        With ``updated_at`` only that row is written, as needed on a log-style
+        table that keeps one row per command.
+        """
 
         payload: Dict[str, Any] = {"last_response": response_text}
         if last_command is not None:
             payload["last_command"] = last_command
+        params = {"user_key": f"eq.{self.user_key}"}
+        if updated_at is not None:
+            params["updated_at"] = f"eq.{updated_at}"
         resp = self._session.patch(
             self._endpoint,
-            params={"user_key": f"eq.{self.user_key}"},
+            params=params,
             headers=self._headers(
                 content_type="application/json",
                 extra={"Prefer": "return=minimal"},
@@ -500,8 +667,137 @@ class RemoteCommandClient:
         resp.raise_for_status()
 
 
+class RemoteResponseWriter:
+    """Write remote responses back from a background thread.
+
+    ``submit`` returns at once. Pending responses are keyed by the row they
+    belong to (the user, or a row's ``updated_at`` in streaming mode), so a
+    newer response replaces one that has not been written yet. Each flush
+    hands every pending entry to ``write(batch)`` in one call, where ``batch``
+    maps ``key -> (response, updated_at)`` and ``updated_at`` identifies the
+    handled row; on a
+    ``requests.RequestException`` the entries go back to the queue (unless
+    superseded) and are retried with exponential backoff. Any other error
+    drops the batch (counted as ``failed``) and keeps the thread running.
+    """
+
+    def __init__(
+        self,
+        write: Callable[[Dict[str, Tuple[str, Optional[str]]]], None],
+        *,
+        backoff_min: float = 0.5,
+        backoff_max: float = 30.0,
+        log: bool = False,
+    ) -> None:
+        self._write = write
+        self.backoff_min = backoff_min
+        self.backoff_max = backoff_max
+        self.log = log
+        self.metrics = Counter()
+        self._cond = threading.Condition()
+        self._pending: Dict[str, Tuple[str, Optional[str]]] = {}
+        self._inflight = False
+        self._closing = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._pending) + (1 if self._inflight else 0)
+
+    def submit(self, user_key: str, response: str, updated_at: Optional[str] = None) -> None:
+        with self._cond:
+            if user_key in self._pending:
+                self.metrics["merged"] += 1
+            self._pending[user_key] = (response, updated_at)
+            self.metrics["submitted"] += 1
+            if self._thread is None or not self._thread.is_alive():
+                self._closing.clear()
+                self._thread = threading.Thread(target=self._run, name="omnilink-remote-writer", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def _run(self) -> None:
+        delay = self.backoff_min
+        while True:
+            with self._cond:
+                while not self._pending and not self._closing.is_set():
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                batch, self._pending = self._pending, {}
+                self._inflight = True
+            retry = False
+            try:
+                self._write(batch)
+            except requests.RequestException as exc:
+                retry = True
+                self.metrics["retries"] += 1
+                with self._cond:
+                    for user_key, entry in batch.items():
+                        self._pending.setdefault(user_key, entry)
+                if self.log:
+                    print(f"[OmniLinkRemote] write-back error ({exc}); retrying in {delay:.1f}s")
+            except Exception as exc:
+                self.metrics["failed"] += len(batch)
+                print(f"[OmniLinkRemote] dropping {len(batch)} response(s) after write-back error: {exc!r}")
+            else:
+                delay = self.backoff_min
+                self.metrics["written"] += len(batch)
+                self.metrics["requests"] += 1
+            finally:
+                with self._cond:
+                    self._inflight = False
+                    self._cond.notify_all()
+            if retry:
+                if self._closing.wait(delay):
+                    with self._cond:
+                        self.metrics["dropped"] += len(self._pending)
+                        self._pending.clear()
+                        self._cond.notify_all()
+                    return
+                delay = min(delay * 2, self.backoff_max)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything submitted so far is written; ``False`` on timeout."""
+
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending and not self._inflight, timeout)
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """Flush for up to ``timeout`` seconds, then stop (dropping what is left)."""
+
+        self.flush(timeout)
+        self._closing.set()
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+
 class OmniLinkRemoteCommandBridge:
-    """Poll Supabase for commands and run them through an ``OmniLinkEngine``."""
+    """Poll Supabase for commands and run them through an ``OmniLinkEngine``.
+
+    Polling is adaptive: after a command the bridge polls every
+    ``min_interval`` seconds, and while idle the interval grows by ``backoff``
+    up to ``poll_interval``. Polls only ask for rows newer than the last
+    ``updated_at`` seen, without the ``last_response`` column.
+
+    In streaming mode every row newer than a checkpoint is handled, oldest
+    first and page by page, instead of only the newest one. The checkpoint is
+    kept in ``checkpoint_path`` (when set) so a restart resumes after the last
+    handled row; without a checkpoint the bridge starts after the newest row.
+
+    Environment variables:
+      - OMNILINK_REMOTE_POLL_MIN: interval right after activity (default 0.25).
+      - OMNILINK_REMOTE_POLL_BACKOFF: idle growth factor (default 2).
+      - OMNILINK_REMOTE_STREAM: set to 1/true to enable streaming mode.
+      - OMNILINK_REMOTE_CHECKPOINT: checkpoint file for streaming mode.
+      - OMNILINK_REMOTE_PAGE_SIZE: rows per request in streaming mode (default 100).
+      - OMNILINK_REMOTE_ASYNC_WRITE: write responses back in the background
+        (default 1); set to 0 to wait for each PATCH before polling again.
+    """
 
     def __init__(
         self,
@@ -509,15 +805,44 @@ class OmniLinkRemoteCommandBridge:
         client: Optional[RemoteCommandClient] = None,
         *,
         poll_interval: float = 2.0,
+        min_interval: Optional[float] = None,
+        backoff: Optional[float] = None,
         log: Optional[bool] = None,
+        dedup: Optional[IdempotencyCache] = None,
+        stream: Optional[bool] = None,
+        checkpoint_path: Optional[Union[str, Path]] = None,
+        page_size: Optional[int] = None,
+        async_write: Optional[bool] = None,
     ) -> None:
         self.engine = engine
         self.client = client or RemoteCommandClient()
         self.poll_interval = poll_interval
+        if min_interval is None:
+            min_interval = float(os.environ.get("OMNILINK_REMOTE_POLL_MIN", "0.25"))
+        self.min_interval = min(min_interval, poll_interval)
+        self.backoff = max(1.0, float(backoff if backoff is not None else os.environ.get("OMNILINK_REMOTE_POLL_BACKOFF", "2")))
+        self._interval = self.min_interval
+        self._last_seen: Optional[str] = None
         self.log = _env_flag("OMNILINK_REMOTE_LOG", True) if log is None else log
+        self.dedup = dedup or IdempotencyCache()
+        self.metrics = Counter()
         self._stop_event = threading.Event()
         self._thread: Optional[threading.Thread] = None
         self._last_signature: Optional[Tuple[str, str]] = None
+        if async_write is None:
+            async_write = _env_flag("OMNILINK_REMOTE_ASYNC_WRITE", True)
+        self.stream = _env_flag("OMNILINK_REMOTE_STREAM", False) if stream is None else stream
+        self.writer = RemoteResponseWriter(self._write_batch, log=self.log) if async_write else None
+        if checkpoint_path is None:
+            checkpoint_path = os.environ.get("OMNILINK_REMOTE_CHECKPOINT") or None
+        self.checkpoint_path = Path(checkpoint_path) if checkpoint_path else None
+        self.page_size = int(page_size if page_size is not None else os.environ.get("OMNILINK_REMOTE_PAGE_SIZE", "100"))
+        # Streaming position: newest updated_at handled, plus the rows handled at
+        # exactly that timestamp (the next page starts inclusively there).
+        self._checkpoint: Optional[str] = None
+        self._checkpoint_done: List[List[str]] = []
+        if self.stream:
+            self._load_checkpoint()
 
     def _format_response(self, payload: Dict[str, Any]) -> str:
         try:
@@ -525,11 +850,139 @@ class OmniLinkRemoteCommandBridge:
         except TypeError:
             return str(payload)
 
+    def _write_batch(self, batch: Dict[str, Tuple[str, Optional[str]]]) -> None:
+        # Only the handled row is written and its command is left alone: a
+        # command posted meanwhile has a new updated_at and stays untouched.
+        for response, updated_at in batch.values():
+            self.client.update_last_response(response, updated_at=updated_at)
+
+    def _handle_record(self, record: Dict[str, Any], command: str) -> Tuple[Dict[str, Any], bool]:
+        """Run ``command`` from ``record`` and write back (or queue) the response; return (result, written)."""
+
+        meta = {
+            "source": "remote",
+            "remote": {
+                "user_key": record.get("user_key"),
+                "updated_at": record.get("updated_at"),
+            },
+        }
+        # A row whose write-back failed is fetched again on the next poll;
+        # replay its result instead of moving the piece a second time.
+        key = f"remote:{record.get('user_key')}:{record.get('updated_at')}:{command}"
+        result, duplicate = self.dedup.run(key, lambda: self.engine.handle(command, meta=meta))
+        if duplicate:
+            self.metrics["dedup.suppressed"] += 1
+            if self.log:
+                print(f"[OmniLinkRemote] duplicate '{command}' suppressed; resending response")
+
+        response_payload = self._format_response(result)
+        updated_at = record.get("updated_at") or None
+        if self.writer is not None:
+            if self.stream:
+                key = updated_at or ""
+            else:
+                key = record.get("user_key") or self.client.user_key
+            self.writer.submit(str(key), response_payload, updated_at)
+            if self.log:
+                print(f"[OmniLinkRemote] handled '{command}' -> {response_payload} (write-back queued)")
+            return result, True
+        try:
+            self.client.update_last_response(response_payload, updated_at=updated_at)
+        except requests.RequestException as exc:
+            if self.log:
+                print(f"[OmniLinkRemote] update error: {exc}")
+            return result, False
+        if self.log:
+            print(f"[OmniLinkRemote] handled '{command}' -> {response_payload}")
+        return result, True
+
+    # ----- Streaming mode
+    def _load_checkpoint(self) -> None:
+        if not self.checkpoint_path or not self.checkpoint_path.exists():
+            return
+        try:
+            data = json.loads(self.checkpoint_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            print(f"[OmniLinkRemote] ignoring unreadable checkpoint {self.checkpoint_path}: {exc}")
+            return
+        self._checkpoint = data.get("updated_at") or None
+        self._checkpoint_done = [list(sig) for sig in data.get("done") or []]
+
+    def _save_checkpoint(self) -> None:
+        if not self.checkpoint_path:
+            return
+        tmp = self.checkpoint_path.with_name(self.checkpoint_path.name + ".tmp")
+        tmp.write_text(
+            json.dumps({"updated_at": self._checkpoint, "done": self._checkpoint_done}),
+            encoding="utf-8",
+        )
+        os.replace(tmp, self.checkpoint_path)
+
+    def _advance(self, updated_at: str, command: str) -> None:
+        if updated_at != self._checkpoint:
+            self._checkpoint, self._checkpoint_done = updated_at, []
+        self._checkpoint_done.append([command, updated_at])
+        self._save_checkpoint()
+
+    def process_stream(self) -> Optional[Dict[str, Any]]:
+        """Handle every row newer than the checkpoint in order; return the last result."""
+
+        if self._checkpoint is None:
+            try:
+                newest = self.client.fetch_last_command(select=REMOTE_SELECT_POLL)
+            except requests.RequestException as exc:
+                if self.log:
+                    print(f"[OmniLinkRemote] fetch error: {exc}")
+                return None
+            if not newest or not newest.get("updated_at"):
+                return None
+            self._advance(newest["updated_at"], (newest.get("last_command") or "").strip())
+            if self.log:
+                print(f"[OmniLinkRemote] streaming from {self._checkpoint}")
+            return None
+
+        last_result: Optional[Dict[str, Any]] = None
+        limit = self.page_size
+        while not self._stop_event.is_set():
+            try:
+                rows = self.client.fetch_commands_since(self._checkpoint, limit=limit)
+            except requests.RequestException as exc:
+                if self.log:
+                    print(f"[OmniLinkRemote] fetch error: {exc}")
+                break
+
+            progressed = False
+            for record in rows:
+                updated_at = record.get("updated_at") or ""
+                command = (record.get("last_command") or "").strip()
+                if updated_at == self._checkpoint and [command, updated_at] in self._checkpoint_done:
+                    continue
+                progressed = True
+                if command:
+                    result, written = self._handle_record(record, command)
+                    if not written:
+                        # Keep order: retry this row (with its cached result) next poll.
+                        return last_result or result
+                    last_result = result
+                    self._last_signature = (command, updated_at)
+                    self.metrics["stream.handled"] += 1
+                self._advance(updated_at, command)
+
+            if len(rows) < limit:
+                break
+            # A full page of rows already handled at the boundary timestamp:
+            # widen the page so the next request reaches past them.
+            limit = self.page_size if progressed else limit * 2
+        return last_result
+
     def process_once(self) -> Optional[Dict[str, Any]]:
-        """Fetch and handle the most recent command once."""
+        """Fetch and handle the most recent command once (or all new ones when streaming)."""
+
+        if self.stream:
+            return self.process_stream()
 
         try:
-            record = self.client.fetch_last_command()
+            record = self.client.fetch_last_command(since=self._last_seen, select=REMOTE_SELECT_POLL)
         except requests.RequestException as exc:
             if self.log:
                 print(f"[OmniLinkRemote] fetch error: {exc}")
@@ -538,34 +991,22 @@ class OmniLinkRemoteCommandBridge:
         if not record:
             return None
 
+        # Rows at or before _last_seen are not fetched again, so it only moves
+        # past a row once that row needs no further work.
         command = (record.get("last_command") or "").strip()
         if not command:
+            self._last_seen = record.get("updated_at") or self._last_seen
             return None
 
         signature = (command, record.get("updated_at") or "")
         if signature == self._last_signature:
+            self._last_seen = record.get("updated_at") or self._last_seen
             return None
 
-        meta = {
-            "source": "remote",
-            "remote": {
-                "user_key": record.get("user_key"),
-                "updated_at": record.get("updated_at"),
-            },
-        }
-        result = self.engine.handle(command, meta=meta)
-
-        response_payload = self._format_response(result)
-        try:
-            self.client.update_last_response(response_payload, last_command=command)
-        except requests.RequestException as exc:
-            if self.log:
-                print(f"[OmniLinkRemote] update error: {exc}")
-        else:
+        result, written = self._handle_record(record, command)
+        if written:
             self._last_signature = signature
-            if self.log:
-                print(f"[OmniLinkRemote] handled '{command}' -> {response_payload}")
-
+            self._last_seen = record.get("updated_at") or self._last_seen
         return result
 
     def loop_forever(self) -> None:
@@ -574,10 +1015,17 @@ class OmniLinkRemoteCommandBridge:
         self._stop_event.clear()
         try:
             while not self._stop_event.is_set():
-                self.process_once()
-                self._stop_event.wait(self.poll_interval)
+                if self.process_once() is not None:
+                    self._interval = self.min_interval
+                else:
+                    self._interval = min(self._interval * self.backoff, self.poll_interval)
+                self._stop_event.wait(self._interval)
         except KeyboardInterrupt:
             pass
+        finally:
+            # Write out queued responses before returning.
+            if self.writer is not None:
+                self.writer.close()
 
     def start(self) -> "OmniLinkRemoteCommandBridge":
         """Start polling in a background thread."""
@@ -599,21 +1047,611 @@ class OmniLinkRemoteCommandBridge:
         if self._thread and self._thread.is_alive():
             self._thread.join(timeout=self.poll_interval * 2)
         self._thread = None
+        if self.writer is not None:
+            self.writer.close()
+
+
+class MultiUserRemoteClient:
+    """Fetch and update remote commands for many users with batched REST calls.
+
+    Reading several users' rows with the anon key needs an RLS policy that
+    accepts the comma separated ``X-Client-User-Key`` header this client sends
+    (for example ``user_key = any(string_to_array(<header>, ','))``) or a key
+    that bypasses RLS.
+
+    Environment variables:
+      - OMNILINK_REMOTE_BASE_URL / OMNILINK_REMOTE_ANON_KEY as for RemoteCommandClient.
+      - OMNILINK_REMOTE_USER_KEYS: comma separated user keys.
+    """
+
+    ENV_USER_KEYS = "OMNILINK_REMOTE_USER_KEYS"
+    BATCH_SIZE = 200  # user keys per request, keeps URLs short
+
+    def __init__(
+        self,
+        *,
+        base_url: Optional[str] = None,
+        anon_key: Optional[str] = None,
+        user_keys: Optional[Iterable[str]] = None,
+        session: Optional[requests.Session] = None,
+        timeout: int = DEFAULT_REMOTE_TIMEOUT,
+    ) -> None:
+        if base_url is None:
+            base_url = os.environ.get(RemoteCommandClient.ENV_BASE_URL)
+        if anon_key is None:
+            anon_key = os.environ.get(RemoteCommandClient.ENV_ANON_KEY)
+        if user_keys is None:
+            user_keys = (os.environ.get(self.ENV_USER_KEYS) or "").split(",")
+        keys = [k.strip() for k in user_keys if k and k.strip()]
+
+        missing: List[str] = []
+        if not base_url:
+            missing.append(RemoteCommandClient.ENV_BASE_URL)
+        if not anon_key:
+            missing.append(RemoteCommandClient.ENV_ANON_KEY)
+        if not keys:
+            missing.append(self.ENV_USER_KEYS)
+        if missing:
+            raise RuntimeError(
+                "MultiUserRemoteClient missing configuration; set environment variables "
+                + ", ".join(missing)
+            )
+
+        self.base_url = base_url
+        self.anon_key = anon_key
+        self.user_keys = list(dict.fromkeys(keys))
+        self.timeout = timeout
+        self._endpoint = _remote_rest_endpoint(base_url)
+        self._session = session or requests.Session()
+
+    def _headers(self, user_keys: List[str], **extra: str) -> Dict[str, str]:
+        headers = {
+            "apikey": self.anon_key,
+            "Authorization": f"Bearer {self.anon_key}",
+            "X-Client-User-Key": ",".join(user_keys),
+            "Accept": "application/json",
+        }
+        headers.update(extra)
+        return headers
+
+    def _batches(self) -> Iterable[List[str]]:
+        for i in range(0, len(self.user_keys), self.BATCH_SIZE):
+            yield self.user_keys[i:i + self.BATCH_SIZE]
+
+    def fetch_latest(
+        self,
+        *,
+        since: Optional[str] = None,
+        select: str = REMOTE_SELECT_POLL,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Return the newest row per user key, optionally only rows newer than ``since``."""
+
+        latest: Dict[str, Dict[str, Any]] = {}
+        for keys in self._batches():
+            params: Dict[str, Any] = {
+                "select": select,
+                "user_key": "in.(" + ",".join(f'"{k}"' for k in keys) + ")",
+                "order": "updated_at.desc",
+            }
+            if since:
+                params["updated_at"] = f"gt.{since}"
+            response = self._session.get(
+                self._endpoint,
+                params=params,
+                headers=self._headers(keys),
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+            data = response.json()
+            if isinstance(data, list):
+                for row in data:
+                    if isinstance(row, dict) and row.get("user_key") not in latest:
+                        latest[row["user_key"]] = row
+        return latest
+
+    def update_responses(self, responses: Dict[str, Tuple[str, Optional[str]]]) -> None:
+        """Write ``{user_key: (last_response, updated_at)}``, one PATCH per user.
+
+        Each PATCH matches the handled row's ``updated_at`` and leaves
+        ``last_command`` alone, so a command posted since is not overwritten.
+        An upsert cannot carry that condition, hence no single batched write.
+        """
+
+        for user_key, (response_text, updated_at) in responses.items():
+            params = {"user_key": f"eq.{user_key}"}
+            if updated_at is not None:
+                params["updated_at"] = f"eq.{updated_at}"
+            resp = self._session.patch(
+                self._endpoint,
+                params=params,
+                headers=self._headers(
+                    [user_key],
+                    **{
+                        "Content-Type": "application/json",
+                        "Prefer": "return=minimal",
+                    },
+                ),
+                json={"last_response": response_text},
+                timeout=self.timeout,
+            )
+            resp.raise_for_status()
+
+
+class OmniLinkMultiUserRemoteBridge:
+    """Serve many remote users from one process.
+
+    Each poll fetches the newest row of every user in one request per batch of
+    keys, runs new commands through the engine returned by
+    ``engine_factory(user_key)`` (called once per user), and writes the
+    responses back to the handled rows. Polling backs off like
+    :class:`OmniLinkRemoteCommandBridge`, and the writes run on a
+    :class:`RemoteResponseWriter` unless ``OMNILINK_REMOTE_ASYNC_WRITE=0``.
+
+    Each user has their own ``updated_at`` watermark. A poll asks for rows
+    newer than the oldest of them (everything while some user has none), so a
+    row that becomes visible after a newer row of another user is still found.
+    """
+
+    def __init__(
+        self,
+        engine_factory: Callable[[str], OmniLinkEngine],
+        client: Optional[MultiUserRemoteClient] = None,
+        *,
+        poll_interval: float = 2.0,
+        min_interval: Optional[float] = None,
+        backoff: Optional[float] = None,
+        log: Optional[bool] = None,
+        dedup: Optional[IdempotencyCache] = None,
+        async_write: Optional[bool] = None,
+    ) -> None:
+        self.engine_factory = engine_factory
+        self.client = client or MultiUserRemoteClient()
+        self.poll_interval = poll_interval
+        if min_interval is None:
+            min_interval = float(os.environ.get("OMNILINK_REMOTE_POLL_MIN", "0.25"))
+        self.min_interval = min(min_interval, poll_interval)
+        self.backoff = max(1.0, float(backoff if backoff is not None else os.environ.get("OMNILINK_REMOTE_POLL_BACKOFF", "2")))
+        self.log = _env_flag("OMNILINK_REMOTE_LOG", True) if log is None else log
+        self.dedup = dedup or IdempotencyCache()
+        self.metrics = Counter()
+        self._engines: Dict[str, OmniLinkEngine] = {}
+        self._signatures: Dict[str, Tuple[str, str]] = {}
+        self._last_seen: Dict[str, str] = {}
+        self._interval = self.min_interval
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        if async_write is None:
+            async_write = _env_flag("OMNILINK_REMOTE_ASYNC_WRITE", True)
+        self.writer = RemoteResponseWriter(self.client.update_responses, log=self.log) if async_write else None
+
+    def engine_for(self, user_key: str) -> OmniLinkEngine:
+        engine = self._engines.get(user_key)
+        if engine is None:
+            engine = self._engines[user_key] = self.engine_factory(user_key)
+        return engine
+
+    def _format_response(self, payload: Dict[str, Any]) -> str:
+        try:
+            return json.dumps(payload, ensure_ascii=False)
+        except TypeError:
+            return str(payload)
+
+    def process_once(self) -> int:
+        """Fetch every user's newest row once; return how many commands ran."""
+
+        since: Optional[str] = None
+        if all(key in self._last_seen for key in self.client.user_keys):
+            since = min(self._last_seen.values(), default=None)
+        try:
+            rows = self.client.fetch_latest(since=since)
+        except requests.RequestException as exc:
+            if self.log:
+                print(f"[OmniLinkRemote] fetch error: {exc}")
+            return 0
+        self.metrics["poll.calls"] += 1
+
+        pending: Dict[str, Tuple[str, Optional[str]]] = {}
+        signatures: Dict[str, Tuple[str, str]] = {}
+        seen: Dict[str, str] = {}
+        for user_key, record in rows.items():
+            updated_at = record.get("updated_at") or ""
+            command = (record.get("last_command") or "").strip()
+            signature = (command, updated_at)
+            if command and signature != self._signatures.get(user_key):
+                meta = {"source": "remote", "remote": {"user_key": user_key, "updated_at": updated_at}}
+                engine = self.engine_for(user_key)
+                key = f"remote:{user_key}:{updated_at}:{command}"
+                result, duplicate = self.dedup.run(key, lambda: engine.handle(command, meta=meta))
+                if duplicate:
+                    self.metrics["dedup.suppressed"] += 1
+                pending[user_key] = (self._format_response(result), updated_at or None)
+                signatures[user_key] = signature
+            if updated_at and updated_at > self._last_seen.get(user_key, ""):
+                seen[user_key] = updated_at
+
+        if self.writer is not None:
+            for user_key, (response, updated_at) in pending.items():
+                self.writer.submit(user_key, response, updated_at)
+        elif pending:
+            try:
+                self.client.update_responses(pending)
+            except requests.RequestException as exc:
+                # Keep the watermarks so these rows are fetched again and their
+                # cached results re-sent on the next poll.
+                if self.log:
+                    print(f"[OmniLinkRemote] update error: {exc}")
+                return len(pending)
+
+        self._signatures.update(signatures)
+        self._last_seen.update(seen)
+        self.metrics["handled"] += len(pending)
+        if self.log and pending:
+            print(f"[OmniLinkRemote] handled {len(pending)} command(s) for {len(pending)} user(s)")
+        return len(pending)
+
+    def loop_forever(self) -> None:
+        """Continuously poll for commands until ``stop`` is called."""
+
+        self._stop_event.clear()
+        try:
+            while not self._stop_event.is_set():
+                if self.process_once():
+                    self._interval = self.min_interval
+                else:
+                    self._interval = min(self._interval * self.backoff, self.poll_interval)
+                self._stop_event.wait(self._interval)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            # Write out queued responses before returning.
+            if self.writer is not None:
+                self.writer.close()
+
+    def start(self) -> "OmniLinkMultiUserRemoteBridge":
+        """Start polling in a background thread."""
+
+        if self._thread and self._thread.is_alive():
+            return self
+        self._stop_event.clear()
+        thread = threading.Thread(target=self.loop_forever, daemon=True)
+        self._thread = thread
+        thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the background polling thread if running."""
+
+        self._stop_event.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=self.poll_interval * 2)
+        self._thread = None
+        if self.writer is not None:
+            self.writer.close()
+
+
+# =========================================================
+# TCP binary framing
+# =========================================================
+# Optional compact framing between OmniLinkTCPAdapter and tcp_client.py.
+#
+# Handshake: the sender writes FRAME_MAGIC (0xB1) as the first byte of the
+# connection and the receiver answers with the same byte. A receiver that sees
+# any other first byte treats the connection as delimiter-separated text.
+#
+# Frame: header "!IB" (body length, kind) followed by the body:
+#   FRAME_JSON          UTF-8 JSON object (any payload)
+#   FRAME_TEMPLATE_DEF  "!H" template id + UTF-8 template text; later frames
+#                       on the same connection refer to the template by id
+#   FRAME_MOVE          "!HBBBBBd" template id (0xFFFF = none), color, piece,
+#                       from square, to square (0..63, a1=0, h8=63), flags,
+#                       timestamp (NaN = none), then optional UTF-8 JSON with
+#                       the remaining keys (meta, ...)
+# A move frame stands for {"command": "move_<color>_<piece>_from_<sq>_to_<sq>",
+# "template", "vars": {color, piece, location1, location2}, "text", "timestamp"}
+# exactly as link_tcp builds it; anything else is sent as FRAME_JSON.
+
+FRAME_MAGIC = 0xB1
+FRAME_JSON = 1
+FRAME_TEMPLATE_DEF = 2
+FRAME_MOVE = 3
+FRAME_HEADER = struct.Struct("!IB")
+_MOVE_BODY = struct.Struct("!HBBBBBd")
+_NO_TEMPLATE = 0xFFFF
+_MOVE_UPPER = 0x01       # squares written upper case ("C2")
+_MOVE_TEXT = 0x02        # "text" equals "command"
+_MOVE_TIMESTAMP = 0x04   # timestamp present
+MOVE_COLORS = ("white", "black")
+MOVE_PIECES = ("pawn", "knight", "bishop", "rook", "queen", "king")
+_MOVE_VARS = ("color", "piece", "location1", "location2")
+
+
+class FrameError(ValueError):
+    """Malformed or oversized binary frame."""
+
+
+def _square_code(square: Any) -> Optional[int]:
+    if not isinstance(square, str) or len(square) != 2:
+        return None
+    file, rank = square[0].lower(), square[1]
+    if file not in "abcdefgh" or rank not in "12345678":
+        return None
+    return (int(rank) - 1) * 8 + (ord(file) - ord("a"))
+
+
+def _square_name(code: int, upper: bool) -> str:
+    name = f"{chr(ord('a') + code % 8)}{code // 8 + 1}"
+    return name.upper() if upper else name
+
+
+class BinaryFrameEncoder:
+    """Encode payloads as frames, interning templates.
+
+    Template ids are shared by every connection that uses this encoder, but a
+    receiver only knows the definitions sent on its own connection: before
+    writing a frame that :meth:`encode` reports as using template ids, send
+    :meth:`definitions` for the ids that connection has not seen yet.
+    """
+
+    def __init__(self) -> None:
+        self._templates: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def frame(kind: int, body: bytes) -> bytes:
+        return FRAME_HEADER.pack(len(body), kind) + body
+
+    def definitions(self, tids: Iterable[int]) -> bytes:
+        """Return the FRAME_TEMPLATE_DEF frames for ``tids``."""
+
+        with self._lock:
+            texts = {tid: text for text, tid in self._templates.items()}
+        return b"".join(
+            self.frame(FRAME_TEMPLATE_DEF, struct.pack("!H", tid) + texts[tid].encode("utf-8")) for tid in tids
+        )
+
+    def _intern(self, template: str) -> int:
+        with self._lock:
+            tid = self._templates.get(template)
+            if tid is not None:
+                return tid
+            if len(self._templates) >= _NO_TEMPLATE:
+                return _NO_TEMPLATE
+            tid = self._templates[template] = len(self._templates)
+        return tid
+
+    def _move_body(self, payload: Dict[str, Any]) -> Optional[Tuple[int, bytes]]:
+        vars_ = payload.get("vars")
+        command = payload.get("command")
+        if not isinstance(vars_, dict) or set(vars_) != set(_MOVE_VARS) or not isinstance(command, str):
+            return None
+        color, piece, src, dst = (vars_[k] for k in _MOVE_VARS)
+        if color not in MOVE_COLORS or piece not in MOVE_PIECES:
+            return None
+        src_code, dst_code = _square_code(src), _square_code(dst)
+        if src_code is None or dst_code is None:
+            return None
+        upper = src.isupper()
+        if dst.isupper() != upper or src != _square_name(src_code, upper) or dst != _square_name(dst_code, upper):
+            return None
+        if command != f"move_{color}_{piece}_from_{src}_to_{dst}":
+            return None
+
+        rest = {k: v for k, v in payload.items() if k not in ("command", "vars", "template", "text", "timestamp")}
+        flags = _MOVE_UPPER if upper else 0
+        text = payload.get("text")
+        if text is not None:
+            if text != command:
+                rest["text"] = text
+            else:
+                flags |= _MOVE_TEXT
+        timestamp = payload.get("timestamp")
+        if isinstance(timestamp, (int, float)) and not isinstance(timestamp, bool):
+            flags |= _MOVE_TIMESTAMP
+        elif timestamp is not None:
+            rest["timestamp"] = timestamp
+        template = payload.get("template")
+        tid = self._intern(template) if isinstance(template, str) else _NO_TEMPLATE
+        if tid == _NO_TEMPLATE and template is not None:
+            rest["template"] = template
+
+        body = _MOVE_BODY.pack(
+            tid,
+            MOVE_COLORS.index(color),
+            MOVE_PIECES.index(piece),
+            src_code,
+            dst_code,
+            flags,
+            float(timestamp) if flags & _MOVE_TIMESTAMP else float("nan"),
+        )
+        if rest:
+            body += json.dumps(rest, ensure_ascii=False).encode("utf-8")
+        return tid, body
+
+    def encode(self, payload: Union[str, Dict[str, Any]]) -> Tuple[bytes, Tuple[int, ...]]:
+        """Return the frame for ``payload`` and the template ids it refers to."""
+
+        if isinstance(payload, dict):
+            packed = self._move_body(payload)
+            if packed is not None:
+                tid, body = packed
+                return self.frame(FRAME_MOVE, body), (() if tid == _NO_TEMPLATE else (tid,))
+            return self.frame(FRAME_JSON, json.dumps(payload, ensure_ascii=False).encode("utf-8")), ()
+        return self.frame(FRAME_JSON, json.dumps({"command": payload}, ensure_ascii=False).encode("utf-8")), ()
+
+
+class BinaryFrameDecoder:
+    """Incremental frame decoder for one connection.
+
+    ``feed(data)`` buffers bytes and returns the payload dicts of every complete
+    frame; template definitions are absorbed. A frame body larger than
+    ``max_size`` raises :class:`FrameError`.
+    """
+
+    def __init__(self, max_size: int = 1 << 20) -> None:
+        self.max_size = max_size
+        self._buffer = bytearray()
+        self._templates: Dict[int, str] = {}
+
+    def feed(self, data: bytes) -> List[Dict[str, Any]]:
+        self._buffer += data
+        view = memoryview(self._buffer)
+        out: List[Dict[str, Any]] = []
+        pos = 0
+        try:
+            while len(view) - pos >= FRAME_HEADER.size:
+                length, kind = FRAME_HEADER.unpack_from(view, pos)
+                if length > self.max_size:
+                    raise FrameError(f"frame of {length} bytes exceeds limit of {self.max_size}")
+                end = pos + FRAME_HEADER.size + length
+                if end > len(view):
+                    break
+                payload = self._decode(kind, view[pos + FRAME_HEADER.size:end])
+                if payload is not None:
+                    out.append(payload)
+                pos = end
+        finally:
+            view.release()
+        del self._buffer[:pos]
+        return out
+
+    def _decode(self, kind: int, body: memoryview) -> Optional[Dict[str, Any]]:
+        try:
+            if kind == FRAME_TEMPLATE_DEF:
+                (tid,) = struct.unpack_from("!H", body)
+                self._templates[tid] = bytes(body[2:]).decode("utf-8")
+                return None
+            if kind == FRAME_JSON:
+                payload = json.loads(bytes(body).decode("utf-8"))
+                if not isinstance(payload, dict):
+                    raise FrameError("JSON frame must hold an object")
+                return payload
+            if kind == FRAME_MOVE:
+                tid, color, piece, src, dst, flags, timestamp = _MOVE_BODY.unpack_from(body)
+                upper = bool(flags & _MOVE_UPPER)
+                vars_ = {
+                    "color": MOVE_COLORS[color],
+                    "piece": MOVE_PIECES[piece],
+                    "location1": _square_name(src, upper),
+                    "location2": _square_name(dst, upper),
+                }
+                command = "move_{color}_{piece}_from_{location1}_to_{location2}".format(**vars_)
+                payload: Dict[str, Any] = {"command": command}
+                if tid != _NO_TEMPLATE:
+                    if tid not in self._templates:
+                        raise FrameError(f"unknown template id {tid}")
+                    payload["template"] = self._templates[tid]
+                payload["vars"] = vars_
+                if flags & _MOVE_TEXT:
+                    payload["text"] = command
+                if flags & _MOVE_TIMESTAMP:
+                    payload["timestamp"] = timestamp
+                if len(body) > _MOVE_BODY.size:
+                    payload.update(json.loads(bytes(body[_MOVE_BODY.size:]).decode("utf-8")))
+                return payload
+        except (struct.error, IndexError, UnicodeDecodeError, json.JSONDecodeError) as exc:
+            raise FrameError(f"bad frame of kind {kind}: {exc}") from exc
+        raise FrameError(f"unknown frame kind {kind}")
 
 
 # =========================================================
 # TCP adapter
 # =========================================================
 
+class _PartialWrite(OSError):
+    """A send failed after part of the data was already written to the socket."""
+
+
+def _sendall(sock: socket.socket, data: bytes) -> None:
+    """Like ``sock.sendall`` but raises :class:`_PartialWrite` once any byte went out."""
+
+    view = memoryview(data)
+    sent = 0
+    try:
+        while sent < len(view):
+            sent += sock.send(view[sent:])
+    except OSError as exc:
+        if sent:
+            raise _PartialWrite(f"{exc} after {sent} of {len(view)} bytes") from exc
+        raise
+
+
+class _PooledConnection:
+    """One long-lived socket of a persistent OmniLinkTCPAdapter, with reconnect backoff."""
+
+    def __init__(self) -> None:
+        self.sock: Optional[socket.socket] = None
+        self.retry_at = 0.0
+        self.delay = 0.0
+        # Template ids whose definitions were sent on ``sock`` (binary framing).
+        self.templates: Set[int] = set()
+
+    def close(self) -> None:
+        if self.sock is not None:
+            try:
+                self.sock.close()
+            except OSError:
+                pass
+            self.sock = None
+        self.templates = set()
+
+    def stale(self) -> bool:
+        """True if the peer closed the connection (readable with nothing to read)."""
+        if self.sock is None:
+            return True
+        try:
+            readable, _, _ = select.select([self.sock], [], [], 0)
+            return bool(readable) and self.sock.recv(1, socket.MSG_PEEK) == b""
+        except (OSError, ValueError):
+            return True
+
+
 class OmniLinkTCPAdapter:
     """Small helper that forwards commands to a TCP endpoint.
 
+    By default every send opens a new connection. In persistent mode the adapter
+    keeps up to ``pool_size`` connections open (TCP_NODELAY set) and frames
+    payloads with the delimiter, so the receiver must keep reading messages
+    until EOF. A send on a connection the peer has dropped is retried once on
+    a new one, but only if none of it was written, so no message is delivered
+    twice. A broken connection is reopened on the next send; after a failed
+    connect, sends on that connection fail fast until a backoff delay (doubling
+    up to TCP_ADAPTER_RECONNECT_MAX) has passed.
+
+    ``send_async``/``send_command_async`` queue a payload and return a
+    :class:`concurrent.futures.Future` at once. A sender thread writes the queue
+    in batches, one ``sendall`` per batch, flushing when TCP_ADAPTER_BATCH_MAX
+    messages or TCP_ADAPTER_BATCH_BYTES bytes are waiting or
+    TCP_ADAPTER_FLUSH_INTERVAL seconds after the first one arrived. Every
+    future of a batch resolves to ``None`` once it is written, or to a
+    RuntimeError if the write fails or the queue is full. Without persistent
+    mode a batch shares one connection, and receivers that read a single
+    message per connection drop the rest, so batches hold one message unless
+    TCP_ADAPTER_BATCH_MAX says otherwise.
+
+    With ``framing="binary"`` every connection starts with the FRAME_MAGIC
+    handshake and payloads are sent as length-prefixed frames (see "TCP binary
+    framing"); the delimiter is not used. A peer that does not answer the
+    handshake makes the send fail.
+
+    ``send(..., wait_ack=True)`` adds ``"ack": true`` to a dict payload and
+    blocks until the receiver answers with one acknowledgement (a JSON line, or
+    a FRAME_JSON frame in binary mode), which it returns. ``tcp_client.py``
+    answers once the move has been applied to the board.
+
     Environment variables:
       - TCP_ADAPTER_HOST: hostname (default 'localhost').
       - TCP_ADAPTER_PORT: port number (default 8766).
       - TCP_ADAPTER_TIMEOUT: socket timeout in seconds (default 5).
       - TCP_ADAPTER_DELIMITER: line delimiter appended to payloads (default '\\n').
       - TCP_ADAPTER_ENCODING: text encoding (default 'utf-8').
+      - TCP_ADAPTER_FRAMING: 'text' (default) or 'binary'.
+      - TCP_ADAPTER_PERSISTENT: set to 1/true to reuse connections (default off).
+      - TCP_ADAPTER_POOL_SIZE: connections kept in persistent mode (default 1).
+      - TCP_ADAPTER_RECONNECT_MAX: longest reconnect backoff in seconds (default 5).
+      - TCP_ADAPTER_QUEUE_SIZE: payloads waiting for the sender thread (default 1000).
+      - TCP_ADAPTER_BATCH_MAX: messages per batch (default 256 in persistent mode, else 1).
+      - TCP_ADAPTER_BATCH_BYTES: bytes per batch (default 65536).
+      - TCP_ADAPTER_FLUSH_INTERVAL: longest wait before a partial batch is sent (default 0.005).
       - TCP_ADAPTER_LOG: set to 0/false to disable logging."""
 
     def __init__(
@@ -625,6 +1663,10 @@ class OmniLinkTCPAdapter:
         encoding: Optional[str] = None,
         delimiter: Optional[str] = None,
         log: Optional[bool] = None,
+        persistent: Optional[bool] = None,
+        pool_size: Optional[int] = None,
+        reconnect_max: Optional[float] = None,
+        framing: Optional[str] = None,
     ) -> None:
         env_host = os.environ.get("TCP_ADAPTER_HOST")
         env_port = os.environ.get("TCP_ADAPTER_PORT")
@@ -668,7 +1710,37 @@ class OmniLinkTCPAdapter:
         else:
             self.log = log
 
-    def _prepare_bytes(self, payload: Union[str, bytes, Dict[str, Any]]) -> Tuple[bytes, str]:
+        self.framing = (framing or os.environ.get("TCP_ADAPTER_FRAMING") or "text").lower()
+        if self.framing not in ("text", "binary"):
+            raise ValueError(f"Unknown TCP framing: {self.framing}")
+        self._encoder = BinaryFrameEncoder() if self.framing == "binary" else None
+
+        self.persistent = _env_flag("TCP_ADAPTER_PERSISTENT", False) if persistent is None else persistent
+        if self.persistent and self._encoder is None and not self._delimiter_bytes:
+            raise ValueError("Persistent TCP mode needs a delimiter to separate messages")
+        self.pool_size = max(1, int(pool_size if pool_size is not None else os.environ.get("TCP_ADAPTER_POOL_SIZE", "1")))
+        self.reconnect_max = float(
+            reconnect_max if reconnect_max is not None else os.environ.get("TCP_ADAPTER_RECONNECT_MAX", "5")
+        )
+        self.metrics = Counter()
+        self._pool: "queue.LifoQueue[_PooledConnection]" = queue.LifoQueue()
+        for _ in range(self.pool_size if self.persistent else 0):
+            self._pool.put(_PooledConnection())
+
+        self.batch_max = max(1, int(os.environ.get("TCP_ADAPTER_BATCH_MAX", "256" if self.persistent else "1")))
+        self.batch_bytes = max(1, int(os.environ.get("TCP_ADAPTER_BATCH_BYTES", "65536")))
+        self.flush_interval = float(os.environ.get("TCP_ADAPTER_FLUSH_INTERVAL", "0.005"))
+        self._outbox: "queue.Queue[Optional[Tuple[bytes, str, Future, Tuple[int, ...]]]]" = queue.Queue(
+            maxsize=max(1, int(os.environ.get("TCP_ADAPTER_QUEUE_SIZE", "1000")))
+        )
+        self._sender: Optional[threading.Thread] = None
+        self._sender_lock = threading.Lock()
+
+    def _prepare_bytes(
+        self, payload: Union[str, bytes, Dict[str, Any]]
+    ) -> Tuple[bytes, str, Tuple[int, ...]]:
+        """Return (data, printable, template ids the data refers to)."""
+
         if isinstance(payload, bytes):
             data = payload
             printable = f"<{len(data)} bytes>"
@@ -677,23 +1749,251 @@ class OmniLinkTCPAdapter:
                 printable = payload
             else:
                 printable = json.dumps(payload)
+            if self._encoder is not None:
+                frame, tids = self._encoder.encode(payload)
+                return frame, printable, tids
             data = printable.encode(self.encoding)
 
-        if self._delimiter_bytes and not data.endswith(self._delimiter_bytes):
+        if self._encoder is None and self._delimiter_bytes and not data.endswith(self._delimiter_bytes):
             data += self._delimiter_bytes
 
-        return data, printable
+        return data, printable, ()
 
-    def send(self, payload: Union[str, bytes, Dict[str, Any]]) -> None:
-        data, printable = self._prepare_bytes(payload)
+    def _open(self) -> socket.socket:
+        """Connect, and in binary mode complete the handshake."""
+
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            if self._encoder is not None:
+                sock.sendall(bytes((FRAME_MAGIC,)))
+                if sock.recv(1) != bytes((FRAME_MAGIC,)):
+                    raise OSError("peer did not accept binary framing")
+        except (OSError, socket.timeout):
+            sock.close()
+            raise
+        return sock
+
+    def _connect(self, conn: _PooledConnection) -> socket.socket:
+        now = time.monotonic()
+        if now < conn.retry_at:
+            raise OSError(f"reconnecting in {conn.retry_at - now:.1f}s")
         try:
-            with socket.create_connection((self.host, self.port), timeout=self.timeout) as sock:
-                sock.sendall(data)
+            sock = self._open()
+        except OSError:
+            conn.delay = min(max(conn.delay * 2, 0.1), self.reconnect_max)
+            conn.retry_at = now + conn.delay
+            self.metrics["connect.failed"] += 1
+            raise
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        conn.sock, conn.delay, conn.retry_at = sock, 0.0, 0.0
+        self.metrics["connect"] += 1
+        return sock
+
+    def _read_ack(self, sock: socket.socket) -> Dict[str, Any]:
+        """Read one acknowledgement from ``sock``; only one is ever outstanding."""
+
+        data = bytearray()
+        if self._encoder is not None:
+            while len(data) < FRAME_HEADER.size or len(data) < FRAME_HEADER.size + FRAME_HEADER.unpack_from(data)[0]:
+                chunk = sock.recv(4096)
+                if not chunk:
+                    raise OSError("connection closed before the acknowledgement")
+                data += chunk
+            length, kind = FRAME_HEADER.unpack_from(data)
+            if kind != FRAME_JSON:
+                raise OSError(f"unexpected acknowledgement frame kind {kind}")
+            body = bytes(data[FRAME_HEADER.size:FRAME_HEADER.size + length])
+        else:
+            assert self._delimiter_bytes
+            while not data.endswith(self._delimiter_bytes):
+                chunk = sock.recv(4096)
+                if not chunk:
+                    raise OSError("connection closed before the acknowledgement")
+                data += chunk
+            body = bytes(data[:-len(self._delimiter_bytes)])
+        try:
+            ack = json.loads(body.decode(self.encoding if self._encoder is None else "utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+            raise OSError(f"malformed acknowledgement: {exc}") from exc
+        if not isinstance(ack, dict):
+            raise OSError("malformed acknowledgement")
+        return ack
+
+    def _send_with_templates(
+        self, sock: socket.socket, seen: Set[int], data: bytes, tids: Iterable[int]
+    ) -> None:
+        """Send ``data``, preceded by the definitions of ``tids`` not yet in ``seen``."""
+
+        missing = [tid for tid in dict.fromkeys(tids) if tid not in seen]
+        if missing and self._encoder is not None:
+            _sendall(sock, self._encoder.definitions(missing) + data)
+            seen.update(missing)
+        else:
+            _sendall(sock, data)
+
+    def _send_persistent(
+        self, data: bytes, tids: Tuple[int, ...] = (), wait_ack: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        try:
+            conn = self._pool.get(timeout=self.timeout)
+        except queue.Empty:
+            raise OSError("no free connection in the pool") from None
+        try:
+            if conn.sock is not None and conn.stale():
+                conn.close()
+            reused = conn.sock is not None
+            sock = conn.sock or self._connect(conn)
+            try:
+                self._send_with_templates(sock, conn.templates, data, tids)
+            except _PartialWrite:
+                # The peer may already have part of it; resending could apply
+                # those messages twice.
+                raise
+            except OSError:
+                conn.close()
+                if not reused:
+                    raise
+                # Nothing was written and the peer dropped an idle connection;
+                # retry once on a fresh one.
+                sock = self._connect(conn)
+                self._send_with_templates(sock, conn.templates, data, tids)
+            return self._read_ack(sock) if wait_ack else None
+        except OSError:
+            conn.close()
+            raise
+        finally:
+            self._pool.put(conn)
+
+    def _write(
+        self, data: bytes, tids: Tuple[int, ...] = (), wait_ack: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        if self.persistent:
+            return self._send_persistent(data, tids, wait_ack)
+        with self._open() as sock:
+            self._send_with_templates(sock, set(), data, tids)
+            return self._read_ack(sock) if wait_ack else None
+
+    def send(
+        self, payload: Union[str, bytes, Dict[str, Any]], *, wait_ack: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        if wait_ack:
+            if not isinstance(payload, dict):
+                raise ValueError("wait_ack needs a dict payload")
+            if self._encoder is None and not self._delimiter_bytes:
+                raise ValueError("wait_ack needs a delimiter or binary framing")
+            payload = {**payload, "ack": True}
+        data, printable, tids = self._prepare_bytes(payload)
+        try:
+            ack = self._write(data, tids, wait_ack)
         except OSError as exc:
+            self.metrics["send.failed"] += 1
             raise RuntimeError(f"TCP send failed: {exc}") from exc
+        self.metrics["sent"] += 1
 
         if self.log:
             print(f"[OmniLinkTCP] Tx -> {self.host}:{self.port}: {printable}")
+            if ack is not None:
+                print(f"[OmniLinkTCP] Ack <- {self.host}:{self.port}: {json.dumps(ack)}")
+        return ack
+
+    # ----- Queued sending
+    def send_async(
+        self,
+        payload: Union[str, bytes, Dict[str, Any]],
+        *,
+        callback: Optional[Callable[["Future[None]"], None]] = None,
+    ) -> "Future[None]":
+        """Queue ``payload`` for the sender thread; the future resolves once it is written."""
+
+        future: "Future[None]" = Future()
+        if callback is not None:
+            future.add_done_callback(callback)
+        data, printable, tids = self._prepare_bytes(payload)
+        self._ensure_sender()
+        try:
+            self._outbox.put_nowait((data, printable, future, tids))
+        except queue.Full:
+            self.metrics["queue.rejected"] += 1
+            future.set_exception(RuntimeError("TCP send queue full"))
+        return future
+
+    @property
+    def queue_depth(self) -> int:
+        return self._outbox.qsize()
+
+    def _ensure_sender(self) -> None:
+        with self._sender_lock:
+            if self._sender is None or not self._sender.is_alive():
+                self._sender = threading.Thread(target=self._sender_loop, name="omnilink-tcp-sender", daemon=True)
+                self._sender.start()
+
+    def _next_batch(
+        self, first: Tuple[bytes, str, Future, Tuple[int, ...]]
+    ) -> Tuple[List[Tuple[bytes, str, Future, Tuple[int, ...]]], bool]:
+        """Collect queued items after ``first`` up to the batch limits; also report a stop marker."""
+
+        batch = [first]
+        size = len(first[0])
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_max and size < self.batch_bytes:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._outbox.get(timeout=remaining) if remaining > 0 else self._outbox.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+            size += len(item[0])
+        return batch, False
+
+    def _sender_loop(self) -> None:
+        while True:
+            first = self._outbox.get()
+            if first is None:
+                return
+            batch, stop = self._next_batch(first)
+            try:
+                self._write(
+                    b"".join(item[0] for item in batch), tuple(tid for item in batch for tid in item[3])
+                )
+            except OSError as exc:
+                self.metrics["send.failed"] += len(batch)
+                error = RuntimeError(f"TCP send failed: {exc}")
+                for _data, _printable, future, _tids in batch:
+                    future.set_exception(error)
+                if self.log:
+                    print(f"[OmniLinkTCP] batch of {len(batch)} failed: {exc}")
+            else:
+                self.metrics["sent"] += len(batch)
+                self.metrics["batches"] += 1
+                for _data, _printable, future, _tids in batch:
+                    future.set_result(None)
+                if self.log:
+                    for _data, printable, _future, _tids in batch:
+                        print(f"[OmniLinkTCP] Tx -> {self.host}:{self.port}: {printable}")
+            if stop:
+                return
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Send what is queued, stop the sender thread and close persistent connections."""
+
+        sender = self._sender
+        if sender is not None and sender.is_alive():
+            self._outbox.put(None)
+            sender.join(timeout if timeout is not None else self.timeout)
+        self._sender = None
+
+        drained: List[_PooledConnection] = []
+        while True:
+            try:
+                drained.append(self._pool.get_nowait())
+            except queue.Empty:
+                break
+        for conn in drained:
+            conn.close()
+            self._pool.put(conn)
 
     def send_command(
         self,
@@ -703,7 +2003,33 @@ class OmniLinkTCPAdapter:
         template: Optional[str] = None,
         meta: Optional[Dict[str, Any]] = None,
         extra: Optional[Dict[str, Any]] = None,
-    ) -> None:
+        wait_ack: bool = False,
+    ) -> Optional[Dict[str, Any]]:
+        payload = self._command_payload(command, vars=vars, template=template, meta=meta, extra=extra)
+        return self.send(payload, wait_ack=wait_ack)
+
+    def send_command_async(
+        self,
+        command: str,
+        *,
+        vars: Optional[Dict[str, Any]] = None,
+        template: Optional[str] = None,
+        meta: Optional[Dict[str, Any]] = None,
+        extra: Optional[Dict[str, Any]] = None,
+        callback: Optional[Callable[["Future[None]"], None]] = None,
+    ) -> "Future[None]":
+        payload = self._command_payload(command, vars=vars, template=template, meta=meta, extra=extra)
+        return self.send_async(payload, callback=callback)
+
+    @staticmethod
+    def _command_payload(
+        command: str,
+        *,
+        vars: Optional[Dict[str, Any]],
+        template: Optional[str],
+        meta: Optional[Dict[str, Any]],
+        extra: Optional[Dict[str, Any]],
+    ) -> Dict[str, Any]:
         payload: Dict[str, Any] = {"command": command}
         if template:
             payload["template"] = template
@@ -713,7 +2039,7 @@ class OmniLinkTCPAdapter:
             payload["meta"] = meta
         if extra:
             payload.update(extra)
-        self.send(payload)
+        return payload
 
 # =========================================================
 # MQTT bridge + context publishing
@@ -732,6 +2058,18 @@ class OmniLinkTCPAdapter:
 #   MQTT_QOS_PUB           default: 0
 #   MQTT_KEEPALIVE         default: 60
 #   MQTT_CLIENT_ID         optional client id
+#   MQTT_WORKERS           default: 1 (handler threads; 0 = run handlers on paho's network thread)
+#   MQTT_QUEUE_SIZE        default: 100 (pending commands per worker)
+#   MQTT_QUEUE_POLICY      default: "reject" (alternatives: "drop_oldest", "block")
+#   MQTT_CONTEXT_COALESCE  default: 0.25 (seconds; 0 publishes every context immediately)
+#   MQTT_CONTEXT_MODE      default: "full" (alternative: "delta", see give_state)
+#   MQTT_CONTEXT_SNAPSHOT_EVERY   default: 20 (delta mode: full snapshot every N messages)
+#   MQTT_CONTEXT_REQUEST_TOPIC    default: "<context topic>/snapshot" (delta mode: any
+#                                 message here triggers a snapshot)
+#   MQTT_SHARE_GROUP       optional: subscribe via "$share/<group>/..." shared subscriptions
+#   MQTT_SHARD_COUNT       default: 1 (>1 splits games across bridges by game id)
+#   MQTT_SHARD_INDEX       default: 0 (this bridge's shard, 0..MQTT_SHARD_COUNT-1)
+#   OMNILINK_DEDUP_*       duplicate suppression, see IdempotencyCache
 #
 # Command payloads accepted:
 #   - Raw string: "move_white_knight_from_C2_to_C3"
@@ -739,21 +2077,69 @@ class OmniLinkTCPAdapter:
 #       {
 #         "command": "move_white_knight_from_C2_to_C3",
 #         "meta": {...},
-#         "reply_to": "custom/topic"   # optional override for feedback
+#         "reply_to": "custom/topic",  # optional override for feedback
+#         "id": "client-msg-42"        # optional; repeats within OMNILINK_DEDUP_TTL on the
+#       }                              #   same topic, reply_to and game get the cached
+#                                      #   feedback, not a second move
+#   - JSON batch (run in order; context is published once at the end):
+#       {
+#         "commands": ["move_white_pawn_from_e2_to_e4", "move_black_pawn_from_e7_to_e5"],
+#         "stop_on_error": true,       # optional, default false
+#         "meta": {...}, "reply_to": "custom/topic"
 #       }
 #
 # Feedback publishing:
 #   - Uses payload.reply_to OR meta.reply_to OR MQTT_FEEDBACK_TOPIC.
 #   - Payload is ONLY: {"feedback": true|false}
+#   - Batches get one message: {"feedback": <all ok>, "results": [{"command": ...,
+#     "feedback": bool}, ...]}; commands skipped by stop_on_error are marked
+#     "skipped": true.
+#
+# Worker queue:
+#   - _on_message only decodes and enqueues; worker threads run the engine and
+#     publish feedback. Commands sharing a reply topic always go to the same
+#     worker, so their feedback keeps arrival order.
+#   - When a worker queue is full: "reject" answers {"feedback": false} for the
+#     new command, "drop_oldest" does so for the oldest queued command, and
+#     "block" stalls the network thread until there is room.
 #
 # Context publishing:
 #   - Only when give_context("<string>") is called.
+#   - Calls within MQTT_CONTEXT_COALESCE seconds collapse into one publish of the
+#     latest string, and a string identical to the last one published is skipped
+#     unless give_context(..., force=True). See bridge.metrics["context.*"].
+#   - Delta mode (MQTT_CONTEXT_MODE=delta): give_state(state) publishes versioned
+#     board changes instead of the whole description:
+#       {"type": "delta", "seq": 8, "base": 7, "added": [piece...],
+#        "removed": ["<piece id>"...], "moved": [{"id", "from", "to"}...],
+#        "changed": [{"id", "piece"}...], "turn": "black"}
+#     "turn" is only present when it changed. Every N messages, after a
+#     reconnect, or on a request to MQTT_CONTEXT_REQUEST_TOPIC a snapshot is sent:
+#       {"type": "snapshot", "seq": 9, "turn": "white", "pieces": [piece...]}
+#     Pieces use the server's {"id", "color", "piece", "square"} shape. A
+#     consumer that sees a gap in "seq" should request a snapshot.
+#
+# Multiple bridges (see link_mqtt_pool.py):
+#   - Commands may be addressed to a game: topic "<command topic>/<game id>" or a
+#     "game_id" field in the JSON payload. The game id is added to meta and the
+#     default feedback topic becomes "<feedback topic>/<game id>".
+#   - Shard mode (MQTT_SHARD_COUNT > 1): every bridge subscribes to all games and
+#     handles only those with crc32(game id) % count == index, so a game always
+#     reaches the same bridge (commands without a game id go to shard 0).
+#     The bridge drives one board, so every game hashed to it shares that board.
+#   - Pinned games (game_ids=[...]): the bridge handles exactly these games and
+#     ignores the hash; link_mqtt_pool.py --games gives each worker one game.
+#   - Shared mode (MQTT_SHARE_GROUP): the broker spreads messages across the
+#     group; there is no game affinity, so use it for stateless handlers.
 
 try:
     import paho.mqtt.client as _mqtt  # type: ignore
 except Exception:
     _mqtt = None  # optional until used
 
+# (command or batch of commands, meta, reply_to, (dedup key, check)) queued for a worker
+_MQTTJob = Tuple[Union[str, List[str]], Dict[str, Any], Optional[str], Optional[Tuple[str, bool]]]
+
 # Global bridge singleton so give_context() can publish
 _BRIDGE_SINGLETON: Optional["OmniLinkMQTTBridge"] = None
 
@@ -773,6 +2159,17 @@ class OmniLinkMQTTBridge:
         client_id: Optional[str] = None,
         qos_sub: Optional[int] = None,
         qos_pub: Optional[int] = None,
+        workers: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        queue_policy: Optional[str] = None,
+        context_coalesce: Optional[float] = None,
+        context_mode: Optional[str] = None,
+        context_topic: Optional[str] = None,
+        share_group: Optional[str] = None,
+        shard_index: Optional[int] = None,
+        shard_count: Optional[int] = None,
+        game_ids: Optional[Iterable[str]] = None,
+        dedup: Optional[IdempotencyCache] = None,
         log: bool = True,
     ) -> None:
         if _mqtt is None:
@@ -799,13 +2196,56 @@ class OmniLinkMQTTBridge:
         )
 
         # Context topic
-        self.context_topic = os.environ.get("MQTT_CONTEXT_TOPIC", "olink/context")
+        self.context_topic = context_topic or os.environ.get("MQTT_CONTEXT_TOPIC", "olink/context")
+
+        # Multi-bridge routing
+        self.share_group = share_group or os.environ.get("MQTT_SHARE_GROUP") or None
+        self.shard_count = int(shard_count if shard_count is not None else int(os.environ.get("MQTT_SHARD_COUNT", "1")))
+        self.shard_index = int(shard_index if shard_index is not None else int(os.environ.get("MQTT_SHARD_INDEX", "0")))
+        if not 0 <= self.shard_index < max(1, self.shard_count):
+            raise ValueError(f"MQTT shard index {self.shard_index} out of range for {self.shard_count} shards")
+        self.game_ids = frozenset(game_ids) if game_ids else None
+        self._routed = bool(self.share_group) or self.shard_count > 1 or self.game_ids is not None
 
         self.username = username or os.environ.get("MQTT_USERNAME")
         self.password = password or os.environ.get("MQTT_PASSWORD")
         self.keepalive = int(keepalive if keepalive is not None else int(os.environ.get("MQTT_KEEPALIVE", "60")))
         self.qos_sub = int(qos_sub if qos_sub is not None else int(os.environ.get("MQTT_QOS_SUB", "0")))
         self.qos_pub = int(qos_pub if qos_pub is not None else int(os.environ.get("MQTT_QOS_PUB", "0")))
+        self.workers = int(workers if workers is not None else int(os.environ.get("MQTT_WORKERS", "1")))
+        self.queue_size = int(queue_size if queue_size is not None else int(os.environ.get("MQTT_QUEUE_SIZE", "100")))
+        self.queue_policy = (queue_policy or os.environ.get("MQTT_QUEUE_POLICY") or "reject").lower()
+        if self.queue_policy not in ("reject", "drop_oldest", "block"):
+            raise ValueError(f"Unknown MQTT queue policy: {self.queue_policy}")
+        self.metrics = Counter()
+        self.dedup = dedup or IdempotencyCache()
+        self._queues: List["queue.Queue[Optional[_MQTTJob]]"] = []
+        self._worker_threads: List[threading.Thread] = []
+
+        self.context_coalesce = float(
+            context_coalesce if context_coalesce is not None else os.environ.get("MQTT_CONTEXT_COALESCE", "0.25")
+        )
+        self._context_lock = threading.Lock()
+        self._context_pending: Optional[str] = None
+        self._context_force = False
+        self._context_timer: Optional[threading.Timer] = None
+        self._context_digest: Optional[bytes] = None
+        # Per-thread batch hold, so a batch on one worker does not delay the
+        # context of commands running on other workers.
+        self._context_local = threading.local()
+
+        self.context_mode = (context_mode or os.environ.get("MQTT_CONTEXT_MODE") or "full").lower()
+        if self.context_mode not in ("full", "delta"):
+            raise ValueError(f"Unknown MQTT context mode: {self.context_mode}")
+        self.snapshot_every = int(os.environ.get("MQTT_CONTEXT_SNAPSHOT_EVERY", "20"))
+        self.snapshot_request_topic = os.environ.get("MQTT_CONTEXT_REQUEST_TOPIC") or f"{self.context_topic}/snapshot"
+        self._state_seq = 0
+        self._state_pieces: Optional[Dict[str, Dict[str, Any]]] = None
+        self._state_turn: Optional[str] = None
+        self._since_snapshot = 0
+        self._snapshot_due = True
+        self._state_pending: Optional[Tuple[Dict[str, Any], bool]] = None
+
         self.client = _mqtt.Client(transport=self.transport, client_id=(client_id or os.environ.get("MQTT_CLIENT_ID")))
         if self.username:
             self.client.username_pw_set(self.username, self.password)
@@ -819,28 +2259,182 @@ class OmniLinkMQTTBridge:
         _BRIDGE_SINGLETON = self
 
     # ----- Context publishing helper (used by give_context)
-    def publish_context(self, context_str: str) -> None:
-        """Publish the provided context string to the context topic."""
-        try:
-            payload = json.dumps({"context": str(context_str)})
-            self.client.publish(self.context_topic, payload, qos=self.qos_pub)
-            if self.log:
-                print(f"[OmniLinkMQTT] Context -> {self.context_topic}: {payload}")
-        except Exception as e:
-            print(f"[OmniLinkMQTT] Context publish error: {e}")
+    def publish_context(self, context_str: str, *, force: bool = False) -> None:
+        """Publish the provided context string to the context topic.
+
+        Calls arriving within ``context_coalesce`` seconds are merged into one
+        publish of the latest string; unchanged strings are skipped unless
+        ``force`` is set.
+        """
+        with self._context_lock:
+            if self._context_pending is not None:
+                self.metrics["context.suppressed"] += 1
+            self._context_pending = str(context_str)
+            self._context_force = self._context_force or force
+            if self._context_held():
+                return
+            if self.context_coalesce > 0:
+                if self._context_timer is None:
+                    timer = threading.Timer(self.context_coalesce, self.flush_context)
+                    timer.daemon = True
+                    self._context_timer = timer
+                    timer.start()
+                return
+        self.flush_context()
+
+    def flush_context(self) -> None:
+        """Publish any pending context now instead of waiting for the coalesce window."""
+        with self._context_lock:
+            if self._context_timer is not None:
+                self._context_timer.cancel()
+                self._context_timer = None
+            context_str, force = self._context_pending, self._context_force
+            self._context_pending, self._context_force = None, False
+            if context_str is None:
+                return
+
+            digest = hashlib.sha1(context_str.encode("utf-8")).digest()
+            if not force and digest == self._context_digest:
+                self.metrics["context.suppressed"] += 1
+                return
+            try:
+                payload = json.dumps({"context": context_str})
+                self.client.publish(self.context_topic, payload, qos=self.qos_pub)
+            except Exception as e:
+                print(f"[OmniLinkMQTT] Context publish error: {e}")
+                return
+            self._context_digest = digest
+            self.metrics["context.published"] += 1
+        if self.log:
+            print(f"[OmniLinkMQTT] Context -> {self.context_topic}: {payload}")
+
+    # ----- Delta context (MQTT_CONTEXT_MODE=delta)
+    def publish_state(self, state: Dict[str, Any], *, snapshot: bool = False) -> None:
+        """Publish the change from the previous ``state`` (or a snapshot) to the context topic.
+
+        ``state`` is the server's ``/context`` state: ``{"turn": ..., "pieces": [...]}``.
+        """
+        with self._context_lock:
+            if self._state_pending is not None:
+                # A held batch's state is superseded by this newer one.
+                self.metrics["context.suppressed"] += 1
+                snapshot = snapshot or self._state_pending[1]
+                self._state_pending = None
+            if self._context_held():
+                self._state_pending = (state, snapshot)
+                return
+        raw_pieces = state.get("pieces") if isinstance(state, dict) else None
+        if not isinstance(raw_pieces, list):
+            return
+        pieces: Dict[str, Dict[str, Any]] = {}
+        for p in raw_pieces:
+            if isinstance(p, dict) and p.get("square"):
+                entry = {k: p.get(k) for k in ("id", "color", "piece", "square")}
+                entry["piece"] = entry["piece"] or p.get("type")
+                entry["id"] = str(entry["id"] or p["square"])
+                pieces[entry["id"]] = entry
+        turn = state.get("turn")
+
+        with self._context_lock:
+            previous = self._state_pieces
+            snapshot = (
+                snapshot
+                or self._snapshot_due
+                or previous is None
+                or (self.snapshot_every > 0 and self._since_snapshot >= self.snapshot_every)
+            )
+            if snapshot:
+                message: Dict[str, Any] = {"type": "snapshot", "turn": turn, "pieces": list(pieces.values())}
+            else:
+                assert previous is not None
+                added = [p for pid, p in pieces.items() if pid not in previous]
+                removed = [pid for pid in previous if pid not in pieces]
+                moved = [
+                    {"id": pid, "from": previous[pid]["square"], "to": p["square"]}
+                    for pid, p in pieces.items()
+                    if pid in previous and previous[pid]["square"] != p["square"]
+                ]
+                changed = [
+                    {"id": pid, "piece": p["piece"]}
+                    for pid, p in pieces.items()
+                    if pid in previous and previous[pid]["piece"] != p["piece"]
+                ]
+                if not (added or removed or moved or changed) and turn == self._state_turn:
+                    self.metrics["context.suppressed"] += 1
+                    return
+                message = {"type": "delta", "base": self._state_seq}
+                for key, value in (("added", added), ("removed", removed), ("moved", moved), ("changed", changed)):
+                    if value:
+                        message[key] = value
+                if turn != self._state_turn:
+                    message["turn"] = turn
+
+            self._state_seq += 1
+            message["seq"] = self._state_seq
+            try:
+                payload = json.dumps(message)
+                self.client.publish(self.context_topic, payload, qos=self.qos_pub)
+            except Exception as e:
+                print(f"[OmniLinkMQTT] State publish error: {e}")
+                self._snapshot_due = True
+                return
+            self._state_pieces, self._state_turn = pieces, turn
+            self._since_snapshot = 0 if snapshot else self._since_snapshot + 1
+            self._snapshot_due = False
+            self.metrics["context.published"] += 1
+            self.metrics[f"context.{message['type']}"] += 1
+        if self.log:
+            print(f"[OmniLinkMQTT] {message['type'].capitalize()} -> {self.context_topic}: seq={message['seq']}")
+
+    def _context_held(self) -> bool:
+        return bool(getattr(self._context_local, "hold", 0))
+
+    def _hold_context(self) -> None:
+        """Defer context publishes made on this thread until the matching ``_release_context``."""
+        self._context_local.hold = getattr(self._context_local, "hold", 0) + 1
+
+    def _release_context(self) -> None:
+        self._context_local.hold -= 1
+        if self._context_local.hold:
+            return
+        with self._context_lock:
+            pending_state, self._state_pending = self._state_pending, None
+            pending_context = self._context_pending is not None
+        if pending_state is not None:
+            self.publish_state(pending_state[0], snapshot=pending_state[1])
+        if pending_context:
+            self.flush_context()
+
+    def request_snapshot(self) -> None:
+        """Publish the last known state as a snapshot right away."""
+        with self._context_lock:
+            pieces, turn = self._state_pieces, self._state_turn
+            self._snapshot_due = True
+        if pieces is not None:
+            self.publish_state({"turn": turn, "pieces": list(pieces.values())}, snapshot=True)
 
     def _on_connect(self, client: "_mqtt.Client", _ud, _flags, rc: int):
         if rc == 0:
             if self.log:
                 print(f"[OmniLinkMQTT] Connected {self.host}:{self.port} (transport={self.transport})")
-            client.subscribe(self.command_topic, qos=self.qos_sub)
-            if self.log:
-                print(f"[OmniLinkMQTT] Subscribed to {self.command_topic}")
+            for topic in self._command_subscriptions():
+                client.subscribe(topic, qos=self.qos_sub)
+                if self.log:
+                    print(f"[OmniLinkMQTT] Subscribed to {topic}")
+            # Let the next context go out even if it matches the pre-reconnect one.
+            self._context_digest = None
+            if self.context_mode == "delta":
+                client.subscribe(self.snapshot_request_topic, qos=self.qos_sub)
+                self._snapshot_due = True
             # NOTE: No automatic context publishing here.
         else:
             print(f"[OmniLinkMQTT] Connect failed: rc={rc}")
 
     def _on_message(self, client: "_mqtt.Client", _ud, msg: "_mqtt.MQTTMessage"):
+        if self.context_mode == "delta" and msg.topic == self.snapshot_request_topic:
+            threading.Thread(target=self.request_snapshot, daemon=True).start()
+            return
+
         # Accept raw or JSON
         try:
             payload_text = msg.payload.decode("utf-8", "replace")
@@ -852,13 +2446,26 @@ class OmniLinkMQTTBridge:
 
             if isinstance(data, dict):
                 command = data.get("command")
+                if command is None and isinstance(data.get("commands"), list):
+                    command = data["commands"]
                 meta: Dict[str, Any] = data.get("meta") or {}
+                if isinstance(command, list) and data.get("stop_on_error"):
+                    meta = {**meta, "stop_on_error": True}
                 reply_to = data.get("reply_to") or meta.get("reply_to")
             else:
                 command = payload_text
                 meta = {}
                 reply_to = None
 
+            if self._routed:
+                game_id = self._game_id(msg.topic, data)
+                if not self.owns_game(game_id):
+                    self.metrics["shard.skipped"] += 1
+                    return
+                if game_id:
+                    meta = {**meta, "game_id": game_id}
+                    reply_to = reply_to or f"{self.response_topic}/{game_id}"
+
         except Exception as exc:
             print(f"[OmniLinkMQTT] Decode error: {exc}")
             client.publish(self._resolve_reply_to(None), json.dumps({"feedback": False}), qos=self.qos_pub)
@@ -867,33 +2474,204 @@ class OmniLinkMQTTBridge:
         if self.log:
             print(f"[OmniLinkMQTT] Rx {msg.topic}: {command!r}")
 
-        if not isinstance(command, str) or not command.strip():
+        if isinstance(command, list):
+            valid = bool(command) and all(isinstance(c, str) and c.strip() for c in command)
+        else:
+            valid = isinstance(command, str) and bool(command.strip())
+        if not valid:
             client.publish(self._resolve_reply_to(reply_to), json.dumps({"feedback": False}), qos=self.qos_pub)
             return
 
-        # Handle
-        feedback = False
+        explicit_id = data.get("id", data.get("message_id")) if isinstance(data, dict) else None
+        if explicit_id is None:
+            explicit_id = meta.get("message_id")
+        if explicit_id is not None:
+            # Ids are only unique per sender, so scope them to the topic, the
+            # reply topic and the game.
+            game_id = meta.get("game_id")
+            if game_id is None and isinstance(data, dict):
+                game_id = data.get("game_id")
+            dedup = (
+                IdempotencyCache.content_key(
+                    "id", msg.topic, reply_to or "", str(game_id or ""), str(explicit_id)
+                ),
+                self.dedup.should_check(explicit_id=True),
+            )
+        else:
+            redelivery = bool(getattr(msg, "dup", False))
+            dedup = (
+                IdempotencyCache.content_key(msg.topic, msg.payload),
+                self.dedup.should_check(explicit_id=False, redelivery=redelivery),
+            )
+
+        if self.workers <= 0:
+            self._process(command, meta, reply_to, dedup)
+            return
+        self._enqueue((command, meta, reply_to, dedup))
+
+    # ----- Multi-bridge routing
+    def _command_subscriptions(self) -> List[str]:
+        topics = [self.command_topic]
+        if self._routed:
+            topics.append(f"{self.command_topic}/+")
+        if self.share_group:
+            topics = [f"$share/{self.share_group}/{t}" for t in topics]
+        return topics
+
+    def _game_id(self, topic: str, data: Any) -> str:
+        prefix = self.command_topic + "/"
+        if topic.startswith(prefix):
+            return topic[len(prefix):]
+        if isinstance(data, dict) and data.get("game_id") is not None:
+            return str(data["game_id"])
+        return ""
+
+    def owns_game(self, game_id: str) -> bool:
+        """True if this bridge's shard (or pinned game set) handles ``game_id``."""
+        if self.game_ids is not None:
+            return game_id in self.game_ids
+        if self.shard_count <= 1:
+            return True
+        return zlib.crc32(game_id.encode("utf-8")) % self.shard_count == self.shard_index
+
+    # ----- Worker queue
+    @property
+    def queue_depth(self) -> int:
+        """Number of commands waiting for a worker."""
+        return sum(q.qsize() for q in self._queues)
+
+    def _start_workers(self) -> None:
+        if self.workers <= 0 or self._worker_threads:
+            return
+        self._queues = [queue.Queue(maxsize=max(1, self.queue_size)) for _ in range(self.workers)]
+        for idx, q in enumerate(self._queues):
+            t = threading.Thread(target=self._worker_loop, args=(q,), name=f"omnilink-mqtt-worker-{idx}", daemon=True)
+            self._worker_threads.append(t)
+            t.start()
+
+    def _stop_workers(self) -> None:
+        for q in self._queues:
+            q.put(None)
+        for t in self._worker_threads:
+            t.join(timeout=5)
+        self._worker_threads = []
+        self._queues = []
+
+    def _enqueue(self, job: _MQTTJob) -> None:
+        if not self._queues:
+            self._start_workers()
+        # Same reply topic -> same worker, which keeps its feedback in order.
+        q = self._queues[hash(self._resolve_reply_to(job[2])) % len(self._queues)]
+        rejected: Optional[_MQTTJob] = None
+        try:
+            if self.queue_policy == "block":
+                q.put(job)
+            else:
+                q.put_nowait(job)
+        except queue.Full:
+            if self.queue_policy == "drop_oldest":
+                try:
+                    rejected = q.get_nowait()
+                    q.task_done()
+                except queue.Empty:
+                    pass
+                try:
+                    q.put_nowait(job)
+                except queue.Full:
+                    rejected = job
+                self.metrics["queue.dropped"] += 1
+            else:
+                rejected = job
+                self.metrics["queue.rejected"] += 1
+        else:
+            self.metrics["queue.enqueued"] += 1
+
+        depth = self.queue_depth
+        if depth > self.metrics["queue.max_depth"]:
+            self.metrics["queue.max_depth"] = depth
+
+        if rejected is not None:
+            out_topic = self._resolve_reply_to(rejected[2])
+            self.client.publish(out_topic, json.dumps({"feedback": False}), qos=self.qos_pub)
+            if self.log:
+                print(f"[OmniLinkMQTT] Queue full ({self.queue_policy}); rejected {rejected[0]!r}")
+
+    def _worker_loop(self, q: "queue.Queue[Optional[_MQTTJob]]") -> None:
+        while True:
+            job = q.get()
+            try:
+                if job is None:
+                    return
+                self._process(*job)
+            except Exception as exc:
+                print(f"[OmniLinkMQTT] Worker error: {exc}")
+            finally:
+                q.task_done()
+
+    def _run_command(self, command: str, meta: Dict[str, Any]) -> bool:
         try:
             res = self.engine.handle(command, meta=meta)
             # Success criteria: parsing ok AND no handler error dict in result
             result = res.get("result")
             handler_failed = isinstance(result, dict) and bool(result.get("error"))
-            feedback = bool(res.get("ok")) and not handler_failed
+            return bool(res.get("ok")) and not handler_failed
         except Exception as exc:
             print(f"[OmniLinkMQTT] Handler exception: {exc}")
-            feedback = False
+            return False
 
-        # Publish ONLY {"feedback": bool} to feedback topic or reply_to
+    def _run_batch(self, commands: List[str], meta: Dict[str, Any]) -> Dict[str, Any]:
+        stop_on_error = bool(meta.get("stop_on_error"))
+        results: List[Dict[str, Any]] = []
+        failed = False
+        self._hold_context()
+        try:
+            for idx, command in enumerate(commands):
+                if failed and stop_on_error:
+                    results.append({"command": command, "feedback": False, "skipped": True})
+                    continue
+                ok = self._run_command(command, {**meta, "batch_index": idx})
+                failed = failed or not ok
+                results.append({"command": command, "feedback": ok})
+        finally:
+            self._release_context()
+        self.metrics["batch.calls"] += 1
+        self.metrics["batch.commands"] += len(commands)
+        return {"feedback": not failed, "results": results}
+
+    def _process(
+        self,
+        command: Union[str, List[str]],
+        meta: Dict[str, Any],
+        reply_to: Optional[str],
+        dedup: Optional[Tuple[str, bool]] = None,
+    ) -> None:
+        def _handle() -> Dict[str, Any]:
+            if isinstance(command, list):
+                return self._run_batch(command, meta)
+            return {"feedback": self._run_command(command, meta)}
+
+        # Handle (a duplicate gets the first delivery's feedback again)
+        if dedup is None:
+            out = _handle()
+        else:
+            out, duplicate = self.dedup.run(dedup[0], _handle, check=dedup[1])
+            if duplicate:
+                self.metrics["dedup.suppressed"] += 1
+                if self.log:
+                    print(f"[OmniLinkMQTT] Duplicate {command!r} suppressed")
+
+        # Publish {"feedback": bool} (plus "results" for batches) to feedback topic or reply_to
         out_topic = self._resolve_reply_to(reply_to)
-        client.publish(out_topic, json.dumps({"feedback": feedback}), qos=self.qos_pub)
+        self.client.publish(out_topic, json.dumps(out), qos=self.qos_pub)
         if self.log:
-            print(f"[OmniLinkMQTT] Tx -> {out_topic}: {{'feedback': {feedback}}}")
+            print(f"[OmniLinkMQTT] Tx -> {out_topic}: {{'feedback': {out['feedback']}}}")
 
     def _resolve_reply_to(self, reply_to: Optional[str]) -> str:
         return reply_to or self.response_topic
 
     # lifecycle
     def start(self) -> "OmniLinkMQTTBridge":
+        self._start_workers()
         self.client.connect(self.host, self.port, keepalive=self.keepalive)
         self.client.loop_start()
         if self.log:
@@ -901,6 +2679,7 @@ class OmniLinkMQTTBridge:
         return self
 
     def loop_forever(self) -> None:
+        self._start_workers()
         self.client.connect(self.host, self.port, keepalive=self.keepalive)
         if self.log:
             print("[OmniLinkMQTT] Listening… (Ctrl+C to exit)")
@@ -908,20 +2687,40 @@ class OmniLinkMQTTBridge:
             self.client.loop_forever()
         except KeyboardInterrupt:
             pass
+        finally:
+            self._stop_workers()
+
+    def stop(self) -> None:
+        """Disconnect, then let the workers finish their queued commands."""
+        self.flush_context()
+        self.client.loop_stop()
+        self.client.disconnect()
+        self._stop_workers()
 
 # =========================================================
 # Public API: give_context
 # =========================================================
 
-def give_context(context_str: str) -> None:
+def give_context(context_str: str, *, force: bool = False) -> None:
     """
     Publish a context string to MQTT_CONTEXT_TOPIC (default 'olink/context').
     Requires that an OmniLinkMQTTBridge has been instantiated (sets a module singleton).
+    Set `force` to publish even if the string matches the last one sent.
     """
     global _BRIDGE_SINGLETON
     if _BRIDGE_SINGLETON is None:
         raise RuntimeError("OmniLinkMQTTBridge is not initialized; create the bridge before calling give_context().")
-    _BRIDGE_SINGLETON.publish_context(context_str)
+    _BRIDGE_SINGLETON.publish_context(context_str, force=force)
+
+def give_state(state: Dict[str, Any], *, snapshot: bool = False) -> None:
+    """
+    Publish board changes for MQTT_CONTEXT_MODE=delta (see OmniLinkMQTTBridge.publish_state).
+    `state` is the server's state dict, e.g. chess_api.get_state().
+    """
+    global _BRIDGE_SINGLETON
+    if _BRIDGE_SINGLETON is None:
+        raise RuntimeError("OmniLinkMQTTBridge is not initialized; create the bridge before calling give_state().")
+    _BRIDGE_SINGLETON.publish_state(state, snapshot=snapshot)
 
 # =========================================================
 # Periodic context publishing (integrated)
@@ -0,0 +1,589 @@
+#!/usr/bin/env python3
+"""Replay recorded games as Omni Link commands and report bridge throughput.
+
+Moves are read from PGN files (SAN or long algebraic notation, e.g. the output
+of ``game_log.py``) or from JSONL dumps of ``OmniLinkEngine.history`` and turned
+into ``move_[color]_[piece]_from_[location1]_to_[location2]`` commands.  They are
+then pushed through one of three targets:
+
+``inprocess``
+    A local :class:`~omnilink.OmniLinkEngine` wired like ``link_mqtt.py``.  With
+    ``--dry-run`` the handler acknowledges without calling the chess server.
+``mqtt``
+    Published to the bridge's command topic; latency is measured until the
+    matching ``{"feedback": ...}`` message arrives on a private reply topic.
+``tcp``
+    Sent through :class:`~omnilink.OmniLinkTCPAdapter` to ``tcp_client.py``.
+
+Examples::
+
+    python chess_link/replay.py games.pgn --target inprocess --dry-run
+    python chess_link/replay.py history.jsonl --target mqtt --rate 50
+    python chess_link/replay.py games.pgn --target tcp --repeat 10 --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+HERE = Path(__file__).resolve().parent
+PATTERNS_FILE = HERE / "chess_commands_omnilink.txt"
+
+FILES = "abcdefgh"
+_PIECE_NAMES = {"": "pawn", "K": "king", "Q": "queen", "R": "rook", "B": "bishop", "N": "knight"}
+_KNIGHT_STEPS = ((1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1), (-2, 1), (-1, 2))
+_KING_STEPS = ((1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1))
+_ROOK_DIRS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+_BISHOP_DIRS = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+
+_LAN_RE = re.compile(r"^([KQRBN]?)([a-h][1-8])[-x:]?([a-h][1-8])(?:=?([QRBN]))?$")
+_SAN_RE = re.compile(r"^([KQRBN]?)([a-h]?)([1-8]?)x?([a-h][1-8])(?:=?([QRBN]))?$")
+_RESULTS = {"1-0", "0-1", "1/2-1/2", "*"}
+
+Square = Tuple[int, int]
+Move = Tuple[str, str, str, str]
+
+
+# ---------------------------------------------------------------------------
+# Move sources
+# ---------------------------------------------------------------------------
+
+
+def _sq(name: str) -> Square:
+    return FILES.index(name[0]), int(name[1]) - 1
+
+
+def _name(square: Square) -> str:
+    return f"{FILES[square[0]]}{square[1] + 1}"
+
+
+def move_command(color: str, piece: str, from_square: str, to_square: str) -> str:
+    return f"move_{color}_{piece}_from_{from_square}_to_{to_square}"
+
+
+class _Board:
+    """Just enough board state to resolve SAN to from/to squares."""
+
+    def __init__(self) -> None:
+        self.squares: Dict[Square, Tuple[str, str]] = {}
+        back = ("rook", "knight", "bishop", "queen", "king", "bishop", "knight", "rook")
+        for f, piece in enumerate(back):
+            self.squares[(f, 0)] = ("white", piece)
+            self.squares[(f, 1)] = ("white", "pawn")
+            self.squares[(f, 6)] = ("black", "pawn")
+            self.squares[(f, 7)] = ("black", piece)
+        self.turn = "white"
+        self.ep: Optional[Square] = None
+        # Rook half of a LAN castle (``Ke1-g1``) that the next token may repeat.
+        self._castle_rook: Optional[Tuple[Square, Square]] = None
+
+    def _reaches(self, src: Square, dst: Square, piece: str) -> bool:
+        df, dr = dst[0] - src[0], dst[1] - src[1]
+        if piece == "knight":
+            return (df, dr) in _KNIGHT_STEPS
+        if piece == "king":
+            return (df, dr) in _KING_STEPS
+        dirs = {"rook": _ROOK_DIRS, "bishop": _BISHOP_DIRS, "queen": _ROOK_DIRS + _BISHOP_DIRS}[piece]
+        for sf, sr in dirs:
+            f, r = src[0] + sf, src[1] + sr
+            while 0 <= f < 8 and 0 <= r < 8:
+                if (f, r) == dst:
+                    return True
+                if (f, r) in self.squares:
+                    break
+                f, r = f + sf, r + sr
+        return False
+
+    def _attacked(self, square: Square, by: str) -> bool:
+        forward = 1 if by == "white" else -1
+        for src, (color, piece) in self.squares.items():
+            if color != by:
+                continue
+            if piece == "pawn":
+                if square[1] - src[1] == forward and abs(square[0] - src[0]) == 1:
+                    return True
+            elif self._reaches(src, square, piece):
+                return True
+        return False
+
+    def _leaves_king_safe(self, src: Square, dst: Square) -> bool:
+        saved = dict(self.squares)
+        self.squares[dst] = self.squares.pop(src)
+        try:
+            king = next((sq for sq, pc in self.squares.items() if pc == (self.turn, "king")), None)
+            enemy = "black" if self.turn == "white" else "white"
+            return king is None or not self._attacked(king, enemy)
+        finally:
+            self.squares = saved
+
+    def _pawn_sources(self, dst: Square, from_file: Optional[int]) -> List[Square]:
+        forward = 1 if self.turn == "white" else -1
+        if from_file is not None and from_file != dst[0]:
+            src = (from_file, dst[1] - forward)
+            return [src] if self.squares.get(src) == (self.turn, "pawn") else []
+        one = (dst[0], dst[1] - forward)
+        if self.squares.get(one) == (self.turn, "pawn"):
+            return [one]
+        two = (dst[0], dst[1] - 2 * forward)
+        start_rank = 1 if self.turn == "white" else 6
+        if one not in self.squares and two[1] == start_rank and self.squares.get(two) == (self.turn, "pawn"):
+            return [two]
+        return []
+
+    def resolve(self, token: str) -> List[Move]:
+        """Apply ``token`` and return the board moves it produced."""
+
+        color = self.turn
+        san = token.rstrip("+#!?")
+        lan = _LAN_RE.match(san)
+        castle_rook, self._castle_rook = self._castle_rook, None
+        if lan and castle_rook == (_sq(lan.group(2)), _sq(lan.group(3))):
+            # game_log exports written before castling was folded into O-O
+            # list the rook move separately; it was already applied.
+            return []
+
+        if san in ("O-O", "0-0", "O-O-O", "0-0-0"):
+            return self._castle(color, long_side=san.count("-") == 2)
+
+        if lan:
+            src, dst, promotion = _sq(lan.group(2)), _sq(lan.group(3)), lan.group(4)
+            if self.squares.get(src, (None,))[0] != color:
+                raise ValueError(f"no {color} piece on {lan.group(2)} for {token!r}")
+            if (
+                self.squares[src][1] == "king"
+                and src == (4, 0 if color == "white" else 7)
+                and dst[1] == src[1]
+                and abs(dst[0] - src[0]) == 2
+            ):
+                moves = self._castle(color, long_side=dst[0] < src[0])
+                self._castle_rook = (_sq(moves[1][2]), _sq(moves[1][3]))
+                return moves
+        else:
+            m = _SAN_RE.match(san)
+            if not m:
+                raise ValueError(f"unrecognised move {token!r}")
+            piece = _PIECE_NAMES[m.group(1)]
+            from_file = FILES.index(m.group(2)) if m.group(2) else None
+            from_rank = int(m.group(3)) - 1 if m.group(3) else None
+            dst, promotion = _sq(m.group(4)), m.group(5)
+            if piece == "pawn":
+                candidates = self._pawn_sources(dst, from_file)
+            else:
+                candidates = [
+                    sq for sq, pc in self.squares.items()
+                    if pc == (color, piece)
+                    and (from_file is None or sq[0] == from_file)
+                    and (from_rank is None or sq[1] == from_rank)
+                    and self._reaches(sq, dst, piece)
+                ]
+            if len(candidates) > 1:
+                candidates = [sq for sq in candidates if self._leaves_king_safe(sq, dst)]
+            if len(candidates) != 1:
+                raise ValueError(f"cannot resolve {token!r} for {color} ({len(candidates)} candidates)")
+            src = candidates[0]
+
+        moving_color, piece = self.squares[src]
+        if piece == "pawn" and dst == self.ep and dst not in self.squares:
+            self.squares.pop((dst[0], src[1]), None)
+        del self.squares[src]
+        self.squares[dst] = (moving_color, _PIECE_NAMES[promotion] if promotion else piece)
+        self._finish(((src[0], (src[1] + dst[1]) // 2) if piece == "pawn" and abs(dst[1] - src[1]) == 2 else None))
+        return [(moving_color, piece, _name(src), _name(dst))]
+
+    def _castle(self, color: str, *, long_side: bool) -> List[Move]:
+        rank = 0 if color == "white" else 7
+        king_to, rook_from, rook_to = ((2, 0, 3) if long_side else (6, 7, 5))
+        moves = [
+            (color, "king", _name((4, rank)), _name((king_to, rank))),
+            (color, "rook", _name((rook_from, rank)), _name((rook_to, rank))),
+        ]
+        for _, _, src, dst in moves:
+            self.squares[_sq(dst)] = self.squares.pop(_sq(src))
+        self._finish(None)
+        return moves
+
+    def _finish(self, ep: Optional[Square]) -> None:
+        self.ep = ep
+        self.turn = "black" if self.turn == "white" else "white"
+
+
+def _pgn_games(text: str) -> Iterator[List[str]]:
+    """Yield the SAN/LAN tokens of each game in ``text``."""
+
+    text = re.sub(r"\{[^}]*\}|;[^\n]*", " ", text)
+    while True:
+        stripped = re.sub(r"\([^()]*\)", " ", text)
+        if stripped == text:
+            break
+        text = stripped
+
+    tokens: List[str] = []
+    in_headers = False
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith("["):
+            if tokens and not in_headers:
+                yield tokens
+                tokens = []
+            in_headers = True
+            continue
+        in_headers = False
+        for token in line.split():
+            token = re.sub(r"^\d+\.+", "", token)
+            if not token or token.startswith("$"):
+                continue
+            if token in _RESULTS:
+                if tokens:
+                    yield tokens
+                tokens = []
+                continue
+            tokens.append(token)
+    if tokens:
+        yield tokens
+
+
+def commands_from_pgn(path: Path) -> Iterator[List[str]]:
+    """Yield one list of ``move_*`` commands per game in the PGN file."""
+
+    for game_no, tokens in enumerate(_pgn_games(path.read_text(encoding="utf-8-sig")), start=1):
+        board = _Board()
+        commands: List[str] = []
+        for token in tokens:
+            try:
+                moves = board.resolve(token)
+            except ValueError as exc:
+                print(f"[replay] {path.name} game {game_no}: {exc}; truncating game", file=sys.stderr)
+                break
+            commands.extend(move_command(*move) for move in moves)
+        yield commands
+
+
+def commands_from_jsonl(path: Path) -> Iterator[List[str]]:
+    """Yield the commands of an ``engine.history`` dump as a single game."""
+
+    commands: List[str] = []
+    with path.open(encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry: Any = json.loads(line)
+            except json.JSONDecodeError:
+                entry = line
+            if isinstance(entry, str):
+                commands.append(entry)
+                continue
+            if not isinstance(entry, dict):
+                continue
+            if isinstance(entry.get("command"), str):
+                commands.append(entry["command"])
+                continue
+            vars_ = entry.get("vars") or {}
+            try:
+                commands.append(move_command(vars_["color"], vars_["piece"], vars_["location1"], vars_["location2"]))
+            except (KeyError, TypeError):
+                continue
+    yield commands
+
+
+def load_games(paths: Iterable[Path]) -> List[List[str]]:
+    games: List[List[str]] = []
+    for path in paths:
+        reader = commands_from_jsonl if path.suffix.lower() in (".jsonl", ".json", ".ndjson") else commands_from_pgn
+        games.extend(game for game in reader(path) if game)
+    return games
+
+
+# ---------------------------------------------------------------------------
+# Targets
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class Stats:
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+    started: float = 0.0
+    finished: float = 0.0
+
+    def record(self, latency: float, ok: bool) -> None:
+        self.latencies.append(latency)
+        if not ok:
+            self.errors += 1
+
+    def summary(self) -> Dict[str, Any]:
+        count = len(self.latencies)
+        elapsed = max(self.finished - self.started, 1e-9)
+        ordered = sorted(self.latencies)
+
+        def pct(p: float) -> float:
+            if not ordered:
+                return 0.0
+            return ordered[min(count - 1, int(round(p / 100.0 * (count - 1))))] * 1000.0
+
+        return {
+            "commands": count,
+            "seconds": round(elapsed, 3),
+            "throughput_per_s": round(count / elapsed, 1),
+            "latency_ms": {
+                "p50": round(pct(50), 3),
+                "p90": round(pct(90), 3),
+                "p99": round(pct(99), 3),
+                "max": round(ordered[-1] * 1000.0, 3) if ordered else 0.0,
+            },
+            "errors": self.errors,
+            "error_rate": round(self.errors / count, 4) if count else 0.0,
+        }
+
+
+class InProcessTarget:
+    """Run commands through a local engine, timing ``engine.handle``."""
+
+    def __init__(self, stats: Stats, *, dry_run: bool) -> None:
+        from omnilink import OmniLinkEngine, TypeRegistry, load_patterns_from_file
+
+        types = TypeRegistry()
+        self.engine = OmniLinkEngine(load_patterns_from_file(PATTERNS_FILE, types), types=types)
+        self.stats = stats
+
+        if dry_run:
+            def _handle(_evt: Dict[str, Any]) -> Dict[str, Any]:
+                return {"ack": True}
+        else:
+            from chess_api import move_piece
+
+            def _handle(evt: Dict[str, Any]) -> Dict[str, Any]:
+                v = evt.get("vars", {})
+                try:
+                    move_piece(v["color"], v["piece"], v["location1"], v["location2"])
+                except KeyError:
+                    return {"ack": False}
+                return {"ack": True}
+
+        self.engine.on(lambda _evt: True, _handle)
+
+    def send(self, command: str) -> None:
+        t0 = time.perf_counter()
+        res = self.engine.handle(command, meta={"source": "replay"})
+        result = res.get("result")
+        ok = bool(res.get("ok")) and isinstance(result, dict) and bool(result.get("ack")) and not result.get("error")
+        self.stats.record(time.perf_counter() - t0, ok)
+
+    def drain(self, timeout: float) -> None:
+        return None
+
+    def close(self) -> None:
+        return None
+
+
+class MQTTTarget:
+    """Publish commands to the bridge and time the feedback round-trip.
+
+    Feedback messages carry no correlation id, so replies are matched to
+    requests in order; the bridge answers a single ``reply_to`` topic in order.
+    """
+
+    def __init__(
+        self,
+        stats: Stats,
+        *,
+        inflight: int,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        transport: Optional[str] = None,
+    ) -> None:
+        import paho.mqtt.client as mqtt  # type: ignore
+
+        self.stats = stats
+        self.inflight = max(1, inflight)
+        transport = (transport or os.environ.get("MQTT_TRANSPORT") or "websockets").lower()
+        default_port = 9001 if transport == "websockets" else 1883
+        self.host = host or os.environ.get("MQTT_HOST", "localhost")
+        self.port = int(port if port is not None else os.environ.get("MQTT_PORT", str(default_port)))
+        self.command_topic = os.environ.get("MQTT_COMMAND_TOPIC", "olink/commands")
+        self.reply_topic = f"olink/replay/{uuid.uuid4().hex[:12]}"
+        self.qos = int(os.environ.get("MQTT_QOS_PUB", "0"))
+
+        self._pending: Deque[float] = deque()
+        self._cond = threading.Condition()
+        self._subscribed = threading.Event()
+
+        self.client = mqtt.Client(transport=transport, client_id=f"omnilink-replay-{os.getpid()}")
+        if os.environ.get("MQTT_USERNAME"):
+            self.client.username_pw_set(os.environ["MQTT_USERNAME"], os.environ.get("MQTT_PASSWORD"))
+        self.client.on_connect = lambda c, *_a: c.subscribe(self.reply_topic, qos=self.qos)
+        self.client.on_subscribe = lambda *_a: self._subscribed.set()
+        self.client.on_message = self._on_message
+        self.client.connect(self.host, self.port, keepalive=60)
+        self.client.loop_start()
+        if not self._subscribed.wait(10):
+            raise RuntimeError(f"Could not subscribe on {self.host}:{self.port}")
+
+    def _on_message(self, _client: Any, _ud: Any, msg: Any) -> None:
+        now = time.perf_counter()
+        try:
+            ok = bool(json.loads(msg.payload.decode("utf-8")).get("feedback"))
+        except (ValueError, AttributeError):
+            ok = False
+        with self._cond:
+            if not self._pending:
+                return
+            self.stats.record(now - self._pending.popleft(), ok)
+            self._cond.notify_all()
+
+    def send(self, command: str) -> None:
+        with self._cond:
+            self._cond.wait_for(lambda: len(self._pending) < self.inflight, timeout=30)
+            self._pending.append(time.perf_counter())
+        payload = json.dumps({"command": command, "reply_to": self.reply_topic, "meta": {"source": "replay"}})
+        self.client.publish(self.command_topic, payload, qos=self.qos)
+
+    def drain(self, timeout: float) -> None:
+        with self._cond:
+            if not self._cond.wait_for(lambda: not self._pending, timeout=timeout):
+                lost = len(self._pending)
+                self._pending.clear()
+                self.stats.errors += lost
+                self.stats.latencies.extend([timeout] * lost)
+
+    def close(self) -> None:
+        self.client.loop_stop()
+        self.client.disconnect()
+
+
+class TCPTarget:
+    """Forward commands through ``OmniLinkTCPAdapter``; latency covers the send."""
+
+    def __init__(self, stats: Stats) -> None:
+        from omnilink import OmniLinkTCPAdapter
+
+        self.adapter = OmniLinkTCPAdapter(log=False)
+        self.stats = stats
+
+    def send(self, command: str) -> None:
+        t0 = time.perf_counter()
+        ok = True
+        try:
+            self.adapter.send_command(command, extra={"text": command})
+        except RuntimeError as exc:
+            print(f"[replay] {exc}", file=sys.stderr)
+            ok = False
+        self.stats.record(time.perf_counter() - t0, ok)
+
+    def drain(self, timeout: float) -> None:
+        return None
+
+    def close(self) -> None:
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Entrypoint
+# ---------------------------------------------------------------------------
+
+
+def run(
+    games: List[List[str]],
+    send: Callable[[str], None],
+    *,
+    rate: float,
+    repeat: int,
+    reset: Optional[Callable[[], None]] = None,
+) -> None:
+    interval = 1.0 / rate if rate > 0 else 0.0
+    next_at = time.perf_counter()
+    for _ in range(max(1, repeat)):
+        for game in games:
+            if reset is not None:
+                reset()
+            for command in game:
+                if interval:
+                    delay = next_at - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                    next_at = max(next_at + interval, time.perf_counter() - interval)
+                send(command)
+
+
+def _parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Replay PGN or engine history through an Omni Link target.")
+    parser.add_argument("inputs", nargs="+", type=Path, help="PGN files or JSONL dumps of engine.history.")
+    parser.add_argument("--target", choices=("inprocess", "mqtt", "tcp"), default="inprocess")
+    parser.add_argument("--rate", type=float, default=0.0, help="Commands per second (0 = as fast as possible).")
+    parser.add_argument("--repeat", type=int, default=1, help="Replay the inputs this many times.")
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="inprocess only: acknowledge commands without calling the chess server.",
+    )
+    parser.add_argument(
+        "--reset",
+        action="store_true",
+        help="Reset the chess server board before each game (uses chess_api.SERVER_URL).",
+    )
+    parser.add_argument("--inflight", type=int, default=1, help="mqtt only: max unanswered commands.")
+    parser.add_argument("--drain-timeout", type=float, default=10.0, help="mqtt only: wait for late feedback.")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parse_args(argv if argv is not None else sys.argv[1:])
+    games = load_games(args.inputs)
+    if not games:
+        print("[replay] no commands found in inputs", file=sys.stderr)
+        return 1
+
+    stats = Stats()
+    if args.target == "mqtt":
+        target: Any = MQTTTarget(stats, inflight=args.inflight)
+    elif args.target == "tcp":
+        target = TCPTarget(stats)
+    else:
+        target = InProcessTarget(stats, dry_run=args.dry_run)
+
+    reset = None
+    if args.reset:
+        from chess_api import reset_board
+
+        reset = reset_board
+
+    stats.started = time.perf_counter()
+    try:
+        run(games, target.send, rate=args.rate, repeat=args.repeat, reset=reset)
+        target.drain(args.drain_timeout)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stats.finished = time.perf_counter()
+        target.close()
+
+    report = stats.summary()
+    report["target"] = args.target
+    if args.json:
+        print(json.dumps(report))
+    else:
+        lat = report["latency_ms"]
+        print(
+            f"[replay] {report['commands']} commands in {report['seconds']}s "
+            f"({report['throughput_per_s']}/s) via {args.target}"
+        )
+        print(f"[replay] latency ms p50={lat['p50']} p90={lat['p90']} p99={lat['p99']} max={lat['max']}")
+        print(f"[replay] errors {report['errors']} ({report['error_rate']:.2%})")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - manual utility
+    sys.exit(main())
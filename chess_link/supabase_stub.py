@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""Local stand-in for the Supabase REST API on ``command_outputs``.
+
+Lets ``RemoteCommandClient``, ``MultiUserRemoteClient``, the remote bridges and
+``fetch_last_command.py`` run against a process on this machine instead of the
+hosted project.  It implements the PostgREST subset those clients use on
+``/rest/v1/command_outputs``:
+
+* ``GET`` with ``select``, column filters (``eq``, ``neq``, ``gt``, ``gte``,
+  ``lt``, ``lte``, ``in.(...)``), ``order`` (``col.asc``/``col.desc``, comma
+  separated), ``limit`` and ``offset``
+* ``PATCH`` with the same filters; ``Prefer: return=minimal`` answers 204,
+  otherwise the updated rows are returned
+* ``POST`` inserts, and upserts with ``on_conflict`` plus
+  ``Prefer: resolution=merge-duplicates``
+
+Row level security is imitated: a request only sees rows whose ``user_key`` is
+listed in its comma separated ``X-Client-User-Key`` header, and none without
+the header.  With a single key this is the exact-match policy in
+``fetch_last_command.py``; the list form stands in for the wider policy that
+``MultiUserRemoteClient`` needs (see its docstring).  When the stub has an
+``anon_key``, requests must send it as ``apikey``.  Values compare as strings, which orders the ISO
+``updated_at`` timestamps the stub writes correctly.
+
+New commands are injected with :meth:`SupabaseStub.put_command` (or ``POST`` with
+a ``last_command``).  Like the hosted table, writing a response does not touch
+``updated_at``.
+
+Usage::
+
+    python chess_link/supabase_stub.py --port 54321 --anon-key local
+    OMNILINK_REMOTE_BASE_URL=http://127.0.0.1:54321 OMNILINK_REMOTE_ANON_KEY=local \\
+        OMNILINK_REMOTE_USER_KEY=demo python chess_link/link_remote.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+TABLE_PATH = "/rest/v1/command_outputs"
+COLUMNS = ("user_key", "last_command", "last_response", "updated_at")
+
+_DEFAULT_HOST = "127.0.0.1"
+_DEFAULT_PORT = 54321
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+# ---------------------------------------------------------------------------
+# Query helpers
+# ---------------------------------------------------------------------------
+
+
+def _split_in(value: str) -> List[str]:
+    """Parse the body of ``in.(a,"b,c")`` into its items."""
+
+    inner = value.strip()
+    if inner.startswith("(") and inner.endswith(")"):
+        inner = inner[1:-1]
+    items: List[str] = []
+    current, quoted = "", False
+    for char in inner:
+        if char == '"':
+            quoted = not quoted
+        elif char == "," and not quoted:
+            items.append(current)
+            current = ""
+        else:
+            current += char
+    if current or items:
+        items.append(current)
+    return items
+
+
+_OPS: Dict[str, Callable[[Any, str], bool]] = {
+    "eq": lambda cell, value: cell is not None and str(cell) == value,
+    "neq": lambda cell, value: cell is None or str(cell) != value,
+    "gt": lambda cell, value: cell is not None and str(cell) > value,
+    "gte": lambda cell, value: cell is not None and str(cell) >= value,
+    "lt": lambda cell, value: cell is not None and str(cell) < value,
+    "lte": lambda cell, value: cell is not None and str(cell) <= value,
+    "in": lambda cell, value: cell is not None and str(cell) in _split_in(value),
+}
+
+
+class QueryError(ValueError):
+    """A request the stub does not understand (answered with HTTP 400)."""
+
+
+def _parse_filters(params: List[Tuple[str, str]]) -> List[Tuple[str, Callable[[Any, str], bool], str]]:
+    filters = []
+    for column, expr in params:
+        if column in ("select", "order", "limit", "offset", "on_conflict"):
+            continue
+        if column not in COLUMNS:
+            raise QueryError(f"unknown column {column!r}")
+        op, _, value = expr.partition(".")
+        if op not in _OPS:
+            raise QueryError(f"unsupported operator {op!r}")
+        filters.append((column, _OPS[op], value))
+    return filters
+
+
+# ---------------------------------------------------------------------------
+# Server
+# ---------------------------------------------------------------------------
+
+
+class SupabaseStub(ThreadingHTTPServer):
+    """In-memory ``command_outputs`` table behind a PostgREST-like HTTP API."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        server_address: Tuple[str, int] = (_DEFAULT_HOST, 0),
+        *,
+        anon_key: Optional[str] = None,
+        latency: float = 0.0,
+    ) -> None:
+        super().__init__(server_address, _RESTHandler)
+        self.anon_key = anon_key
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.rows: List[Dict[str, Any]] = []
+        self.metrics = Counter()
+        self._last_us = 0
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.server_address[0]}:{self.server_address[1]}"
+
+    def start(self) -> "SupabaseStub":
+        """Serve in a background thread (handy for tests and benchmarks)."""
+
+        threading.Thread(target=self.serve_forever, name="supabase-stub", daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    # ----- table access
+    def _timestamp(self) -> str:
+        """Strictly increasing ISO timestamp (caller holds the lock)."""
+
+        self._last_us = max(int(time.time() * 1_000_000), self._last_us + 1)
+        return (_EPOCH + timedelta(microseconds=self._last_us)).strftime("%Y-%m-%dT%H:%M:%S.%f+00:00")
+
+    def put_command(self, user_key: str, command: str, *, append: bool = False) -> Dict[str, Any]:
+        """Record a new command for ``user_key`` as a client app would.
+
+        By default the user's row is replaced (one row per user); ``append=True``
+        adds a row instead, for log-style tables read in streaming mode.
+        """
+
+        with self.lock:
+            row = None if append else next((r for r in self.rows if r["user_key"] == user_key), None)
+            if row is None:
+                row = {"user_key": user_key}
+                self.rows.append(row)
+            row.update(last_command=command, last_response=None, updated_at=self._timestamp())
+            return dict(row)
+
+    def on_response(self, listener: Callable[[Dict[str, Any]], None]) -> None:
+        """Call ``listener(row)`` whenever a write sets ``last_response``."""
+
+        self._listeners.append(listener)
+
+    def query(
+        self,
+        params: List[Tuple[str, str]],
+        visible: Optional[List[str]],
+    ) -> List[Dict[str, Any]]:
+        filters = _parse_filters(params)
+        opts = dict(params)
+        with self.lock:
+            rows = [
+                r for r in self.rows
+                if (visible is None or r["user_key"] in visible)
+                and all(op(r.get(column), value) for column, op, value in filters)
+            ]
+            rows = [dict(r) for r in rows]
+        for term in reversed([t for t in opts.get("order", "").split(",") if t]):
+            column, _, direction = term.partition(".")
+            if column not in COLUMNS:
+                raise QueryError(f"unknown order column {column!r}")
+            rows.sort(key=lambda r: (r.get(column) is None, str(r.get(column) or "")), reverse=direction.startswith("desc"))
+        offset = int(opts.get("offset") or 0)
+        rows = rows[offset:]
+        if opts.get("limit"):
+            rows = rows[: int(opts["limit"])]
+        select = [c for c in (opts.get("select") or "*").split(",") if c]
+        if select != ["*"]:
+            rows = [{c: r.get(c) for c in select} for r in rows]
+        return rows
+
+    def update(
+        self,
+        params: List[Tuple[str, str]],
+        visible: Optional[List[str]],
+        changes: Dict[str, Any],
+    ) -> List[Dict[str, Any]]:
+        filters = _parse_filters(params)
+        changes = {k: v for k, v in changes.items() if k in COLUMNS}
+        with self.lock:
+            updated = []
+            for row in self.rows:
+                if visible is not None and row["user_key"] not in visible:
+                    continue
+                if all(op(row.get(column), value) for column, op, value in filters):
+                    row.update(changes)
+                    updated.append(dict(row))
+        self._notify(updated, changes)
+        return updated
+
+    def upsert(
+        self,
+        records: List[Dict[str, Any]],
+        visible: Optional[List[str]],
+        *,
+        on_conflict: Optional[str],
+        merge: bool,
+    ) -> List[Dict[str, Any]]:
+        written = []
+        with self.lock:
+            for record in records:
+                record = {k: v for k, v in record.items() if k in COLUMNS}
+                user_key = record.get("user_key")
+                if not user_key or (visible is not None and user_key not in visible):
+                    raise QueryError("row violates row-level security policy")
+                existing = None
+                if on_conflict:
+                    existing = next((r for r in self.rows if r.get(on_conflict) == record.get(on_conflict)), None)
+                    if existing is not None and not merge:
+                        raise QueryError("duplicate key value violates unique constraint")
+                if existing is None:
+                    existing = {c: None for c in COLUMNS}
+                    self.rows.append(existing)
+                    if "updated_at" not in record:
+                        record["updated_at"] = self._timestamp()
+                existing.update(record)
+                written.append(dict(existing))
+        for row in written:
+            self._notify([row], row)
+        return written
+
+    def _notify(self, rows: List[Dict[str, Any]], changes: Dict[str, Any]) -> None:
+        if "last_response" not in changes:
+            return
+        for row in rows:
+            for listener in self._listeners:
+                listener(row)
+
+
+class _RESTHandler(BaseHTTPRequestHandler):
+    server: SupabaseStub
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; with Nagle on, a client
+    # reusing the keep-alive connection waits out its delayed ACK (~40 ms).
+    disable_nagle_algorithm = True
+
+    def _reply(self, status: int, payload: Any = None) -> None:
+        body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        if payload is not None:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def _prepare(self) -> Optional[Tuple[List[Tuple[str, str]], Optional[List[str]]]]:
+        """Check path and key; return (query params, visible user keys)."""
+
+        server = self.server
+        server.metrics[f"http.{self.command}"] += 1
+        if server.latency:
+            time.sleep(server.latency)
+        url = urlsplit(self.path)
+        if url.path.rstrip("/") != TABLE_PATH:
+            self._reply(404, {"message": f"no table at {url.path}"})
+            return None
+        if server.anon_key is not None and self.headers.get("apikey") != server.anon_key:
+            self._reply(401, {"message": "Invalid API key"})
+            return None
+        header = self.headers.get("X-Client-User-Key")
+        visible = [k.strip() for k in header.split(",") if k.strip()] if header is not None else []
+        return parse_qsl(url.query, keep_blank_values=True), visible
+
+    def _body(self) -> Any:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"null")
+
+    def _minimal(self) -> bool:
+        return "return=minimal" in (self.headers.get("Prefer") or "")
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server API
+        prepared = self._prepare()
+        if prepared is None:
+            return
+        try:
+            self._reply(200, self.server.query(*prepared))
+        except (QueryError, ValueError) as exc:
+            self._reply(400, {"message": str(exc)})
+
+    def do_PATCH(self) -> None:  # noqa: N802 - http.server API
+        prepared = self._prepare()
+        if prepared is None:
+            return
+        try:
+            changes = self._body()
+            if not isinstance(changes, dict):
+                raise QueryError("PATCH body must be a JSON object")
+            rows = self.server.update(*prepared, changes)
+        except (QueryError, ValueError) as exc:
+            self._reply(400, {"message": str(exc)})
+            return
+        self._reply(204) if self._minimal() else self._reply(200, rows)
+
+    def do_POST(self) -> None:  # noqa: N802 - http.server API
+        prepared = self._prepare()
+        if prepared is None:
+            return
+        params, visible = prepared
+        try:
+            body = self._body()
+            records = body if isinstance(body, list) else [body]
+            if not all(isinstance(r, dict) for r in records):
+                raise QueryError("POST body must be an object or a list of objects")
+            rows = self.server.upsert(
+                records,
+                visible,
+                on_conflict=dict(params).get("on_conflict"),
+                merge="resolution=merge-duplicates" in (self.headers.get("Prefer") or ""),
+            )
+        except QueryError as exc:
+            self._reply(409 if "duplicate" in str(exc) else 403 if "security" in str(exc) else 400, {"message": str(exc)})
+            return
+        except ValueError as exc:
+            self._reply(400, {"message": str(exc)})
+            return
+        self._reply(201) if self._minimal() else self._reply(201, rows)
+
+    def log_message(self, *_args: Any) -> None:
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Entrypoint
+# ---------------------------------------------------------------------------
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Local Supabase REST stand-in for command_outputs.")
+    parser.add_argument("--host", default=_DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=_DEFAULT_PORT)
+    parser.add_argument("--anon-key", default=None, help="Require this apikey header.")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Delay added to every request.")
+    args = parser.parse_args(argv)
+
+    stub = SupabaseStub((args.host, args.port), anon_key=args.anon_key, latency=args.latency_ms / 1000.0)
+    print(f"[supabase_stub] {stub.url}{TABLE_PATH}")
+    try:
+        stub.serve_forever()
+    except KeyboardInterrupt:
+        print("[supabase_stub] shutting down")
+    finally:
+        stub.server_close()
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - manual utility
+    sys.exit(main())
@@ -3,8 +3,8 @@
 
 The :mod:`chess_link.link_tcp` module forwards every recognised command to a
 TCP endpoint using :class:`chess_link.omnilink.OmniLinkTCPAdapter`.  This script acts as
-that endpoint: it accepts incoming connections, reads the payload sent by the
-adapter and pretty-prints it to standard output.
+that endpoint: it accepts incoming connections, reads every payload sent by the
+adapter until it closes the connection and prints each one to standard output.
 
 The defaults mirror those of :class:`~chess_link.omnilink.OmniLinkTCPAdapter` so the
 client can run without additional configuration.  They can be overridden via
@@ -15,22 +15,33 @@ endpoint configured in :mod:`link_tcp`.
 from __future__ import annotations
 
 import argparse
+import asyncio
 import json
 import logging
 import os
+import queue
 import signal
+import socket
 import socketserver
 import sys
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import Future
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, Union
 
 from chess_api import move_piece
+from omnilink import FRAME_JSON, FRAME_MAGIC, BinaryFrameDecoder, BinaryFrameEncoder, FrameError
 
 
 _DEFAULT_HOST = "0.0.0.0"
 _DEFAULT_PORT = 8766
 _DEFAULT_ENCODING = "utf-8"
 _DEFAULT_DELIMITER = "\n"
+_DEFAULT_MAX_MESSAGE = 1 << 20
+_READ_SIZE = 65536
+_SERVER_MODES = ("threaded", "asyncio")
 
 
 # ---------------------------------------------------------------------------
@@ -42,6 +53,17 @@ def _env_str(name: str, default: str) -> str:
     return default if value is None else value
 
 
+def _env_float(name: str, default: float) -> float:
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        logging.warning("Environment variable %s should be a number (got %r)", name, value)
+        return default
+
+
 def _env_int(name: str, default: int) -> int:
     value = os.environ.get(name)
     if value is None:
@@ -78,9 +100,272 @@ class ClientConfig:
     port: int = _DEFAULT_PORT
     encoding: str = _DEFAULT_ENCODING
     delimiter: Optional[str] = _DEFAULT_DELIMITER
+    max_message_size: int = _DEFAULT_MAX_MESSAGE
+    mode: str = "threaded"
+    dry_run: bool = False
+    stats_interval: float = 0.0
     quiet: bool = False
 
 
+# ---------------------------------------------------------------------------
+# Message parsing (shared by both server modes)
+# ---------------------------------------------------------------------------
+
+
+class MessageTooLarge(ValueError):
+    """A message exceeded the server's ``max_message_size``."""
+
+
+class TextMessageReader:
+    """Split one connection's byte stream into delimiter-terminated messages.
+
+    :meth:`feed` appends a chunk and returns the messages it completed.  The
+    delimiter search resumes where it stopped, messages are decoded straight
+    from the buffer, and consumed bytes are trimmed in ``_READ_SIZE`` steps
+    rather than per message.  Without a delimiter the whole stream is one
+    message, returned by :meth:`finish` together with any unterminated tail.
+    An oversized message raises :class:`MessageTooLarge`, after the messages
+    that preceded it have been returned.
+    """
+
+    def __init__(self, delimiter: Optional[str], encoding: str, max_size: int) -> None:
+        self.delimiter = delimiter.encode(encoding) if delimiter else None
+        self.encoding = encoding
+        self.max_size = max_size
+        self._buffer = bytearray()
+        self._start = 0  # first byte of the message being assembled
+        self._scan = 0   # where to resume searching for the delimiter
+        self._error: Optional[MessageTooLarge] = None
+
+    def feed(self, chunk: bytes) -> List[str]:
+        if self._error is not None:
+            raise self._error
+        buffer = self._buffer
+        buffer += chunk
+        messages: List[str] = []
+        if self.delimiter is not None:
+            with memoryview(buffer) as view:
+                while True:
+                    end = buffer.find(self.delimiter, self._scan)
+                    if end < 0:
+                        self._scan = max(self._start, len(buffer) - len(self.delimiter) + 1)
+                        break
+                    if end - self._start > self.max_size:
+                        self._error = MessageTooLarge(f"message exceeds {self.max_size} bytes")
+                        break
+                    self._decode(view[self._start:end], messages)
+                    self._start = self._scan = end + len(self.delimiter)
+        if self._error is None and len(buffer) - self._start > self.max_size:
+            self._error = MessageTooLarge(f"message exceeds {self.max_size} bytes")
+        if self._error is not None:
+            if not messages:
+                raise self._error
+            return messages
+        if self._start >= _READ_SIZE or self._start == len(buffer):
+            del buffer[:self._start]
+            self._scan -= self._start
+            self._start = 0
+        return messages
+
+    def finish(self) -> List[str]:
+        if self._error is not None:
+            raise self._error
+        messages: List[str] = []
+        if self._start < len(self._buffer):
+            with memoryview(self._buffer) as view:
+                self._decode(view[self._start:], messages)
+        self._buffer.clear()
+        self._start = self._scan = 0
+        return messages
+
+    def _decode(self, data: memoryview, out: List[str]) -> None:
+        try:
+            out.append(str(data, self.encoding))
+        except UnicodeDecodeError:
+            logging.error("Failed to decode payload (%d bytes)", len(data))
+        finally:
+            data.release()
+
+
+# ---------------------------------------------------------------------------
+# Ordered move execution
+# ---------------------------------------------------------------------------
+
+
+def _percentiles(samples: Deque[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    if not ordered:
+        return {"p50": 0.0, "p99": 0.0, "max": 0.0}
+
+    def _at(fraction: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000, 3)
+
+    return {"p50": _at(0.5), "p99": _at(0.99), "max": round(ordered[-1] * 1000, 3)}
+
+
+class MoveExecutor:
+    """Apply moves from every connection, one at a time, in arrival order.
+
+    Connection handlers only :meth:`submit` payloads; a single worker thread
+    takes them off one FIFO queue and calls ``chess_api.move_piece`` (a pooled
+    HTTP session), so concurrent senders can no longer reach the chess server
+    out of order.  The returned future resolves to ``True`` once a move found
+    in the payload has been applied, ``False`` if there was none, the chess
+    server rejected it (``handled`` false) or the request failed.
+    With ``dry_run`` moves are only extracted, never sent.
+
+    :meth:`stats` reports the queue depth and, over the last ``samples``
+    moves, the time spent waiting in the queue and applying the move.
+    """
+
+    def __init__(self, *, dry_run: bool = False, samples: int = 1024) -> None:
+        self.dry_run = dry_run
+        self.metrics: Counter = Counter()
+        self.max_depth = 0
+        self._queue: "queue.SimpleQueue[Optional[Tuple[float, str, Optional[Dict[str, Any]], Future]]]" = (
+            queue.SimpleQueue()
+        )
+        self._wait: Deque[float] = deque(maxlen=samples)
+        self._apply: Deque[float] = deque(maxlen=samples)
+        self._lock = threading.Lock()
+        self._worker = threading.Thread(target=self._run, name="tcp-client-move", daemon=True)
+        self._worker.start()
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def submit(self, payload: str, parsed: Optional[Dict[str, Any]]) -> "Future[bool]":
+        future: "Future[bool]" = Future()
+        self._queue.put((time.perf_counter(), payload, parsed, future))
+        depth = self._queue.qsize()
+        if depth > self.max_depth:
+            self.max_depth = depth
+        return future
+
+    def _run(self) -> None:
+        execute: Callable[..., bool] = (lambda *_move: True) if self.dry_run else CommandTCPHandler._execute_move
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            queued, payload, parsed, future = item
+            started = time.perf_counter()
+            try:
+                applied = CommandTCPHandler._maybe_move_piece(payload, parsed, execute)
+            except Exception as exc:  # pragma: no cover - keep the worker alive
+                logging.error("Move worker failed on %s: %s", payload, exc)
+                applied = False
+            finished = time.perf_counter()
+            with self._lock:
+                self._wait.append(started - queued)
+                if applied:
+                    self._apply.append(finished - started)
+                self.metrics["applied" if applied else "skipped"] += 1
+            future.set_result(applied)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "queue_depth": self.queue_depth,
+                "max_queue_depth": self.max_depth,
+                "applied": self.metrics["applied"],
+                "skipped": self.metrics["skipped"],
+                "wait_ms": _percentiles(self._wait),
+                "apply_ms": _percentiles(self._apply),
+            }
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """Apply what is queued, then stop the worker."""
+
+        if self._worker.is_alive():
+            self._queue.put(None)
+            self._worker.join(timeout)
+
+
+def _log_stats(server: Any) -> None:
+    logging.info("Move queue: %s", json.dumps(server.moves.stats()))
+
+
+def _stats_loop(server: Any, interval: float, stop: threading.Event) -> None:
+    while not stop.wait(interval):
+        _log_stats(server)
+
+
+# ---------------------------------------------------------------------------
+# Acknowledgements
+# ---------------------------------------------------------------------------
+
+
+def wants_ack(parsed: Optional[Dict[str, Any]]) -> bool:
+    """True if the sender asked to hear back once the payload was applied."""
+
+    return parsed is not None and parsed.get("ack") is True
+
+
+def encode_ack(
+    parsed: Dict[str, Any], applied: bool, *, binary: bool, delimiter: Optional[str], encoding: str
+) -> bytes:
+    """Build the acknowledgement for ``parsed``: a JSON line or a FRAME_JSON frame."""
+
+    ack: Dict[str, Any] = {"ack": applied, "command": parsed.get("command")}
+    if "id" in parsed:
+        ack["id"] = parsed["id"]
+    if binary:
+        return BinaryFrameEncoder.frame(FRAME_JSON, json.dumps(ack, ensure_ascii=False).encode("utf-8"))
+    return (json.dumps(ack, ensure_ascii=False) + (delimiter or "\n")).encode(encoding)
+
+
+def _record(server: Any, key: str) -> None:
+    with server.metrics_lock:
+        server.metrics[key] += 1
+
+
+def handle_text_message(
+    message: str, server: Any
+) -> Optional[Tuple[Optional[Dict[str, Any]], "Future[bool]"]]:
+    """Parse one text message (JSON or a raw command) and handle it.
+
+    Returns the parsed payload (``None`` for a raw command) and the future of
+    its move, or ``None`` for an empty message.
+    """
+
+    payload = message.strip()
+    if not payload:
+        logging.debug("Received empty payload")
+        return None
+
+    try:
+        parsed = json.loads(payload)
+    except json.JSONDecodeError:
+        parsed = None
+    if not isinstance(parsed, dict):
+        parsed = None
+        logging.info("Command: %s", payload)
+    return parsed, handle_payload(payload, parsed, server)
+
+
+def handle_payload(payload: str, parsed: Optional[Dict[str, Any]], server: Any) -> "Future[bool]":
+    """Log ``payload``, queue its move on ``server.moves`` and echo it.
+
+    The returned future resolves once the move has been applied (see
+    :class:`MoveExecutor`).
+    """
+
+    if parsed is not None:
+        command = parsed.get("command")
+        if command:
+            logging.info("Command: %s", command)
+        logging.debug("Full payload: %s", json.dumps(parsed, indent=2))
+
+    future = server.moves.submit(payload, parsed)
+    _record(server, "messages")
+
+    sys.stdout.write(payload + "\n")
+    sys.stdout.flush()
+    return future
+
+
 # ---------------------------------------------------------------------------
 # TCP server implementation
 # ---------------------------------------------------------------------------
@@ -90,6 +375,9 @@ class CommandTCPServer(socketserver.ThreadingTCPServer):
     """Threaded TCP server that stores encoding/delimiter configuration."""
 
     allow_reuse_address = True
+    # socketserver's default listen backlog of 5 drops SYNs when many adapters
+    # connect at once, which costs each of them a one-second retransmit.
+    request_queue_size = 1024
 
     def __init__(
         self,
@@ -98,77 +386,122 @@ class CommandTCPServer(socketserver.ThreadingTCPServer):
         *,
         encoding: str,
         delimiter: Optional[str],
+        max_message_size: int = _DEFAULT_MAX_MESSAGE,
+        dry_run: bool = False,
     ) -> None:
         super().__init__(server_address, RequestHandlerClass)
         self.encoding = encoding
         self.delimiter = delimiter
+        self.max_message_size = max_message_size
+        self.dry_run = dry_run
+        self.metrics: Counter = Counter()
+        self.metrics_lock = threading.Lock()
+        self.moves = MoveExecutor(dry_run=dry_run)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.moves.close()
 
 
 class CommandTCPHandler(socketserver.StreamRequestHandler):
-    """Handle incoming payloads from :class:`OmniLinkTCPAdapter`."""
+    """Handle incoming payloads from :class:`OmniLinkTCPAdapter`.
+
+    Every delimiter-terminated message on a connection is handled in order until
+    the sender closes it, so persistent and batching senders can reuse one
+    connection. Without a delimiter the whole stream is one message. A message
+    longer than the server's ``max_message_size`` drops the connection.
+
+    A connection whose first byte is ``FRAME_MAGIC`` uses the adapter's binary
+    framing (``TCP_ADAPTER_FRAMING=binary``): the byte is echoed back and frames
+    are decoded until the sender closes the connection.
+
+    Moves go to the server's shared :class:`MoveExecutor`.  A JSON payload with
+    ``"ack": true`` is answered on the same connection, in the same framing,
+    once its move has been applied; reading that connection waits until then.
+    """
 
     def handle(self) -> None:
         server: CommandTCPServer = self.server  # type: ignore[assignment]
-        data = self.rfile.readline() if server.delimiter else self.rfile.read()
-        if not data:
+        _record(server, "connections")
+        if self.rfile.peek(1)[:1] == bytes((FRAME_MAGIC,)):
+            self.rfile.read(1)
+            self.wfile.write(bytes((FRAME_MAGIC,)))
+            self._handle_binary()
             return
 
+        reader = TextMessageReader(server.delimiter, server.encoding, server.max_message_size)
         try:
-            message = data.decode(server.encoding)
-        except UnicodeDecodeError:
-            logging.error(
-                "Failed to decode payload from %s:%s", *self.client_address
-            )
-            return
-
-        if server.delimiter:
-            message = message.rstrip(server.delimiter)
-
-        payload = message.strip()
-        if not payload:
-            logging.debug("Received empty payload")
+            while True:
+                chunk = self.rfile.read1(_READ_SIZE)
+                messages = reader.feed(chunk) if chunk else reader.finish()
+                for message in messages:
+                    handled = handle_text_message(message, server)
+                    if handled is not None:
+                        self._maybe_ack(*handled, binary=False)
+                if not chunk:
+                    break
+        except MessageTooLarge as exc:
+            logging.error("Dropping connection from %s:%s: %s", *self.client_address, exc)
+
+    def _handle_binary(self) -> None:
+        server: CommandTCPServer = self.server  # type: ignore[assignment]
+        decoder = BinaryFrameDecoder(max_size=server.max_message_size)
+        while True:
+            chunk = self.rfile.read1(_READ_SIZE)
+            if not chunk:
+                return
+            try:
+                payloads = decoder.feed(chunk)
+            except FrameError as exc:
+                logging.error("Dropping connection from %s:%s: %s", *self.client_address, exc)
+                return
+            for parsed in payloads:
+                future = handle_payload(json.dumps(parsed, ensure_ascii=False), parsed, server)
+                self._maybe_ack(parsed, future, binary=True)
+
+    def _maybe_ack(self, parsed: Optional[Dict[str, Any]], future: "Future[bool]", *, binary: bool) -> None:
+        if parsed is None or not wants_ack(parsed):
             return
-
+        server: CommandTCPServer = self.server  # type: ignore[assignment]
+        ack = encode_ack(
+            parsed, future.result(), binary=binary, delimiter=server.delimiter, encoding=server.encoding
+        )
         try:
-            parsed = json.loads(payload)
-        except json.JSONDecodeError:
-            parsed = None
-            logging.info("Command: %s", payload)
-        else:
-            command = parsed.get("command")
-            if command:
-                logging.info("Command: %s", command)
-            logging.debug("Full payload: %s", json.dumps(parsed, indent=2))
-
-        self._maybe_move_piece(payload, parsed)
-
-        sys.stdout.write(payload + "\n")
-        sys.stdout.flush()
+            self.wfile.write(ack)
+        except OSError as exc:
+            logging.warning("Could not acknowledge %s to %s:%s: %s", parsed.get("command"), *self.client_address, exc)
 
     # ------------------------------------------------------------------
     # Chess API integration helpers
     # ------------------------------------------------------------------
 
     @staticmethod
-    def _maybe_move_piece(payload: str, parsed: Optional[Dict[str, Any]]) -> None:
-        """Attempt to move a chess piece based on ``payload`` information."""
-
+    def _maybe_move_piece(
+        payload: str,
+        parsed: Optional[Dict[str, Any]],
+        execute: Optional[Callable[[str, str, str, str], bool]] = None,
+    ) -> bool:
+        """Attempt to move a chess piece based on ``payload`` information.
+
+        The move is taken from ``vars``, else from ``command``, else from the
+        raw payload, and sent once.  Returns ``True`` only if ``execute`` (by
+        default :meth:`_execute_move`) reports that the server applied it.
+        """
+
+        execute = execute or CommandTCPHandler._execute_move
+        move = None
         if parsed:
             vars_payload = parsed.get("vars")
             if isinstance(vars_payload, dict):
                 move = CommandTCPHandler._extract_move_from_vars(vars_payload)
-                if move and CommandTCPHandler._execute_move(*move):
-                    return
 
             command_value = parsed.get("command")
-            if isinstance(command_value, str):
+            if move is None and isinstance(command_value, str):
                 move = CommandTCPHandler._extract_move_from_command(command_value)
-                if move and CommandTCPHandler._execute_move(*move):
-                    return
 
-        move = CommandTCPHandler._extract_move_from_command(payload)
-        if move:
-            CommandTCPHandler._execute_move(*move)
+        if move is None:
+            move = CommandTCPHandler._extract_move_from_command(payload)
+        return move is not None and execute(*move)
 
     @staticmethod
     def _extract_move_from_vars(vars_payload: Dict[str, Any]) -> Optional[tuple[str, str, str, str]]:
@@ -202,7 +535,7 @@ class CommandTCPHandler(socketserver.StreamRequestHandler):
     @staticmethod
     def _execute_move(color: str, piece: str, from_square: str, to_square: str) -> bool:
         try:
-            move_piece(color, piece, from_square, to_square)
+            applied = move_piece(color, piece, from_square, to_square)
         except Exception as exc:  # pragma: no cover - log unexpected failures
             logging.error(
                 "Failed to execute move %s %s from %s to %s: %s",
@@ -214,6 +547,16 @@ class CommandTCPHandler(socketserver.StreamRequestHandler):
             )
             return False
 
+        if not applied:
+            logging.warning(
+                "Chess server rejected move %s %s from %s to %s",
+                color,
+                piece,
+                from_square,
+                to_square,
+            )
+            return False
+
         logging.info(
             "Executed move: %s %s from %s to %s",
             color,
@@ -224,6 +567,123 @@ class CommandTCPHandler(socketserver.StreamRequestHandler):
         return True
 
 
+class AsyncCommandServer:
+    """Single event loop variant of :class:`CommandTCPServer` (``--mode asyncio``).
+
+    Speaks the same text and binary protocols, but every connection is a
+    coroutine on one asyncio loop instead of an OS thread, so thousands of
+    adapter connections stay cheap.  Moves still use the blocking ``chess_api``
+    client; they go to the same :class:`MoveExecutor` worker as in threaded
+    mode, so the loop keeps serving and moves keep their arrival order.
+    Offers the ``serve_forever``/``shutdown``/``server_close`` calls of the
+    threaded server.
+    """
+
+    def __init__(
+        self,
+        server_address: tuple[str, int],
+        *,
+        encoding: str,
+        delimiter: Optional[str],
+        max_message_size: int = _DEFAULT_MAX_MESSAGE,
+        dry_run: bool = False,
+        backlog: int = 1024,
+    ) -> None:
+        self.socket = socket.create_server(server_address, backlog=backlog)
+        self.backlog = backlog
+        self.server_address = self.socket.getsockname()[:2]
+        self.encoding = encoding
+        self.delimiter = delimiter
+        self.max_message_size = max_message_size
+        self.dry_run = dry_run
+        self.metrics: Counter = Counter()
+        self.metrics_lock = threading.Lock()
+        self.moves = MoveExecutor(dry_run=dry_run)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop: Optional[asyncio.Event] = None
+        self._shutdown_requested = threading.Event()
+        self._served = threading.Event()
+
+    def serve_forever(self) -> None:
+        try:
+            asyncio.run(self._serve())
+        finally:
+            self._served.set()
+
+    def shutdown(self) -> None:
+        self._shutdown_requested.set()
+        loop, stop = self._loop, self._stop
+        if loop is not None and stop is not None:
+            loop.call_soon_threadsafe(stop.set)
+
+    def server_close(self) -> None:
+        if self._loop is not None:
+            # Let the loop stop serving before its listening socket goes away.
+            self._served.wait(5)
+        self.socket.close()
+        self.moves.close()
+
+    async def _serve(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        if self._shutdown_requested.is_set():
+            return
+        server = await asyncio.start_server(
+            self._handle_connection, sock=self.socket, backlog=self.backlog, limit=_READ_SIZE
+        )
+        async with server:
+            await self._stop.wait()
+
+    async def _maybe_ack(
+        self,
+        writer: asyncio.StreamWriter,
+        parsed: Optional[Dict[str, Any]],
+        future: "Future[bool]",
+        *,
+        binary: bool,
+    ) -> None:
+        if parsed is None or not wants_ack(parsed):
+            return
+        applied = await asyncio.wrap_future(future)
+        writer.write(
+            encode_ack(parsed, applied, binary=binary, delimiter=self.delimiter, encoding=self.encoding)
+        )
+        await writer.drain()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        peer = writer.get_extra_info("peername") or ("?", 0)
+        _record(self, "connections")
+        try:
+            chunk = await reader.read(_READ_SIZE)
+            if chunk[:1] == bytes((FRAME_MAGIC,)):
+                writer.write(bytes((FRAME_MAGIC,)))
+                decoder = BinaryFrameDecoder(max_size=self.max_message_size)
+                chunk = chunk[1:]
+                while True:
+                    for parsed in decoder.feed(chunk):
+                        future = handle_payload(json.dumps(parsed, ensure_ascii=False), parsed, self)
+                        await self._maybe_ack(writer, parsed, future, binary=True)
+                    chunk = await reader.read(_READ_SIZE)
+                    if not chunk:
+                        break
+            else:
+                text = TextMessageReader(self.delimiter, self.encoding, self.max_message_size)
+                while True:
+                    for message in text.feed(chunk) if chunk else text.finish():
+                        handled = handle_text_message(message, self)
+                        if handled is not None:
+                            await self._maybe_ack(writer, *handled, binary=False)
+                    if not chunk:
+                        break
+                    chunk = await reader.read(_READ_SIZE)
+        except (FrameError, MessageTooLarge) as exc:
+            logging.error("Dropping connection from %s:%s: %s", peer[0], peer[1], exc)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
 # ---------------------------------------------------------------------------
 # Entrypoint
 # ---------------------------------------------------------------------------
@@ -265,6 +725,40 @@ def _parse_args(argv: list[str]) -> ClientConfig:
             "then $TCP_ADAPTER_DELIMITER, falling back to '\\n'."
         ),
     )
+    parser.add_argument(
+        "--max-message-size",
+        type=int,
+        default=None,
+        help=(
+            "Largest accepted message in bytes. Defaults to "
+            "$TCP_CLIENT_MAX_MESSAGE, falling back to 1048576."
+        ),
+    )
+    parser.add_argument(
+        "--mode",
+        choices=_SERVER_MODES,
+        default=None,
+        help=(
+            "Server implementation: a thread per connection (threaded) or one "
+            "event loop for all connections (asyncio). Defaults to "
+            "$TCP_CLIENT_MODE, falling back to 'threaded'."
+        ),
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Print payloads without calling the chess server.",
+    )
+    parser.add_argument(
+        "--stats-interval",
+        type=float,
+        default=None,
+        help=(
+            "Log move queue depth and latency every N seconds (0 disables). "
+            "Defaults to $TCP_CLIENT_STATS_INTERVAL, falling back to 0. The "
+            "stats are always logged on shutdown."
+        ),
+    )
     parser.add_argument(
         "--quiet",
         action="store_true",
@@ -290,11 +784,25 @@ def _parse_args(argv: list[str]) -> ClientConfig:
     )
     delimiter = _normalise_delimiter(delimiter_env)
 
+    max_message_size = args.max_message_size or _env_int("TCP_CLIENT_MAX_MESSAGE", _DEFAULT_MAX_MESSAGE)
+
+    mode = args.mode or _env_str("TCP_CLIENT_MODE", "threaded")
+    if mode not in _SERVER_MODES:
+        parser.error(f"unknown mode {mode!r} (expected one of {', '.join(_SERVER_MODES)})")
+
     return ClientConfig(
         host=host,
         port=port,
         encoding=encoding,
         delimiter=delimiter,
+        max_message_size=max_message_size,
+        mode=mode,
+        dry_run=args.dry_run,
+        stats_interval=(
+            args.stats_interval
+            if args.stats_interval is not None
+            else _env_float("TCP_CLIENT_STATS_INTERVAL", 0.0)
+        ),
         quiet=args.quiet,
     )
 
@@ -306,26 +814,40 @@ def main(argv: Optional[list[str]] = None) -> int:
         format="[tcp_client] %(message)s",
     )
 
-    server = CommandTCPServer(
-        (config.host, config.port),
-        CommandTCPHandler,
-        encoding=config.encoding,
-        delimiter=config.delimiter,
-    )
+    server: Union[CommandTCPServer, AsyncCommandServer]
+    if config.mode == "asyncio":
+        server = AsyncCommandServer(
+            (config.host, config.port),
+            encoding=config.encoding,
+            delimiter=config.delimiter,
+            max_message_size=config.max_message_size,
+            dry_run=config.dry_run,
+        )
+    else:
+        server = CommandTCPServer(
+            (config.host, config.port),
+            CommandTCPHandler,
+            encoding=config.encoding,
+            delimiter=config.delimiter,
+            max_message_size=config.max_message_size,
+            dry_run=config.dry_run,
+        )
 
     if config.delimiter:
         logging.info(
-            "Listening on %s:%s (encoding=%s, delimiter=%r)",
+            "Listening on %s:%s (%s, encoding=%s, delimiter=%r)",
             config.host,
             config.port,
+            config.mode,
             config.encoding,
             config.delimiter,
         )
     else:
         logging.info(
-            "Listening on %s:%s (encoding=%s, delimiter disabled)",
+            "Listening on %s:%s (%s, encoding=%s, delimiter disabled)",
             config.host,
             config.port,
+            config.mode,
             config.encoding,
         )
 
@@ -340,12 +862,20 @@ def main(argv: Optional[list[str]] = None) -> int:
         # in certain environments).  Failing silently keeps the client usable.
         pass
 
+    stop_stats = threading.Event()
+    if config.stats_interval > 0:
+        threading.Thread(
+            target=_stats_loop, args=(server, config.stats_interval, stop_stats), name="tcp-client-stats", daemon=True
+        ).start()
+
     try:
         server.serve_forever()
     except KeyboardInterrupt:
         logging.info("Shutting down TCP client")
     finally:
+        stop_stats.set()
         server.server_close()
+        _log_stats(server)
 
     return 0
 
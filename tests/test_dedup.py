@@ -0,0 +1,55 @@
+import json
+import threading
+from types import SimpleNamespace
+from typing import List, Tuple
+
+from omnilink import IdempotencyCache, OmniLinkEngine, OmniLinkMQTTBridge
+
+
+def test_running_entry_survives_eviction() -> None:
+    cache = IdempotencyCache(ttl=30, max_size=1, mode="auto")
+    started, release = threading.Event(), threading.Event()
+    calls: List[str] = []
+
+    def slow() -> str:
+        calls.append("slow")
+        started.set()
+        release.wait(5)
+        return "first"
+
+    first = threading.Thread(target=cache.run, args=("a", slow))
+    first.start()
+    assert started.wait(5)
+    assert cache.run("b", lambda: "other") == ("other", False)  # over max_size while "a" runs
+
+    redelivered: List[Tuple[str, bool]] = []
+    waiter = threading.Thread(target=lambda: redelivered.append(cache.run("a", slow)))
+    waiter.start()
+    release.set()
+    first.join(5)
+    waiter.join(5)
+    assert calls == ["slow"]
+    assert redelivered == [("first", True)]
+
+
+def test_explicit_ids_are_scoped_per_game() -> None:
+    handled: List[str] = []
+    engine = OmniLinkEngine(["say [word]"])
+    engine.on(lambda _event: True, lambda event: handled.append(event["vars"]["word"]) or {"ack": True})
+    bridge = OmniLinkMQTTBridge(
+        engine, transport="tcp", workers=0, shard_count=2, dedup=IdempotencyCache(mode="auto"), log=False
+    )
+    published: List[Tuple[str, str]] = []
+    bridge.client.publish = lambda topic, payload, qos=0: published.append((topic, payload))
+
+    def deliver(game: str, word: str) -> None:
+        payload = json.dumps({"command": f"say {word}", "id": "1"}).encode()
+        bridge._on_message(bridge.client, None, SimpleNamespace(topic=f"olink/commands/{game}", payload=payload, dup=False))
+
+    games = [g for g in ("g1", "g2", "g3", "g4", "g5", "g6") if bridge.owns_game(g)][:2]
+    deliver(games[0], "one")
+    deliver(games[1], "two")
+    deliver(games[0], "one")  # a real redelivery
+
+    assert handled == ["one", "two"]
+    assert [topic for topic, _payload in published] == [f"olink/commands_feedback/{g}" for g in (*games, games[0])]
@@ -0,0 +1,42 @@
+import io
+import json
+from typing import List
+
+import pytest
+
+import fetch_last_command
+from supabase_stub import SupabaseStub
+
+
+class _Stop(Exception):
+    pass
+
+
+def test_watch_refetches_only_until_the_response_arrives(monkeypatch) -> None:
+    stub = SupabaseStub().start()
+    stub.put_command("watcher", "say hi")
+    inclusive: List[bool] = []
+    fetch = fetch_last_command.fetch_last_command
+
+    def recording_fetch(**kwargs):
+        inclusive.append(kwargs["inclusive"])
+        return fetch(**kwargs)
+
+    polls = iter(range(3))
+
+    def sleep(_seconds: float) -> None:
+        if next(polls) == 0:
+            stub.update([("user_key", "eq.watcher")], None, {"last_response": '{"ack": true}'})
+        if len(inclusive) == 3:
+            raise _Stop
+
+    monkeypatch.setattr(fetch_last_command, "fetch_last_command", recording_fetch)
+    monkeypatch.setattr(fetch_last_command.time, "sleep", sleep)
+    out = io.StringIO()
+    with pytest.raises(_Stop):
+        fetch_last_command.watch(base_url=stub.url, anon_key="key", user_keys=["watcher"], interval=0, out=out)
+    stub.stop()
+
+    assert inclusive == [False, True, False]
+    rows = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [row["last_response"] for row in rows] == [None, '{"ack": true}']
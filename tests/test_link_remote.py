@@ -0,0 +1,25 @@
+import importlib
+from pathlib import Path
+
+import chess_api
+from game_log import GameLog
+from replay import move_command
+
+
+def test_each_user_gets_their_own_game_log(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(chess_api, "_move_listeners", [])  # keep link_remote's listener out of other tests
+    link_remote = importlib.import_module("link_remote")
+    monkeypatch.setattr(link_remote, "move_piece", lambda *move, server_url=None: True)
+
+    factory = link_remote.user_engine_factory({}, str(tmp_path))
+    alice, bob = factory("alice"), factory("bob/2")
+    alice.handle(move_command("white", "pawn", "e2", "e4"))
+    bob.handle(move_command("white", "knight", "g1", "f3"))
+    alice.handle(move_command("black", "pawn", "e7", "e5"))
+
+    (alice_log,) = (tmp_path / "alice").glob("*.olog")
+    (bob_log,) = (tmp_path / "bob_2").glob("*.olog")
+    with GameLog(alice_log) as log:
+        assert [record.lan() for record in log] == ["e2-e4", "e7-e5"]
+    with GameLog(bob_log) as log:
+        assert [record.lan() for record in log] == ["Ng1-f3"]
@@ -0,0 +1,34 @@
+import json
+import threading
+from typing import List
+
+from omnilink import OmniLinkEngine, OmniLinkMQTTBridge
+
+
+def _bridge(published: List[str]) -> OmniLinkMQTTBridge:
+    bridge = OmniLinkMQTTBridge(OmniLinkEngine(["say [word]"]), transport="tcp", context_coalesce=0, log=False)
+    bridge.client.publish = lambda _topic, payload, qos=0: published.append(json.loads(payload)["context"])
+    return bridge
+
+
+def test_batch_hold_only_defers_its_own_thread() -> None:
+    published: List[str] = []
+    bridge = _bridge(published)
+    in_batch, single_done = threading.Event(), threading.Event()
+
+    def batch() -> None:
+        bridge._hold_context()
+        bridge.publish_context("batch move 1")
+        in_batch.set()
+        single_done.wait(5)
+        bridge.publish_context("batch move 2")
+        bridge._release_context()
+
+    worker = threading.Thread(target=batch)
+    worker.start()
+    assert in_batch.wait(5)
+    bridge.publish_context("single move")  # another worker, not held
+    assert published == ["single move"]
+    single_done.set()
+    worker.join(5)
+    assert published == ["single move", "batch move 2"]
@@ -0,0 +1,101 @@
+import threading
+from typing import Dict, List
+
+import pytest
+
+from omnilink import (
+    MultiUserRemoteClient,
+    OmniLinkEngine,
+    OmniLinkMultiUserRemoteBridge,
+    OmniLinkRemoteCommandBridge,
+    RemoteCommandClient,
+)
+from supabase_stub import SupabaseStub
+
+USER = "remote-user"
+
+
+@pytest.fixture
+def stub():
+    stub = SupabaseStub(anon_key="test-key").start()
+    yield stub
+    stub.stop()
+
+
+def _engine(handled: List[str]) -> OmniLinkEngine:
+    engine = OmniLinkEngine(["say [word]"])
+    engine.on(lambda _event: True, lambda event: handled.append(event["vars"]["word"]) or {"ack": True})
+    return engine
+
+
+def test_late_write_back_keeps_newer_command(stub: SupabaseStub) -> None:
+    handled: List[str] = []
+    client = RemoteCommandClient(base_url=stub.url, anon_key="test-key", user_key=USER)
+    gate = threading.Event()
+    write = client.update_last_response
+    client.update_last_response = lambda *args, **kwargs: gate.wait(5) and write(*args, **kwargs)
+    bridge = OmniLinkRemoteCommandBridge(_engine(handled), client, async_write=True, log=False)
+
+    stub.put_command(USER, "say first")
+    bridge.process_once()
+    stub.put_command(USER, "say second")  # posted while the first response is queued
+    gate.set()
+    assert bridge.writer.flush(5)
+
+    (row,) = stub.query([], None)
+    assert row["last_command"] == "say second"
+    assert row["last_response"] is None
+
+    bridge.process_once()
+    assert bridge.writer.flush(5)
+    assert handled == ["first", "second"]
+    (row,) = stub.query([], None)
+    assert '"ack": true' in row["last_response"]
+    bridge.stop()
+
+
+def _multi_bridge(stub: SupabaseStub, handled: Dict[str, List[str]], **kwargs) -> OmniLinkMultiUserRemoteBridge:
+    client = MultiUserRemoteClient(base_url=stub.url, anon_key="test-key", user_keys=["alice", "bob"])
+    return OmniLinkMultiUserRemoteBridge(
+        lambda user_key: _engine(handled.setdefault(user_key, [])), client, log=False, **kwargs
+    )
+
+
+def test_multi_user_row_visible_late_is_handled(stub: SupabaseStub) -> None:
+    handled: Dict[str, List[str]] = {}
+    bridge = _multi_bridge(stub, handled, async_write=False)
+    stub.put_command("bob", "say b1")
+    a1 = stub.put_command("alice", "say a1")
+    bridge.process_once()
+    stub.put_command("alice", "say a2")
+    bridge.process_once()
+
+    # bob's next row commits after alice's newer one but carries an older timestamp.
+    stub.put_command("bob", "say b2")
+    with stub.lock:
+        next(r for r in stub.rows if r["user_key"] == "bob")["updated_at"] = a1["updated_at"]
+    bridge.process_once()
+
+    assert handled == {"bob": ["b1", "b2"], "alice": ["a1", "a2"]}
+
+
+def test_multi_user_late_write_back_keeps_newer_command(stub: SupabaseStub) -> None:
+    handled: Dict[str, List[str]] = {}
+    bridge = _multi_bridge(stub, handled, async_write=True)
+    gate = threading.Event()
+    write = bridge.writer._write
+    bridge.writer._write = lambda batch: gate.wait(5) and write(batch)
+
+    stub.put_command("alice", "say first")
+    bridge.process_once()
+    stub.put_command("alice", "say second")
+    gate.set()
+    assert bridge.writer.flush(5)
+
+    (row,) = stub.query([("user_key", "eq.alice")], None)
+    assert row["last_command"] == "say second"
+    assert row["last_response"] is None
+    bridge.process_once()
+    assert bridge.writer.flush(5)
+    assert handled["alice"] == ["first", "second"]
+    bridge.stop()
@@ -0,0 +1,47 @@
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from omnilink import OmniLinkEngine, OmniLinkRemoteCommandBridge, RemoteCommandClient
+from supabase_stub import SupabaseStub
+
+USER = "stream-user"
+
+
+@pytest.fixture
+def stub():
+    stub = SupabaseStub(anon_key="test-key").start()
+    yield stub
+    stub.stop()
+
+
+def _bridge(stub: SupabaseStub, handled: List[str], tmp_path: Path, **kwargs) -> OmniLinkRemoteCommandBridge:
+    engine = OmniLinkEngine(["say [word]"])
+    engine.on(lambda _event: True, lambda event: handled.append(event["vars"]["word"]) or {"ack": True})
+    client = RemoteCommandClient(base_url=stub.url, anon_key="test-key", user_key=USER)
+    return OmniLinkRemoteCommandBridge(
+        engine, client, stream=True, page_size=2, checkpoint_path=tmp_path / "checkpoint.json", log=False, **kwargs
+    )
+
+
+@pytest.mark.parametrize("async_write", [False, True])
+def test_stream_runs_each_appended_command_once(stub: SupabaseStub, tmp_path: Path, async_write: bool) -> None:
+    handled: List[str] = []
+    stub.put_command(USER, "say start", append=True)
+    bridge = _bridge(stub, handled, tmp_path, async_write=async_write)
+    bridge.process_once()  # starts after the newest row
+
+    for i in range(5):
+        stub.put_command(USER, f"say c{i}", append=True)
+    for _ in range(3):
+        bridge.process_once()
+        if bridge.writer is not None:
+            assert bridge.writer.flush(5)
+
+    assert handled == [f"c{i}" for i in range(5)]
+    rows = stub.query([("order", "updated_at.asc")], None)
+    assert [row["last_command"] for row in rows] == ["say start"] + [f"say c{i}" for i in range(5)]
+    assert rows[0]["last_response"] is None
+    assert all('"ack": true' in row["last_response"] for row in rows[1:])
+    bridge.stop()
@@ -0,0 +1,48 @@
+from pathlib import Path
+
+from game_log import GameLog
+from replay import commands_from_pgn, move_command
+
+# Both sides castle: white short, black long (king then rook, as chess_api records it).
+GAME = [
+    ("white", "pawn", "e2", "e4"),
+    ("black", "pawn", "d7", "d5"),
+    ("white", "knight", "g1", "f3"),
+    ("black", "knight", "b8", "c6"),
+    ("white", "bishop", "f1", "c4"),
+    ("black", "bishop", "c8", "f5"),
+    ("white", "king", "e1", "g1"),
+    ("white", "rook", "h1", "f1"),
+    ("black", "queen", "d8", "d7"),
+    ("white", "pawn", "d2", "d3"),
+    ("black", "king", "e8", "c8"),
+    ("black", "rook", "a8", "d8"),
+    ("white", "knight", "b1", "c3"),
+]
+
+
+def test_game_log_export_replays(tmp_path: Path) -> None:
+    with GameLog(tmp_path / "game.olog") as log:
+        for move in GAME:
+            log.append(*move)
+        pgn = tmp_path / "game.pgn"
+        with pgn.open("w", encoding="utf-8") as fp:
+            log.export_pgn(fp)
+
+    text = pgn.read_text(encoding="utf-8")
+    assert "4. O-O Qd8-d7 5. d2-d3 O-O-O" in text
+    assert list(commands_from_pgn(pgn)) == [[move_command(*move) for move in GAME]]
+
+
+def test_lan_castling_absorbs_rook_move(tmp_path: Path) -> None:
+    pgn = tmp_path / "legacy.pgn"
+    pgn.write_text(
+        "1. e2-e4 e7-e5 2. Ng1-f3 Nb8-c6 3. Bf1-c4 Ng8-f6 4. Ke1-g1 5. Rh1-f1 Nf6-e4 *\n",
+        encoding="utf-8",
+    )
+    (commands,) = commands_from_pgn(pgn)
+    assert commands[6:] == [
+        move_command("white", "king", "e1", "g1"),
+        move_command("white", "rook", "h1", "f1"),
+        move_command("black", "knight", "f6", "e4"),
+    ]
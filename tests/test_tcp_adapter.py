@@ -0,0 +1,116 @@
+import socket
+import threading
+import time
+from typing import List
+
+import pytest
+
+from omnilink import OmniLinkTCPAdapter
+
+
+@pytest.fixture
+def one_line_receiver():
+    """Accept connections and read one line from each, like the original receiver."""
+
+    listener = socket.create_server(("127.0.0.1", 0))
+    lines: List[bytes] = []
+
+    def serve() -> None:
+        while True:
+            try:
+                conn, _addr = listener.accept()
+            except OSError:
+                return
+            with conn, conn.makefile("rb") as stream:
+                lines.append(stream.readline())
+
+    threading.Thread(target=serve, daemon=True).start()
+    yield listener.getsockname()[1], lines
+    listener.close()
+
+
+@pytest.fixture
+def stream_receiver():
+    """Accept connections and keep everything each one sends until EOF."""
+
+    listener = socket.create_server(("127.0.0.1", 0))
+    received: List[bytearray] = []
+
+    def read(conn: socket.socket, data: bytearray) -> None:
+        with conn:
+            while True:
+                chunk = conn.recv(4096)
+                if not chunk:
+                    return
+                data += chunk
+
+    def serve() -> None:
+        while True:
+            try:
+                conn, _addr = listener.accept()
+            except OSError:
+                return
+            received.append(bytearray())
+            threading.Thread(target=read, args=(conn, received[-1]), daemon=True).start()
+
+    threading.Thread(target=serve, daemon=True).start()
+    yield listener.getsockname()[1], received
+    listener.close()
+
+
+class _BreaksMidSend:
+    """Socket wrapper that writes the first half of the next payload, then fails."""
+
+    def __init__(self, sock: socket.socket) -> None:
+        self._sock = sock
+        self._sent = False
+
+    def send(self, data) -> int:
+        if self._sent:
+            raise BrokenPipeError("connection reset mid-batch")
+        self._sent = True
+        return self._sock.send(data[: len(data) // 2])
+
+    def sendall(self, data) -> None:
+        self.send(data)
+        self.send(data)
+
+    def __getattr__(self, name):
+        return getattr(self._sock, name)
+
+
+def test_async_sends_one_message_per_connection(one_line_receiver, monkeypatch) -> None:
+    monkeypatch.delenv("TCP_ADAPTER_BATCH_MAX", raising=False)
+    port, lines = one_line_receiver
+    adapter = OmniLinkTCPAdapter("127.0.0.1", port, log=False)
+    futures = [adapter.send_command_async(f"say {i}") for i in range(5)]
+    for future in futures:
+        future.result(5)
+    adapter.close()
+
+    deadline = time.monotonic() + 5
+    while len(lines) < 5 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert sorted(lines) == sorted(f'{{"command": "say {i}"}}\n'.encode() for i in range(5))
+
+
+def test_partial_persistent_write_is_not_resent(stream_receiver) -> None:
+    port, received = stream_receiver
+    adapter = OmniLinkTCPAdapter("127.0.0.1", port, persistent=True, log=False)
+    adapter.send({"command": "first"})
+    conn = adapter._pool.get()
+    conn.sock = _BreaksMidSend(conn.sock)
+    adapter._pool.put(conn)
+
+    with pytest.raises(RuntimeError):
+        adapter.send({"command": "second"})
+    assert adapter.metrics["connect"] == 1
+    adapter.send({"command": "third"})
+    adapter.close()
+
+    deadline = time.monotonic() + 5
+    while sum(data.count(b"\n") for data in received) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    messages = b"".join(received)
+    assert messages.count(b"second") == 0
+    assert messages.count(b"third") == 1
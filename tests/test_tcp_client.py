@@ -0,0 +1,49 @@
+import threading
+from typing import List
+
+import pytest
+
+import chess_api
+import tcp_client
+from bench_mqtt import ChessServerStub
+from omnilink import OmniLinkTCPAdapter
+
+
+@pytest.fixture
+def chess_server(monkeypatch):
+    stub = ChessServerStub()
+    threading.Thread(target=stub.serve_forever, daemon=True).start()
+    monkeypatch.setattr(chess_api, "SERVER_URL", stub.url)
+    commands: List[str] = []
+    apply = stub.apply
+    monkeypatch.setattr(stub, "apply", lambda command: commands.append(command) or apply(command))
+    stub.commands = commands
+    yield stub
+    stub.shutdown()
+    stub.server_close()
+
+
+@pytest.fixture
+def tcp_server(chess_server):
+    server = tcp_client.CommandTCPServer(
+        ("127.0.0.1", 0), tcp_client.CommandTCPHandler, encoding="utf-8", delimiter="\n"
+    )
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize("framing", ["text", "binary"])
+def test_ack_reports_whether_the_server_applied_the_move(chess_server, tcp_server, framing: str) -> None:
+    adapter = OmniLinkTCPAdapter("127.0.0.1", tcp_server.server_address[1], framing=framing, log=False)
+
+    def send(color: str, piece: str, src: str, dst: str):
+        vars_ = {"color": color, "piece": piece, "location1": src, "location2": dst}
+        return adapter.send_command(f"move_{color}_{piece}_from_{src}_to_{dst}", vars=vars_, wait_ack=True)
+
+    assert send("white", "pawn", "e2", "e4")["ack"] is True
+    assert send("white", "queen", "e5", "e6")["ack"] is False  # no piece on e5
+    assert chess_server.commands == ["move_white_pawn_from_e2_to_e4", "move_white_queen_from_e5_to_e6"]
+    assert tcp_server.moves.metrics == {"applied": 1, "skipped": 1}
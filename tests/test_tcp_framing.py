@@ -0,0 +1,47 @@
+import threading
+from typing import List
+
+import pytest
+
+import tcp_client
+from omnilink import OmniLinkTCPAdapter
+
+TEMPLATE = "move_[color]_[piece]_from_[location1]_to_[location2]"
+
+
+@pytest.fixture
+def server(monkeypatch):
+    applied: List[tuple] = []
+    monkeypatch.setattr(tcp_client, "move_piece", lambda *move: applied.append(move) or True)
+    server = tcp_client.CommandTCPServer(
+        ("127.0.0.1", 0), tcp_client.CommandTCPHandler, encoding="utf-8", delimiter="\n"
+    )
+    server.daemon_threads = True
+    server.applied = applied
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _move(adapter: OmniLinkTCPAdapter, src: str, dst: str):
+    vars_ = {"color": "white", "piece": "pawn", "location1": src, "location2": dst}
+    return adapter.send_command(
+        f"move_white_pawn_from_{src}_to_{dst}", vars=vars_, template=TEMPLATE, wait_ack=True
+    )
+
+
+def test_binary_templates_reach_connections_opened_earlier(server) -> None:
+    adapter = OmniLinkTCPAdapter(
+        "127.0.0.1", server.server_address[1], persistent=True, pool_size=2, framing="binary", log=False
+    )
+    adapter.send({"command": "hello"})  # opens connection A
+    held = adapter._pool.get()           # A is busy in another sender...
+    assert held.sock is not None
+    assert _move(adapter, "a2", "a3")["ack"] is True  # ...so B interns the template
+    adapter._pool.put(held)
+
+    for src, dst in (("b2", "b3"), ("c2", "c3"), ("d2", "d3")):
+        assert _move(adapter, src, dst)["ack"] is True  # sent on A
+    assert len(server.applied) == 4
+    adapter.close()